@@ -0,0 +1,11 @@
+"""
+benchmarks
+
+Timing and memory benchmarks for the date_tree package. Each module can be run on its own, for example:
+
+    python -m benchmarks.bench_date_exists
+
+The whole suite, with baselines to compare against, runs with python -m benchmarks (see suite.py).
+
+The date_tree package must be importable, either installed with pip install -e . or with src on PYTHONPATH.
+"""
@@ -0,0 +1,64 @@
+"""
+    bench_batch_filter.py
+
+    Compares evaluating many filter specs one filtered_date_range call at a time against batch_filter with a
+    growing number of worker processes.
+
+    Usage:
+
+        python -m benchmarks.bench_batch_filter --years 200 --specs 1000 --processes 1 2 4
+"""
+import argparse
+import datetime
+import random
+import time
+
+from date_tree import DateArray, DateTree, FilterSpec
+
+
+def make_specs(count: int, first_year: int, years: int, seed: int = 0) -> list[FilterSpec]:
+    """
+    Builds random specs mixing years, months, days of the month and weekdays.
+    :return: The specs.
+    """
+    rng: random.Random = random.Random(seed)
+    specs: list[FilterSpec] = []
+
+    for _ in range(count):
+        specs.append(FilterSpec(days=rng.sample(range(1, 32), rng.randint(0, 3)) or None,
+                                months=rng.sample(range(1, 13), rng.randint(0, 4)) or None,
+                                years=[first_year + rng.randrange(years) for _ in range(rng.randint(0, 5))] or None,
+                                weekdays=rng.sample(range(7), rng.randint(1, 7))))
+
+    return specs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batch filtering")
+    parser.add_argument("--years", type=int, default=200, help="number of years of daily dates in the tree")
+    parser.add_argument("--specs", type=int, default=1000, help="number of filter specs per batch")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="process counts to run")
+    args = parser.parse_args()
+
+    builder: DateTree = DateTree(DateArray(), date_obj=None)
+    builder.add_dates(datetime.date(1900, 1, 1), datetime.date(1900 + args.years - 1, 12, 31), bulk=True,
+                      weekdays=list(range(7)))
+    specs: list[FilterSpec] = make_specs(args.specs, 1900, args.years)
+
+    start: float = time.perf_counter()
+    for spec in specs:
+        builder.filtered_date_range(spec.days, spec.months, spec.years, lazy=True, weekdays=spec.weekdays).to_tree()
+    sequential: float = time.perf_counter() - start
+
+    print(f"dates: {builder.count}, specs: {len(specs)}")
+    print(f"one filter at a time:   {sequential:8.2f} s")
+
+    for processes in args.processes:
+        start = time.perf_counter()
+        builder.batch_filter(specs, processes=processes)
+        batch: float = time.perf_counter() - start
+        print(f"batch, {processes:>2} process(es):  {batch:8.2f} s  ({sequential / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+    bench_business_days.py
+
+    Compares adding N business days by walking the stored dates one at a time against shift, and against shift_dates
+    for the whole batch, on a Monday–Friday calendar.
+
+    Usage:
+
+        python -m benchmarks.bench_business_days --years 50 --trades 20000
+"""
+import argparse
+import datetime
+import random
+import time
+
+from bintrees import RBTree
+
+from date_tree.date_array import DateArray
+from date_tree.date_runs import DateRuns
+from date_tree.date_tree import DateTree
+
+
+def walk(builder: DateTree, date: datetime.date, n: int) -> datetime.date:
+    """
+    Adds n business days by stepping from stored date to stored date, the way callers did without shift.
+    :return: The date reached.
+    """
+    date = builder.next_date(date, inclusive=False)
+    for _ in range(n - 1):
+        date = builder.next_date(date, inclusive=False)
+
+    return date
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark business-day arithmetic on a DateTree")
+    parser.add_argument("--years", type=int, default=50, help="number of years in the calendar")
+    parser.add_argument("--trades", type=int, default=20_000, help="number of (date, offset) pairs to shift")
+    parser.add_argument("--max-offset", type=int, default=60, help="largest number of business days to add")
+    args = parser.parse_args()
+
+    rng: random.Random = random.Random(0)
+    first: datetime.date = datetime.date(2000, 1, 1)
+    span: int = (datetime.date(2000 + args.years - 1, 1, 1) - first).days
+    dates: list[datetime.date] = [first + datetime.timedelta(rng.randrange(span)) for _ in range(args.trades)]
+    offsets: list[int] = [rng.randint(1, args.max_offset) for _ in range(args.trades)]
+
+    for name, store in (("RBTree", RBTree), ("DateArray", DateArray), ("DateRuns", DateRuns)):
+        builder: DateTree = DateTree(store(), date_obj=None)
+        builder.add_dates(first, datetime.date(2000 + args.years - 1, 12, 31), bulk=True, weekdays=[0, 1, 2, 3, 4])
+        builder.shift(first, 1)
+
+        start: float = time.perf_counter()
+        walked: list[datetime.date] = [walk(builder, date, n) for date, n in zip(dates, offsets)]
+        walking: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shifted: list[datetime.date] = [builder.shift(date, n) for date, n in zip(dates, offsets)]
+        single: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched: list[datetime.date] = builder.shift_dates(dates, offsets)
+        batch: float = time.perf_counter() - start
+
+        assert walked == shifted == batched
+
+        print(f"{name}: {builder.count} business days, {args.trades} shifts of up to {args.max_offset} days")
+        print(f"  next_date walk:  {walking * 1e3:9.1f} ms")
+        print(f"  shift:           {single * 1e3:9.1f} ms  ({walking / single:.1f}x)")
+        print(f"  shift_dates:     {batch * 1e3:9.1f} ms  ({walking / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
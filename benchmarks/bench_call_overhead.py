@@ -0,0 +1,80 @@
+"""
+    bench_call_overhead.py
+
+    Measures the per-call cost of the single-date DateTree operations against the bare tree operation each one wraps,
+    so the difference is the overhead DateTree adds to every call: argument handling, helper objects, the weekday
+    selection and cache invalidation.
+
+    Usage:
+
+        python -m benchmarks.bench_call_overhead --size 10000 --calls 200000
+"""
+import argparse
+import datetime
+import random
+import timeit
+from typing import Callable
+
+from bintrees import RBTree
+
+from date_tree.date_array import DateArray
+from date_tree.date_runs import DateRuns
+from date_tree.date_tree import DateTree
+
+
+def per_call(function: Callable[[], object], calls: int) -> float:
+    """
+    Times a call, best of three runs.
+    :param function: The call to time.
+    :param calls: Number of calls per run.
+    :return: Nanoseconds per call.
+    """
+    return min(timeit.repeat(function, number=calls, repeat=3)) / calls * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the per-call overhead of DateTree")
+    parser.add_argument("--size", type=int, default=10_000, help="number of dates in the tree")
+    parser.add_argument("--calls", type=int, default=200_000, help="calls per timed run")
+    args = parser.parse_args()
+
+    first: datetime.date = datetime.date(2000, 1, 1)
+    last: datetime.date = first + datetime.timedelta(args.size - 1)
+    probe: datetime.date = first + datetime.timedelta(random.Random(0).randrange(args.size))
+    every_day: list[int] = list(range(7))
+
+    print(f"tree size: {args.size}, calls per run: {args.calls}")
+    print(f"{'store':<10} {'operation':<32} {'DateTree':>12} {'bare tree':>12} {'overhead':>12}")
+
+    for name, store in (("RBTree", RBTree), ("DateArray", DateArray), ("DateRuns", DateRuns)):
+        builder: DateTree = DateTree(store(), date_obj=None)
+        builder.add_dates(first, last, bulk=True, weekdays=every_day)
+        builder.filter_dates(year=first.year, weekdays=every_day)
+        tree: RBTree = builder.tree
+
+        # Deletes first so the probed date is back in the tree for the next case
+        def delete_and_add() -> None:
+            builder.delete_date(probe)
+            builder.add_dates(probe, weekdays=every_day)
+
+        def bare_delete_and_add() -> None:
+            tree.remove(probe)
+            tree.insert(probe, None)
+
+        cases: list[tuple[str, Callable[[], object], Callable[[], object]]] = [
+            ("date_existance", lambda: builder.date_existance(tree, probe), lambda: probe in tree),
+            ("value_of", lambda: builder.value_of(probe), lambda: tree.get_value(probe)),
+            ("delete_date + add_dates", delete_and_add, bare_delete_and_add),
+            ("filter_dates(day, month, year)",
+             lambda: builder.filter_dates(probe.day, probe.month, probe.year, weekdays=every_day),
+             lambda: tree.get_value(probe)),
+        ]
+
+        for operation, call, bare in cases:
+            wrapped: float = per_call(call, args.calls)
+            raw: float = per_call(bare, args.calls)
+            print(f"{name:<10} {operation:<32} {wrapped:>9.0f} ns {raw:>9.0f} ns {wrapped - raw:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+    bench_concurrent.py
+
+    Measures the throughput of a ConcurrentDateTree shared by several threads, against a DateTree guarded by a
+    single mutex. Each thread runs a mix of existence checks and filters with a share of writes that add and delete
+    a date.
+
+    On a build of Python with the GIL the threads still take turns running Python code, so the reader/writer lock
+    mostly shows its overhead relative to a mutex. On a free-threaded build readers run in parallel.
+
+    Usage:
+
+        python -m benchmarks.bench_concurrent --size 100000 --ops 20000 --writes 0.05
+"""
+import argparse
+import datetime
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+from bintrees import RBTree
+
+from date_tree.concurrent_date_tree import ConcurrentDateTree
+from date_tree.date_tree import DateTree
+
+
+def build(tree_class: type, size: int) -> DateTree:
+    """
+    Builds a DateTree of consecutive dates starting on 01/01/2000.
+    :param tree_class: DateTree or ConcurrentDateTree.
+    :param size: Number of dates to add.
+    :return: The populated DateTree.
+    """
+    builder: DateTree = tree_class(RBTree(), date_obj=None)
+    first: datetime.date = datetime.date(2000, 1, 1)
+    builder.add_dates(first, first + datetime.timedelta(size - 1), bulk=True, weekdays=list(range(7)))
+    return builder
+
+
+def worker(builder: DateTree, lock, ops: int, writes: float, size: int, seed: int) -> None:
+    """
+    Runs a mix of reads and writes against the shared DateTree.
+    :param builder: The shared DateTree.
+    :param lock: Mutex held around every call, or a null context for a ConcurrentDateTree.
+    :param ops: Number of operations to run.
+    :param writes: Share of the operations that write.
+    :param size: Number of dates in the tree.
+    :param seed: Seed for the operation mix.
+    """
+    rng: random.Random = random.Random(seed)
+    first: int = datetime.date(2000, 1, 1).toordinal()
+
+    for _ in range(ops):
+        date: datetime.date = datetime.date.fromordinal(first + rng.randrange(size))
+
+        if rng.random() < writes:
+            with lock:
+                builder.delete_dates([date])
+            with lock:
+                builder.add_dates(date, weekdays=list(range(7)))
+
+        elif rng.random() < 0.9:
+            with lock:
+                builder.date_existance(builder.tree, date)
+
+        else:
+            with lock:
+                builder.filter_dates(month=date.month, year=date.year, weekdays=[0, 1, 2, 3, 4])
+
+
+def run(tree_class: type, threads: int, args: argparse.Namespace) -> float:
+    """
+    Runs the workload on the given number of threads.
+    :return: Operations per second across all threads.
+    """
+    builder: DateTree = build(tree_class, args.size)
+    lock = nullcontext() if tree_class is ConcurrentDateTree else threading.Lock()
+    ops: int = args.ops // threads
+
+    pool: list[threading.Thread] = [threading.Thread(target=worker, args=(builder, lock, ops, args.writes, args.size,
+                                                                          seed))
+                                    for seed in range(threads)]
+
+    start: float = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed: float = time.perf_counter() - start
+
+    return ops * threads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark a DateTree shared between threads")
+    parser.add_argument("--size", type=int, default=100_000, help="number of dates in the tree")
+    parser.add_argument("--ops", type=int, default=20_000, help="total operations per run")
+    parser.add_argument("--writes", type=float, default=0.05, help="share of operations that write")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to run")
+    args = parser.parse_args()
+
+    print(f"tree size: {args.size}, operations: {args.ops}, writes: {args.writes:.0%}")
+    print(f"{'threads':>7}  {'mutex DateTree':>16}  {'ConcurrentDateTree':>18}")
+
+    for threads in args.threads:
+        mutex: float = run(DateTree, threads, args)
+        concurrent: float = run(ConcurrentDateTree, threads, args)
+        print(f"{threads:>7}  {mutex:>12,.0f} op/s  {concurrent:>14,.0f} op/s")
+
+
+if __name__ == "__main__":
+    main()
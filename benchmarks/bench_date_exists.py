@@ -0,0 +1,63 @@
+"""
+    bench_date_exists.py
+
+    Compares the keyed existence check used by DateExists against the previous full scan of tree.keys().
+
+    Usage:
+
+        python -m benchmarks.bench_date_exists --size 100000 --probes 1000
+"""
+import argparse
+import datetime
+import timeit
+
+from bintrees import RBTree
+
+from date_tree._date_exists import DateExists
+
+
+def build_tree(size: int) -> RBTree:
+    """
+    Builds a tree of consecutive dates starting on 01/01/2000.
+    :param size: Number of dates to insert.
+    :return: The populated tree.
+    """
+    tree: RBTree = RBTree()
+    first: int = datetime.date(2000, 1, 1).toordinal()
+    tree.update((datetime.date.fromordinal(first + i), None) for i in range(size))
+    return tree
+
+
+def scan_exist(tree: RBTree, date: datetime.date) -> bool:
+    """
+    The previous existence check, kept here as the baseline being compared against.
+    :param tree: Tree to search.
+    :param date: Date being searched for.
+    :return: True if the date exists in the tree.
+    """
+    return date in tree.keys()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DateExists lookups")
+    parser.add_argument("--size", type=int, default=100_000, help="number of dates in the tree")
+    parser.add_argument("--probes", type=int, default=200, help="number of dates looked up per run")
+    args = parser.parse_args()
+
+    tree: RBTree = build_tree(args.size)
+    step: int = max(1, (2 * args.size) // args.probes)
+    first: int = datetime.date(2000, 1, 1).toordinal()
+    probes: list[datetime.date] = [datetime.date.fromordinal(first + i) for i in range(0, 2 * args.size, step)]
+
+    scan: float = timeit.timeit(lambda: [scan_exist(tree, d) for d in probes], number=1)
+    keyed: float = timeit.timeit(lambda: [DateExists.date_exist(tree, d) for d in probes], number=1)
+    bulk: float = timeit.timeit(lambda: DateExists.dates_exist(tree, probes), number=1)
+
+    print(f"tree size: {args.size}, probes: {len(probes)}")
+    print(f"scan of keys():    {scan * 1e3:10.2f} ms")
+    print(f"date_exist:        {keyed * 1e3:10.2f} ms  ({scan / keyed:,.0f}x)")
+    print(f"dates_exist:       {bulk * 1e3:10.2f} ms  ({scan / bulk:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
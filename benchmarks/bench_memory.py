@@ -0,0 +1,62 @@
+"""
+    bench_memory.py
+
+    Compares the memory held by an RBTree, a DateArray and a DateRuns storing the same consecutive dates.
+
+    Usage:
+
+        python -m benchmarks.bench_memory --size 100000
+"""
+import argparse
+import datetime
+import gc
+import tracemalloc
+from typing import Callable
+
+from bintrees import RBTree
+
+from date_tree.date_array import DateArray
+from date_tree.date_runs import DateRuns
+from date_tree.date_tree import DateTree
+
+
+def measure(factory: Callable[[], object], size: int) -> int:
+    """
+    Fills a fresh store through DateTree and measures the memory it retains.
+    :param factory: Callable returning an empty store.
+    :param size: Number of consecutive dates to add.
+    :return: Bytes still allocated once the store is filled.
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    builder: DateTree = DateTree(factory(), date_obj=None)
+    builder.include_days_of_week(include_all=True)
+
+    first: datetime.date = datetime.date(1900, 1, 1)
+    builder.add_dates(first, first + datetime.timedelta(size - 1))
+
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark memory per stored date")
+    parser.add_argument("--size", type=int, default=100_000, help="number of dates to store")
+    args = parser.parse_args()
+
+    rbtree: int = measure(RBTree, args.size)
+    date_array: int = measure(DateArray, args.size)
+    date_runs: int = measure(DateRuns, args.size)
+
+    print(f"dates stored: {args.size}")
+    print(f"RBTree:    {rbtree / 2 ** 20:8.2f} MiB  {rbtree / args.size:6.1f} bytes/date")
+    print(f"DateArray: {date_array / 2 ** 20:8.2f} MiB  {date_array / args.size:6.1f} bytes/date")
+    print(f"DateRuns:  {date_runs / 2 ** 20:8.2f} MiB  {date_runs / args.size:6.1f} bytes/date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+    bench_set_operations.py
+
+    Compares removing one calendar's dates from another one delete_date call at a time against difference_update,
+    and adding them back one add_dates call at a time against union_update.
+
+    Usage:
+
+        python -m benchmarks.bench_set_operations --years 50
+"""
+import argparse
+import datetime
+import time
+
+from bintrees import RBTree
+
+from date_tree.date_array import DateArray
+from date_tree.date_tree import DateTree
+
+
+def calendar(store: type, years: int, weekdays: list[int]) -> DateTree:
+    """
+    Builds a DateTree holding the given weekdays of consecutive years from 01/01/2000.
+    :return: The populated DateTree.
+    """
+    builder: DateTree = DateTree(store(), date_obj=None)
+    builder.add_dates(datetime.date(2000, 1, 1), datetime.date(2000 + years - 1, 12, 31), bulk=True,
+                      weekdays=weekdays)
+    return builder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark set operations between DateTrees")
+    parser.add_argument("--years", type=int, default=50, help="number of years in each calendar")
+    args = parser.parse_args()
+
+    for name, store in (("RBTree", RBTree), ("DateArray", DateArray)):
+        other: DateTree = calendar(store, args.years, [0, 2, 4, 6])
+        looped: DateTree = calendar(store, args.years, [0, 1, 2, 3, 4])
+        merged: DateTree = calendar(store, args.years, [0, 1, 2, 3, 4])
+        size: int = looped.count
+
+        start: float = time.perf_counter()
+        for date in other.tree.keys():
+            if looped.date_existance(looped.tree, date):
+                looped.delete_date(date)
+        delete_loop: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        merged.difference_update(other)
+        difference: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for date in other.tree.keys():
+            looped.add_dates(date, weekdays=list(range(7)))
+        add_loop: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        merged.union_update(other)
+        union: float = time.perf_counter() - start
+
+        assert list(looped.tree.keys()) == list(merged.tree.keys())
+
+        print(f"{name}: {size} and {other.count} dates")
+        print(f"  delete_date loop:   {delete_loop * 1e3:9.1f} ms")
+        print(f"  difference_update:  {difference * 1e3:9.1f} ms  ({delete_loop / difference:.1f}x)")
+        print(f"  add_dates loop:     {add_loop * 1e3:9.1f} ms")
+        print(f"  union_update:       {union * 1e3:9.1f} ms  ({add_loop / union:.1f}x)")
+
+if __name__ == "__main__":
+    main()
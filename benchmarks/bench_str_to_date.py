@@ -0,0 +1,39 @@
+"""
+    bench_str_to_date.py
+
+    Compares the fixed-width str_to_date parser and the batch strs_to_dates against datetime.strptime.
+
+    Usage:
+
+        python -m benchmarks.bench_str_to_date --size 200000
+"""
+import argparse
+import datetime
+import timeit
+
+from date_tree._helper_methods import HelperMethods
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MM/DD/YYYY parsing")
+    parser.add_argument("--size", type=int, default=200_000, help="number of strings parsed per run")
+    parser.add_argument("--distinct", type=int, default=3650, help="number of distinct dates among the strings")
+    args = parser.parse_args()
+
+    first: datetime.date = datetime.date(2000, 1, 1)
+    strings: list[str] = [(first + datetime.timedelta(i % args.distinct)).strftime("%m/%d/%Y")
+                          for i in range(args.size)]
+
+    strptime: float = timeit.timeit(lambda: [datetime.datetime.strptime(s, "%m/%d/%Y").date() for s in strings],
+                                    number=1)
+    single: float = timeit.timeit(lambda: [HelperMethods.str_to_date(s) for s in strings], number=1)
+    batch: float = timeit.timeit(lambda: HelperMethods.strs_to_dates(strings), number=1)
+
+    print(f"strings: {args.size}, distinct: {min(args.size, args.distinct)}")
+    print(f"strptime:       {strptime * 1e3:10.2f} ms")
+    print(f"str_to_date:    {single * 1e3:10.2f} ms  ({strptime / single:.1f}x)")
+    print(f"strs_to_dates:  {batch * 1e3:10.2f} ms  ({strptime / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+    suite.py
+
+    Runs every DateTree hot path against trees of growing size and reports the throughput and the peak memory of
+    each. Results can be saved as a JSON baseline and later runs compared against it; a case that got slower or
+    allocates more than the tolerance allows is reported as a regression and the run exits with status 1.
+
+    Each case is timed repeat times on a fresh setup and the best run is kept. The peak memory is measured in a
+    separate run under tracemalloc, since tracing slows the code it measures.
+
+    A datetime.date can only hold 3,652,059 distinct days, so that is the largest size a tree of dates can reach.
+
+    Usage:
+
+        python -m benchmarks --sizes 1000 10000 100000 --save baseline.json
+        python -m benchmarks --sizes 1000 10000 100000 --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+from bintrees import RBTree
+
+from date_tree.date_array import DateArray
+from date_tree.date_runs import DateRuns
+from date_tree.date_tree import DateTree
+
+# Largest number of consecutive dates a tree can hold
+MAX_SIZE: int = datetime.date.max.toordinal()
+
+# Stores the suite can run against
+STORES: dict[str, type] = {"rbtree": RBTree, "array": DateArray, "runs": DateRuns}
+
+# Upper bounds on the number of calls made by the per-call cases, so large trees do not take minutes per case
+LOOKUPS: int = 100_000
+DELETES: int = 10_000
+FILTERS: int = 200
+
+
+class Case(NamedTuple):
+    """
+    One benchmarked operation.
+    :param name: Name the results are reported and saved under.
+    :param unit: What one operation is, for the report.
+    :param setup: Callable taking the tree size and returning the state passed to run. Not timed.
+    :param run: Callable taking the state, running the operation and returning the number of operations made.
+    """
+    name: str
+    unit: str
+    setup: Callable[[int], object]
+    run: Callable[[object], int]
+
+
+class Result(NamedTuple):
+    """
+    Measurements of one case at one size.
+    :param ops_per_sec: Best throughput over the timed runs.
+    :param peak_bytes: Peak memory allocated while the case ran.
+    """
+    ops_per_sec: float
+    peak_bytes: int
+
+
+def first_date(size: int) -> datetime.date:
+    """
+    Gets the first date of a benchmark tree, 01/01/1900 unless the tree would run past the last possible date.
+    :param size: Number of consecutive dates in the tree.
+    :return: The first date.
+    """
+    return min(datetime.date(1900, 1, 1), datetime.date.fromordinal(MAX_SIZE - size + 1))
+
+
+def build(store: type, size: int) -> DateTree:
+    """
+    Builds a DateTree holding size consecutive dates.
+    :param store: Type of the tree storing the dates.
+    :param size: Number of dates.
+    :return: The populated DateTree.
+    """
+    builder: DateTree = DateTree(store(), date_obj=None)
+    first: datetime.date = first_date(size)
+    builder.add_dates(first, first + datetime.timedelta(size - 1), bulk=True, weekdays=list(range(7)))
+    return builder
+
+
+def sample_dates(size: int, count: int, seed: int = 0) -> list[datetime.date]:
+    """
+    Picks random dates of a benchmark tree.
+    :param size: Number of dates in the tree.
+    :param count: Number of dates to pick.
+    :return: The dates, in random order.
+    """
+    rng: random.Random = random.Random(seed)
+    first: int = first_date(size).toordinal()
+    return [datetime.date.fromordinal(first + rng.randrange(size)) for _ in range(count)]
+
+
+def make_cases(store: type) -> list[Case]:
+    """
+    Builds the cases of the suite for one store.
+    :param store: Type of the tree storing the dates.
+    :return: The cases, in the order they are run.
+    """
+    def add_dates_setup(size: int) -> tuple[DateTree, datetime.date, datetime.date]:
+        first: datetime.date = first_date(size)
+        return DateTree(store(), date_obj=None), first, first + datetime.timedelta(size - 1)
+
+    def add_dates_run(state: tuple[DateTree, datetime.date, datetime.date]) -> int:
+        builder, first, last = state
+        builder.add_dates(first, last, bulk=True, weekdays=list(range(7)))
+        return builder.count
+
+    def lookup_setup(size: int) -> tuple[DateTree, list[datetime.date]]:
+        return build(store, size), sample_dates(size, min(size, LOOKUPS))
+
+    def date_existance_run(state: tuple[DateTree, list[datetime.date]]) -> int:
+        builder, dates = state
+        for date in dates:
+            builder.date_existance(builder.tree, date)
+        return len(dates)
+
+    def delete_setup(size: int) -> tuple[DateTree, list[datetime.date]]:
+        return build(store, size), list(dict.fromkeys(sample_dates(size, min(size, DELETES))))
+
+    def delete_date_run(state: tuple[DateTree, list[datetime.date]]) -> int:
+        builder, dates = state
+        for date in dates:
+            builder.delete_date(date)
+        return len(dates)
+
+    def range_setup(size: int) -> tuple[DateTree, list[tuple[datetime.date, datetime.date]]]:
+        # Non-overlapping week-long ranges, so every call removes dates
+        weeks: int = max(1, size // 7)
+        first: datetime.date = first_date(size)
+        starts: list[int] = random.Random(0).sample(range(weeks), min(weeks, DELETES))
+        return build(store, size), [(first + datetime.timedelta(7 * week), first + datetime.timedelta(7 * week + 6))
+                                    for week in starts]
+
+    def delete_date_range_run(state: tuple[DateTree, list[tuple[datetime.date, datetime.date]]]) -> int:
+        builder, ranges = state
+        for lower_date, upper_date in ranges:
+            builder.delete_date_range(lower_date, upper_date)
+        return len(ranges)
+
+    def filter_setup(size: int) -> tuple[DateTree, list[datetime.date]]:
+        return build(store, size), sample_dates(size, FILTERS)
+
+    def filter_dates_run(state: tuple[DateTree, list[datetime.date]]) -> int:
+        builder, dates = state
+        for date in dates:
+            # A filter matching nothing raises, after doing the same work as one that matches
+            with contextlib.suppress(ValueError):
+                builder.filter_dates(month=date.month, year=date.year, weekdays=[0, 1, 2, 3, 4])
+        return len(dates)
+
+    def filtered_date_range_run(state: tuple[DateTree, list[datetime.date]]) -> int:
+        builder, dates = state
+        for date in dates:
+            with contextlib.suppress(ValueError):
+                builder.filtered_date_range(days=[1, 15], months=[date.month, date.month % 12 + 1],
+                                            years=[date.year - 1, date.year], weekdays=[0, 1, 2, 3, 4])
+        return len(dates)
+
+    def str_to_date_setup(size: int) -> list[str]:
+        return [f"{date.month:02d}/{date.day:02d}/{date.year:04d}" for date in sample_dates(size, min(size, LOOKUPS))]
+
+    def str_to_date_run(strings: list[str]) -> int:
+        for string in strings:
+            DateTree.str_to_date(string)
+        return len(strings)
+
+    def display_dates_setup(size: int) -> DateTree:
+        return build(store, size)
+
+    def display_dates_run(builder: DateTree) -> int:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            DateTree.display_dates(builder.tree)
+        return builder.count
+
+    return [
+        Case("add_dates", "dates", add_dates_setup, add_dates_run),
+        Case("date_existance", "calls", lookup_setup, date_existance_run),
+        Case("delete_date", "calls", delete_setup, delete_date_run),
+        Case("delete_date_range", "calls", range_setup, delete_date_range_run),
+        Case("filter_dates", "calls", filter_setup, filter_dates_run),
+        Case("filtered_date_range", "calls", filter_setup, filtered_date_range_run),
+        Case("str_to_date", "calls", str_to_date_setup, str_to_date_run),
+        Case("display_dates", "dates", display_dates_setup, display_dates_run),
+    ]
+
+
+def measure(case: Case, size: int, repeat: int) -> Result:
+    """
+    Times a case repeat times and measures its peak memory once, each on a fresh setup.
+    :param case: The case to run.
+    :param size: Number of dates in the tree.
+    :param repeat: Number of timed runs.
+    :return: The best throughput and the peak memory.
+    """
+    best: float = 0.0
+
+    for _ in range(repeat):
+        state: object = case.setup(size)
+        gc.collect()
+
+        start: float = time.perf_counter()
+        ops: int = case.run(state)
+        elapsed: float = time.perf_counter() - start
+
+        best = max(best, ops / elapsed if elapsed > 0 else float("inf"))
+        del state
+
+    state = case.setup(size)
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(best, peak - before)
+
+
+def compare(results: dict[str, Result], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Compares results against a saved baseline.
+    :param results: Results of this run, keyed by "case@size".
+    :param baseline: Saved results, keyed the same way.
+    :param tolerance: Allowed relative loss of throughput and growth of peak memory.
+    :return: A description of each regression, empty if there are none.
+    """
+    regressions: list[str] = []
+
+    for key, result in results.items():
+        saved: dict = baseline.get(key)
+        if saved is None:
+            continue
+
+        if result.ops_per_sec < saved["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{key}: {result.ops_per_sec:,.0f} op/s, baseline {saved['ops_per_sec']:,.0f} op/s")
+
+        # Allocations below a page are noise from the interpreter, not the code under test
+        if result.peak_bytes > max(saved["peak_bytes"] * (1 + tolerance), saved["peak_bytes"] + 4096):
+            regressions.append(f"{key}: {result.peak_bytes:,} bytes peak, baseline {saved['peak_bytes']:,} bytes")
+
+    return regressions
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the DateTree hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help=f"tree sizes to run, at most {MAX_SIZE:,}")
+    parser.add_argument("--store", choices=sorted(STORES), default="rbtree", help="type of tree storing the dates")
+    parser.add_argument("--cases", nargs="+", help="names of the cases to run, all by default")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best is kept")
+    parser.add_argument("--save", metavar="PATH", help="write the results to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative loss of throughput or growth of peak memory against the baseline")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        if not 1 <= size <= MAX_SIZE:
+            parser.error(f"size {size} is not between 1 and {MAX_SIZE:,}")
+
+    if args.repeat < 1:
+        parser.error("repeat must be at least 1")
+
+    cases: list[Case] = make_cases(STORES[args.store])
+    if args.cases:
+        unknown: set[str] = set(args.cases) - {case.name for case in cases}
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        cases = [case for case in cases if case.name in args.cases]
+
+    baseline: dict[str, dict] = {}
+    if args.compare:
+        with open(args.compare) as file:
+            saved: dict = json.load(file)
+
+        # Throughput is only comparable on the same store and interpreter
+        python: str = sys.version.split()[0]
+        if saved.get("store") != args.store:
+            parser.error(f"baseline {args.compare} was run with --store {saved.get('store')}, not {args.store}")
+        if saved.get("python") != python:
+            parser.error(f"baseline {args.compare} was run on Python {saved.get('python')}, not {python}")
+
+        baseline = saved["results"]
+
+    results: dict[str, Result] = {}
+    print(f"store: {args.store}")
+    print(f"{'case':<20} {'size':>10} {'throughput':>18} {'peak memory':>13} {'vs baseline':>12}")
+
+    for size in args.sizes:
+        for case in cases:
+            key: str = f"{case.name}@{size}"
+            result: Result = measure(case, size, args.repeat)
+            results[key] = result
+
+            change: str = ""
+            if key in baseline:
+                change = f"{result.ops_per_sec / baseline[key]['ops_per_sec'] - 1:+.1%}"
+
+            print(f"{case.name:<20} {size:>10,} {result.ops_per_sec:>12,.0f} {case.unit}/s "
+                  f"{result.peak_bytes / 2 ** 20:>9.2f} MiB {change:>12}", flush=True)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"store": args.store, "python": sys.version.split()[0],
+                       "results": {key: result._asdict() for key, result in results.items()}}, file, indent=2)
+
+    if args.compare:
+        regressions: list[str] = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"\nno regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
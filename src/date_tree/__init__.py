@@ -3,6 +3,14 @@ date_tree
 
 Public API for the date_tree package.
 """
+from ._batch_filter import FilterSpec
+from .async_date_tree import AsyncDateTree
+from .concurrent_date_tree import ConcurrentDateTree
+from .date_array import DateArray
+from .date_runs import DateRuns
 from .date_tree import DateTree
+from .instrumentation import Instrumentation, OperationEvent, OperationStats
+from .recurrence import Recurrence
 
-__all__ = ["DateTree"]
\ No newline at end of file
+__all__ = ["AsyncDateTree", "ConcurrentDateTree", "DateArray", "DateRuns", "DateTree", "FilterSpec", "Instrumentation",
+           "OperationEvent", "OperationStats", "Recurrence"]
\ No newline at end of file
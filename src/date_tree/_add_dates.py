@@ -1,50 +1,188 @@
 import datetime
+from itertools import repeat
+from typing import Iterator
 
 from bintrees import RBTree
 
+from ._calendar_index import CalendarIndex
 from ._days_of_week import DaysOfWeek
+from .date_array import DateArray
+from .date_runs import DateRuns
+from .recurrence import Recurrence
 
 class AddDates:
     """
-    Internal helper for inserting single dates or date ranges into an RBTree.
+    Internal helper for inserting single dates or date ranges into an RBTree. One helper lives as long as its DateTree;
+    the weekdays to add are passed to each call, so calls with different selections can share it.
     """
-    def __init__(self, date_obj: object, tree: RBTree, days_of_week: DaysOfWeek):
+    __slots__ = ("date_obj", "tree", "index")
+
+    def __init__(self, date_obj: object, tree: RBTree, index: CalendarIndex = None):
         """
         Initialize an AddDates helper.
         :param date_obj: Default value to associate with dates when a unique object is not provided.
         :param tree: RBTree that stores dates as keys and arbitrary values.
-        :param days_of_week: DaysOfWeek instance controlling which weekdays are eligible to be added.
+        :param index: Optional CalendarIndex kept in step with the dates inserted into the tree.
         """
         self.date_obj = date_obj
         self.tree = tree
-        self.days_of_week: DaysOfWeek = days_of_week
+        self.index: CalendarIndex = index
 
-    def _reset_days_of_week(self) -> None:
+    def _range_value(self, value: object) -> object:
         """
-        Reset the DaysOfWeek configuration to exclude all days.
-        :returns: None
+        Get the value shared by every date of a range. The object itself is stored, not a copy, so all the dates of the
+        range refer to one instance, and a DateArray stores it once in its value table.
+        :param value: The value given for the range, or None for the default date_obj.
+        :returns: The value to store with the dates.
         """
-        self.days_of_week.included_days(exclude_all=True)
+        return self.date_obj if value is None else value
 
-    def _copy_obj(self) -> object:
+    def add_one(self, days_of_week: DaysOfWeek, date: datetime.date, value: object = None) -> RBTree:
+        """
+        Adds a single date, the same as add_date without a last date, without setting up a range.
+        :param days_of_week: DaysOfWeek selecting the weekdays that may be added. It is reset afterwards.
+        :param date: The date to add. It is only added if its weekday is included.
+        :param value: Value stored with the date. If None, the default date_obj is used.
+        :raises ValueError: If no days of week have been included via DaysOfWeek.
+        :return: The tree with the added date.
         """
-         Create a shallow copy of the default date_obj.
-         :returns: Returns the shallow copy.
-         """
-        copy: object = self.date_obj
-        return copy
+        mask: int = days_of_week.mask
+        if mask == 0:
+            raise ValueError("No days of weeks were included")
+
+        if mask >> date.weekday() & 1:
+            self.tree.insert(date, self.date_obj if value is None else value)
+
+            if self.index is not None:
+                self.index.add(date)
+
+        days_of_week.clear()
+
+        return self.tree
 
-    def add_date(self, first_date: datetime.date, last_date: datetime.date = None) -> RBTree:
+    def add_date(self, days_of_week: DaysOfWeek, first_date: datetime.date, last_date: datetime.date = None,
+                 value: object = None) -> RBTree:
         """
         Adds one or more dates to the tree. Adds dates between first_date and last_date (inclusive). If last_date is not
         provided, only first_date is added. Dates are used as keys in the RBTree. The associated value is either the
-        default date_obj.
+        given value or the default date_obj.
+        :param days_of_week: DaysOfWeek selecting the weekdays to add. It is reset afterwards.
+        :param first_date: The first date to add to the tree.
+        :param last_date: The last date to add to the tree (inclusive). If None, only first_date is added.
+        :param value: Value shared by every added date. If None, the default date_obj is used.
+        :raises ValueError: If last_date is earlier than first_date, or if no days of week have been included via
+        DaysOfWeek.
+        :return: The tree with the added dates.
+        """
+        last_date = self._check_range(first_date, last_date, days_of_week.mask)
+        value = self._range_value(value)
+
+        # A DateRuns stores the whole range as a run instead of date by date
+        if isinstance(self.tree, DateRuns):
+            self.tree.add_run(first_date, last_date, days_of_week.mask, value)
+
+        # Only the dates on included weekdays are visited, the rest of each week is skipped
+        else:
+            for current_date in self._qualifying_dates(first_date, last_date, days_of_week.mask):
+
+                # Inserts date into the tree
+                self.tree.insert(current_date, value)
+
+                if self.index is not None:
+                    self.index.add(current_date)
+
+        # Resets the days of week to be added to be False for each day
+        days_of_week.clear()
+
+        return self.tree
+
+    def add_date_bulk(self, days_of_week: DaysOfWeek, first_date: datetime.date, last_date: datetime.date = None,
+                      value: object = None) -> RBTree:
+        """
+        Adds the same dates as add_date, but works out every qualifying date first, in ascending order, and merges them
+        into the tree as one batch. The resulting tree is identical to the one add_date produces.
+
+        A DateArray takes the new dates as ordinals, without creating date objects, in one sorted merge of its buffers.
+        A DateRuns stores the range as a single run. Any other tree, such as an RBTree, takes the sorted dates through
+        its public update.
+        :param days_of_week: DaysOfWeek selecting the weekdays to add. It is reset afterwards.
         :param first_date: The first date to add to the tree.
         :param last_date: The last date to add to the tree (inclusive). If None, only first_date is added.
+        :param value: Value shared by every added date. If None, the default date_obj is used.
         :raises ValueError: If last_date is earlier than first_date, or if no days of week have been included via
         DaysOfWeek.
         :return: The tree with the added dates.
         """
+        last_date = self._check_range(first_date, last_date, days_of_week.mask)
+        value = self._range_value(value)
+
+        if isinstance(self.tree, DateRuns):
+            self.tree.add_run(first_date, last_date, days_of_week.mask, value)
+
+        elif isinstance(self.tree, DateArray):
+            ordinals: list[int] = self._qualifying_ordinals(first_date, last_date, days_of_week.mask)
+            self.tree.update_sorted(ordinals, value)
+
+            if self.index is not None:
+                for ordinal in ordinals:
+                    self.index.add(datetime.date.fromordinal(ordinal))
+
+        else:
+            dates: list[datetime.date] = list(self._qualifying_dates(first_date, last_date, days_of_week.mask))
+            self.tree.update(zip(dates, repeat(value)))
+
+            if self.index is not None:
+                for date in dates:
+                    self.index.add(date)
+
+        # Resets the days of week to be added to be False for each day
+        days_of_week.clear()
+
+        return self.tree
+
+    def add_recurrence(self, recurrence: Recurrence, value: object = None) -> list[datetime.date]:
+        """
+        Generates the dates of a recurrence rule and inserts them as one batch. The weekdays are not checked, the rule
+        decides which dates are added.
+        :param recurrence: A Recurrence with an until date or a count.
+        :param value: Value shared by every added date. If None, the default date_obj is used.
+        :raises ValueError: If the recurrence has no end.
+        :return: The added dates in ascending order.
+        """
+        if not recurrence.is_bounded:
+            raise ValueError("Recurrence must have an until date or a count to be added")
+
+        dates: list[datetime.date] = list(recurrence)
+        value = self._range_value(value)
+        self.insert_items([(date, value) for date in dates])
+
+        return dates
+
+    def insert_items(self, items: list[tuple[datetime.date, object]]) -> RBTree:
+        """
+        Inserts (date, value) pairs as one batch, replacing the values of dates already stored, and keeps the index in
+        step. The weekdays are not checked, the pairs are stored as given.
+        :param items: The pairs to insert, in ascending date order.
+        :return: The tree with the pairs inserted.
+        """
+        self.tree.update(items)
+
+        if self.index is not None:
+            for date, _ in items:
+                self.index.add(date)
+
+        return self.tree
+
+    @staticmethod
+    def _check_range(first_date: datetime.date, last_date: datetime.date, mask: int) -> datetime.date:
+        """
+        Validate the range and the included days of the week before anything is added.
+        :param first_date: The first date of the range.
+        :param last_date: The last date of the range (inclusive). If None, only first_date is in the range.
+        :param mask: Bitmask of the included weekdays.
+        :raises ValueError: If last_date is earlier than first_date, or if no days of week have been included.
+        :return: The last date of the range.
+        """
         # Checks for single date entry occurring by lack of last date
         if last_date is None:
             last_date = first_date
@@ -52,21 +190,54 @@ class AddDates:
         if last_date < first_date:
             raise ValueError()
 
-        if len(self.days_of_week.included_days_list) == 0:
+        if mask == 0:
             raise ValueError("No days of weeks were included")
 
-        current_date: datetime.date = first_date
-        while current_date <= last_date:
-            if current_date.weekday() in self.days_of_week.included:
+        return last_date
 
-               # Inserts date into the tree
-                self.tree.insert(current_date, self._copy_obj())
+    @staticmethod
+    def _qualifying_ordinals(first_date: datetime.date, last_date: datetime.date, mask: int) -> list[int]:
+        """
+        Work out the ordinals of every date in the range whose weekday is included, in ascending order. Each included
+        weekday is an arithmetic progression of step 7, so no date objects are created.
+        :param first_date: The first date of the range.
+        :param last_date: The last date of the range (inclusive).
+        :param mask: Bitmask of the included weekdays.
+        :return: The sorted ordinals.
+        """
+        first: int = first_date.toordinal()
+        last: int = last_date.toordinal()
+        first_weekday: int = first_date.weekday()
 
-            current_date = current_date + datetime.timedelta(1)
+        ordinals: list[int] = []
+        for offset in range(7):
+            if mask >> ((first_weekday + offset) % 7) & 1:
+                ordinals.extend(range(first + offset, last + 1, 7))
 
-        # Resets the days of week to be added to be False for each day
-        self._reset_days_of_week()
+        # Sorting interleaves the up to seven ascending progressions
+        ordinals.sort()
+        return ordinals
 
-        return self.tree
+    @staticmethod
+    def _qualifying_dates(first_date: datetime.date, last_date: datetime.date, mask: int) -> Iterator[datetime.date]:
+        """
+        Generate every date in the range whose weekday is included, in ascending order. The range is walked a week at
+        a time and only the included days of each week are produced, so the work grows with the number of dates added
+        rather than the length of the range.
+        :param first_date: The first date of the range.
+        :param last_date: The last date of the range (inclusive).
+        :param mask: Bitmask of the included weekdays.
+        :return: An iterator of the qualifying dates.
+        """
+        first_weekday: int = first_date.weekday()
+
+        # Days after the start of each week, counted from first_date, that fall on an included weekday
+        offsets: list[int] = [offset for offset in range(7) if mask >> ((first_weekday + offset) % 7) & 1]
 
+        span: int = (last_date - first_date).days
+        for week in range(0, span + 1, 7):
+            for offset in offsets:
+                if week + offset > span:
+                    return
 
+                yield first_date + datetime.timedelta(week + offset)
@@ -0,0 +1,253 @@
+import datetime
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, NamedTuple, Sequence
+
+from bintrees import RBTree
+
+from ._days_of_week import ALL_DAYS_MASK, DaysOfWeek
+from ._range_query import RangeQuery
+from .date_array import DateArray
+
+# Normalized spec as sorted (days, months, years) and a weekday mask
+_Spec = tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...], int]
+
+# Number of shards per process, so a process that finishes early can pick up another shard
+_SHARDS_PER_PROCESS: int = 4
+
+
+class FilterSpec(NamedTuple):
+    """
+    One filter of a batch. Empty or None fields do not filter, so FilterSpec() matches every date.
+    :param days: Days of the month to keep.
+    :param months: Months (1–12) to keep.
+    :param years: Years to keep.
+    :param weekdays: Days of the week to keep (0 = Monday, ..., 6 = Sunday), None for all of them.
+    """
+    days: Sequence[int] = None
+    months: Sequence[int] = None
+    years: Sequence[int] = None
+    weekdays: Sequence[int] = None
+
+
+def _match_window(ordinals: Sequence[int], low: int, high: int, lower_date: datetime.date,
+                  upper_date: datetime.date, days: list[int], mask: int, matches: array) -> None:
+    """
+    Append the indexes of the shard's dates inside one calendar window that fall on one of the days and weekdays.
+    Days of the month are looked up directly. Without days, a window holding every date in its span has its matches
+    worked out from the weekdays, and any other window is scanned.
+    :param ordinals: Sorted ordinals of every date.
+    :param low: Index of the first date of the shard.
+    :param high: Index after the last date of the shard.
+    :param lower_date: First date of the window.
+    :param upper_date: Last date of the window.
+    :param days: Sorted days of the month to keep, empty for all.
+    :param mask: Bitmask of the weekdays to keep.
+    :param matches: Array the matching indexes are appended to.
+    :return: None
+    """
+    first: int = lower_date.toordinal()
+    last: int = upper_date.toordinal()
+    start: int = bisect_left(ordinals, first, low, high)
+    end: int = bisect_right(ordinals, last, start, high)
+
+    if start == end:
+        return
+
+    # Every date of the window is stored, so a date's index follows from its ordinal
+    dense: bool = end - start == last - first + 1
+
+    if days:
+        for day in days:
+            ordinal: int = first + day - 1
+            if day < 1 or ordinal > last or not mask >> (ordinal - 1) % 7 & 1:
+                continue
+
+            index: int = start + day - 1 if dense else bisect_left(ordinals, ordinal, start, end)
+            if index < end and ordinals[index] == ordinal:
+                matches.append(index)
+        return
+
+    if dense:
+        first_weekday: int = (first - 1) % 7
+        offsets: list[int] = [offset for offset in range(7) if mask >> (first_weekday + offset) % 7 & 1]
+        span: int = end - start
+        matches.extend(start + week + offset for week in range(0, span, 7) for offset in offsets
+                       if week + offset < span)
+        return
+
+    matches.extend(index for index in range(start, end) if mask >> (ordinals[index] - 1) % 7 & 1)
+
+
+def _match_shard(ordinals: Sequence[int], low: int, high: int, specs: list[_Spec]) -> list[bytes]:
+    """
+    Find the dates of a shard matching each spec. Each spec is cut into the year or month windows it can match in,
+    restricted to the years of the shard, and each window is found with binary searches so only the dates that can
+    match are visited.
+    :param ordinals: Sorted ordinals of every date.
+    :param low: Index of the first date of the shard.
+    :param high: Index after the last date of the shard.
+    :param specs: Normalized specs.
+    :return: For each spec, the indexes of its matches as the bytes of an int32 array, in ascending order.
+    """
+    first_year: int = datetime.date.fromordinal(ordinals[low]).year
+    last_year: int = datetime.date.fromordinal(ordinals[high - 1]).year
+    results: list[bytes] = []
+
+    for days, months, years, mask in specs:
+        matches: array = array("i")
+
+        # Years outside the shard can not match in it
+        shard_years: list[int] = ([year for year in years if first_year <= year <= last_year] if years
+                                  else list(range(first_year, last_year + 1)))
+
+        # Days of the month are looked up in month windows, otherwise whole years are taken at once
+        window_months: list[int] = list(months) if months else list(range(1, 13)) if days else []
+
+        if mask != 0 and shard_years:
+            for lower_date, upper_date in RangeQuery.calendar_windows(window_months, shard_years):
+                _match_window(ordinals, low, high, lower_date, upper_date, days, mask, matches)
+
+        results.append(matches.tobytes())
+
+    return results
+
+
+def _match_shared_shard(name: str, size: int, low: int, high: int, specs: list[_Spec]) -> list[bytes]:
+    """
+    Worker entry point. Attach to the shared ordinals and match one shard.
+    :param name: Name of the shared memory block holding the ordinals.
+    :param size: Number of ordinals in the block.
+    :return: See _match_shard.
+    """
+    shared: SharedMemory = SharedMemory(name=name)
+
+    try:
+        ordinals: memoryview = shared.buf[:4 * size].cast("i")
+
+        try:
+            return _match_shard(ordinals, low, high, specs)
+        finally:
+            ordinals.release()
+    finally:
+        shared.close()
+
+
+class BatchFilter:
+    """
+    Internal helper for evaluating many filters against one tree, spread over several processes.
+
+    The dates are copied once into shared memory as sorted int32 ordinals, split into shards on year boundaries and
+    matched against every spec by a pool of processes. The shards are in date order, so each spec's matches are put
+    back in sorted order by joining the shard results.
+    """
+    @staticmethod
+    def normalize(spec: FilterSpec | dict | tuple) -> _Spec:
+        """
+        Validate a spec and convert it to the form the workers match against.
+        :param spec: A FilterSpec, a dict with its fields as keys, or a tuple of its fields.
+        :raises ValueError: If a weekday is not in the range 0–6.
+        :return: The normalized spec.
+        """
+        if isinstance(spec, dict):
+            spec = FilterSpec(**spec)
+        elif not isinstance(spec, FilterSpec):
+            spec = FilterSpec(*spec)
+
+        mask: int = ALL_DAYS_MASK if spec.weekdays is None else DaysOfWeek.to_mask(spec.weekdays)
+        return (tuple(sorted(set(spec.days or ()))), tuple(sorted(set(spec.months or ()))),
+                tuple(sorted(set(spec.years or ()))), mask)
+
+    @staticmethod
+    def _shards(ordinals: Sequence[int], count: int) -> list[tuple[int, int]]:
+        """
+        Split the dates into about count shards of similar size, each starting on the first date of a year.
+        :return: A list of (low, high) index pairs, high exclusive, in ascending order.
+        """
+        size: int = len(ordinals)
+        bounds: set[int] = {0, size}
+
+        for shard in range(1, count):
+            year: int = datetime.date.fromordinal(ordinals[shard * size // count]).year
+            bounds.add(bisect_left(ordinals, datetime.date(year, 1, 1).toordinal()))
+
+        edges: list[int] = sorted(bounds)
+        return [(low, high) for low, high in zip(edges, edges[1:]) if low < high]
+
+    @staticmethod
+    def filter_batch(tree: RBTree, specs: Iterable[FilterSpec | dict | tuple], processes: int = None,
+                     executor: Executor = None) -> list[RBTree]:
+        """
+        Evaluate every spec against the tree.
+        :param tree: Tree to filter. Keys are expected to be datetime.date.
+        :param specs: The filters to evaluate.
+        :param processes: Number of worker processes, None for one per CPU. With 1 the batch runs in this process.
+        :param executor: Optional executor to run the shards in instead of a new process pool. It must accept
+        module-level functions, as a ProcessPoolExecutor does.
+        :raises ValueError: If a spec has a weekday outside 0–6 or processes is less than 1.
+        :return: One new tree of the same type as the source tree per spec, in the order of the specs. A spec matching
+        no dates gives an empty tree.
+        """
+        normalized: list[_Spec] = [BatchFilter.normalize(spec) for spec in specs]
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+
+        if processes < 1:
+            raise ValueError("Number of processes must be at least 1")
+
+        if isinstance(tree, DateArray):
+            ordinals: array = array("i", tree.ordinals)
+        else:
+            ordinals = array("i", (key.toordinal() for key in tree.keys()))
+
+        if len(ordinals) == 0 or len(normalized) == 0:
+            return [tree.__class__() for _ in normalized]
+
+        shards: list[tuple[int, int]] = BatchFilter._shards(ordinals, processes * _SHARDS_PER_PROCESS)
+
+        if processes == 1 and executor is None:
+            shard_results: list[list[bytes]] = [_match_shard(ordinals, low, high, normalized) for low, high in shards]
+        else:
+            shard_results = BatchFilter._run_shared(ordinals, shards, normalized, processes, executor)
+
+        values: list[object] = list(tree.values())
+        from_ordinal = datetime.date.fromordinal
+        results: list[RBTree] = []
+
+        for spec_index in range(len(normalized)):
+            indexes: array = array("i")
+            for shard_result in shard_results:
+                indexes.frombytes(shard_result[spec_index])
+
+            result: RBTree = tree.__class__()
+            result.update((from_ordinal(ordinals[index]), values[index]) for index in indexes)
+            results.append(result)
+
+        return results
+
+    @staticmethod
+    def _run_shared(ordinals: array, shards: list[tuple[int, int]], specs: list[_Spec], processes: int,
+                    executor: Executor) -> list[list[bytes]]:
+        """
+        Copy the ordinals into shared memory and match the shards in worker processes.
+        :return: The results of _match_shard for each shard, in shard order.
+        """
+        shared: SharedMemory = SharedMemory(create=True, size=max(1, 4 * len(ordinals)))
+
+        try:
+            shared.buf[:4 * len(ordinals)] = ordinals.tobytes()
+            arguments: tuple = ([shared.name] * len(shards), [len(ordinals)] * len(shards),
+                                [low for low, _ in shards], [high for _, high in shards], [specs] * len(shards))
+
+            if executor is not None:
+                return list(executor.map(_match_shared_shard, *arguments))
+
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                return list(pool.map(_match_shared_shard, *arguments))
+        finally:
+            shared.close()
+            shared.unlink()
@@ -0,0 +1,337 @@
+import datetime
+from typing import Iterable, Iterator
+
+# Bitmask with a bit for each of the 31 possible days of a month
+_ALL_DAYS: int = (1 << 31) - 1
+
+# Multiplying a 7-bit week pattern by this repeats it five times, enough to cover 31 days
+_WEEK_REPEAT: int = sum(1 << (7 * week) for week in range(5))
+
+# Bitmask with a bit for each weekday
+_ALL_WEEKDAYS: int = 0x7F
+
+
+class CalendarIndex:
+    """
+    Internal index of stored dates by calendar field, mapping year -> month -> days of that month.
+
+    The days of each month are kept as a bitmask where bit d - 1 is set when day d is stored. A bucket is therefore
+    always in sorted order, adding or removing a date is O(1), and the day and weekday filters are applied to a whole
+    month with a single bitwise AND.
+
+    The number of dates in each year is kept alongside, so a whole year is counted without visiting its months. Range
+    counts use a Fenwick tree of those per-year counts, built on the first range count and kept in step afterwards.
+    """
+    __slots__ = ("_years", "_year_counts", "_fenwick")
+
+    def __init__(self, dates: Iterable[datetime.date] = ()):
+        """
+        Build the index from existing dates.
+        :param dates: Dates to index.
+        """
+        self._years: dict[int, dict[int, int]] = {}
+        self._fenwick: list[int] = None
+
+        for date in dates:
+            months: dict[int, int] = self._years.setdefault(date.year, {})
+            months[date.month] = months.get(date.month, 0) | (1 << (date.day - 1))
+
+        # Totalled once the buckets are filled rather than kept in step date by date
+        self._year_counts: dict[int, int] = {year: sum(bits.bit_count() for bits in months.values())
+                                             for year, months in self._years.items()}
+
+    def add(self, date: datetime.date) -> None:
+        """
+        Add a date to the index. Adding a date that is already indexed has no effect.
+        :param date: The date to add.
+        :return: None
+        """
+        months: dict[int, int] = self._years.setdefault(date.year, {})
+        bits: int = months.get(date.month, 0)
+        bit: int = 1 << (date.day - 1)
+
+        if not bits & bit:
+            months[date.month] = bits | bit
+            self._year_counts[date.year] = self._year_counts.get(date.year, 0) + 1
+
+            if self._fenwick is not None:
+                self._update_fenwick(date.year, 1)
+
+    def remove(self, date: datetime.date) -> None:
+        """
+        Remove a date from the index. Removing a date that is not indexed has no effect.
+        :param date: The date to remove.
+        :return: None
+        """
+        months: dict[int, int] = self._years.get(date.year)
+        bit: int = 1 << (date.day - 1)
+        if months is None or not months.get(date.month, 0) & bit:
+            return
+
+        bits: int = months[date.month] & ~bit
+
+        if self._fenwick is not None:
+            self._update_fenwick(date.year, -1)
+
+        # Drops empty buckets so lookups never visit them
+        if bits:
+            months[date.month] = bits
+            self._year_counts[date.year] -= 1
+        else:
+            del months[date.month]
+            if len(months) == 0:
+                del self._years[date.year]
+                del self._year_counts[date.year]
+            else:
+                self._year_counts[date.year] -= 1
+
+    def __contains__(self, date: datetime.date) -> bool:
+        """
+        :param date: The date.
+        :return: True if the date is indexed, a single bit test.
+        """
+        return bool(self._years.get(date.year, {}).get(date.month, 0) >> (date.day - 1) & 1)
+
+    def _update_fenwick(self, year: int, change: int) -> None:
+        """
+        Apply a change in the count of a year to the built Fenwick tree.
+        :param year: The year whose count changed.
+        :param change: The change, 1 for an added date and -1 for a removed one.
+        :return: None
+        """
+        position: int = year
+        while position < len(self._fenwick):
+            self._fenwick[position] += change
+            position += position & -position
+
+    def _build_fenwick(self) -> None:
+        """
+        Build the Fenwick tree of the per-year counts if it has not been built yet. It fills in O(years) by pushing
+        each node's total to its parent.
+        :return: None
+        """
+        if self._fenwick is not None:
+            return
+
+        fenwick: list[int] = [0] * (datetime.MAXYEAR + 1)
+        for year, count in self._year_counts.items():
+            fenwick[year] = count
+
+        for position in range(1, len(fenwick)):
+            parent: int = position + (position & -position)
+            if parent < len(fenwick):
+                fenwick[parent] += fenwick[position]
+
+        self._fenwick = fenwick
+
+    def _years_before(self, year: int) -> int:
+        """
+        Count the indexed dates in the years before a year, building the Fenwick tree on the first call.
+        :param year: The year, from 1 to datetime.MAXYEAR + 1.
+        :return: The number of dates.
+        """
+        self._build_fenwick()
+
+        total: int = 0
+        position: int = year - 1
+        while position > 0:
+            total += self._fenwick[position]
+            position -= position & -position
+
+        return total
+
+    def _up_to(self, date: datetime.date) -> int:
+        """
+        Count the indexed dates on or before a date.
+        :param date: The date.
+        :return: The number of dates.
+        """
+        months: dict[int, int] = self._years.get(date.year, {})
+        total: int = self._years_before(date.year)
+
+        for month, bits in months.items():
+            if month < date.month:
+                total += bits.bit_count()
+
+        return total + (months.get(date.month, 0) & ((1 << date.day) - 1)).bit_count()
+
+    @staticmethod
+    def _field_mask(values: list[int]) -> int:
+        """
+        Build a day-of-month bitmask from a list of days, or a mask of every day if the list is empty.
+        :param values: Days of the month to include.
+        :return: The bitmask.
+        """
+        if len(values) == 0:
+            return _ALL_DAYS
+
+        mask: int = 0
+        for value in values:
+            if 1 <= value <= 31:
+                mask |= 1 << (value - 1)
+
+        return mask
+
+    @staticmethod
+    def _weekday_mask(first_weekday: int, weekday_bits: int) -> int:
+        """
+        Build the day-of-month bitmask of the days of a month falling on one of the included weekdays.
+        :param first_weekday: Weekday of the first of the month (0 = Monday, ..., 6 = Sunday).
+        :param weekday_bits: 7-bit mask of included weekdays, bit w set when weekday w is included.
+        :return: The bitmask.
+        """
+        # Rotates the weekday mask so bit 0 is the weekday of the 1st, then repeats it for each week of the month
+        week: int = ((weekday_bits >> first_weekday) | (weekday_bits << (7 - first_weekday))) & 0x7F
+        return (week * _WEEK_REPEAT) & _ALL_DAYS
+
+    def dates(self, days: list[int], months: list[int], years: list[int],
+              weekday_bits: int) -> Iterator[datetime.date]:
+        """
+        Yield the indexed dates matching every given filter, in ascending order. Only the buckets of the requested
+        years and months are visited. An empty days, months or years list does not filter on that field.
+        :param days: Days of the month to include.
+        :param months: Months (1–12) to include.
+        :param years: Years to include.
+        :param weekday_bits: 7-bit mask of the weekdays to include, bit w set when weekday w is included.
+        :return: An iterator of matching dates.
+        """
+        day_mask: int = self._field_mask(days)
+
+        if len(years) > 0:
+            selected_years: list[int] = sorted(year for year in set(years) if year in self._years)
+        else:
+            selected_years = sorted(self._years)
+
+        for year in selected_years:
+            buckets: dict[int, int] = self._years[year]
+
+            if len(months) > 0:
+                selected_months: list[int] = sorted(month for month in set(months) if month in buckets)
+            else:
+                selected_months = sorted(buckets)
+
+            for month in selected_months:
+                first_weekday: int = datetime.date(year, month, 1).weekday()
+                bits: int = buckets[month] & day_mask & self._weekday_mask(first_weekday, weekday_bits)
+
+                # Walks the set bits from the lowest, i.e. in day order
+                while bits:
+                    lowest: int = bits & -bits
+                    yield datetime.date(year, month, lowest.bit_length())
+                    bits ^= lowest
+
+    def count(self, months: list[int], years: list[int]) -> int:
+        """
+        Count the indexed dates in the buckets a filter on the given months and years visits.
+        :param months: Months (1–12) filtered by, empty for all.
+        :param years: Years filtered by, empty for all.
+        :return: The number of dates in those buckets.
+        """
+        selected_years: Iterable[int] = set(years) if len(years) > 0 else self._years
+        selected_months: set[int] = set(months)
+        total: int = 0
+
+        for year in selected_years:
+            for month, bits in self._years.get(year, {}).items():
+                if len(selected_months) == 0 or month in selected_months:
+                    total += bits.bit_count()
+
+        return total
+
+    def count_matching(self, days: list[int], months: list[int], years: list[int], weekday_bits: int) -> int:
+        """
+        Count the indexed dates matching every given filter, the number of dates dates() would yield, with one bit
+        count per visited bucket. A year filtered by nothing else is counted from its total alone.
+        :param days: Days of the month to include, empty for all.
+        :param months: Months (1–12) to include, empty for all.
+        :param years: Years to include, empty for all.
+        :param weekday_bits: 7-bit mask of the weekdays to include, bit w set when weekday w is included.
+        :return: The number of matching dates.
+        """
+        selected_years: Iterable[int] = set(years) if len(years) > 0 else self._year_counts
+
+        if len(days) == 0 and len(months) == 0 and weekday_bits & _ALL_WEEKDAYS == _ALL_WEEKDAYS:
+            return sum(self._year_counts.get(year, 0) for year in selected_years)
+
+        day_mask: int = self._field_mask(days)
+        selected_months: set[int] = set(months)
+        total: int = 0
+
+        for year in selected_years:
+            for month, bits in self._years.get(year, {}).items():
+                if len(selected_months) > 0 and month not in selected_months:
+                    continue
+
+                first_weekday: int = datetime.date(year, month, 1).weekday()
+                total += (bits & day_mask & self._weekday_mask(first_weekday, weekday_bits)).bit_count()
+
+        return total
+
+    def count_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Count the indexed dates from lower_date to upper_date (inclusive) in O(log years), plus at most the twelve
+        month buckets of each bounding year.
+        :param lower_date: Lower bound of the range, or None for no lower bound.
+        :param upper_date: Upper bound of the range, or None for no upper bound.
+        :return: The number of dates in the range.
+        """
+        if lower_date is not None and upper_date is not None and lower_date > upper_date:
+            return 0
+
+        total: int = sum(self._year_counts.values()) if upper_date is None else self._up_to(upper_date)
+
+        if lower_date is not None and lower_date > datetime.date.min:
+            total -= self._up_to(lower_date - datetime.timedelta(days=1))
+
+        return total
+
+    def rank(self, date: datetime.date) -> int:
+        """
+        Count the indexed dates before a date in O(log years), plus at most the twelve month buckets of its year.
+        :param date: The date.
+        :return: The number of dates earlier than date.
+        """
+        if date == datetime.date.min:
+            return 0
+
+        return self._up_to(date - datetime.timedelta(days=1))
+
+    def select(self, index: int) -> datetime.date:
+        """
+        Get the indexed date at a position in ascending order. The year is found by descending the Fenwick tree in
+        O(log years), then the month among at most twelve buckets and the day among the bits of one bucket.
+        :param index: Position from 0 to the number of dates - 1.
+        :raises IndexError: If the position is out of range.
+        :return: The date.
+        """
+        if index < 0:
+            raise IndexError("CalendarIndex index out of range")
+
+        self._build_fenwick()
+
+        # Finds the last year whose earlier years hold at most index dates
+        year: int = 0
+        step: int = 1 << (len(self._fenwick) - 1).bit_length()
+        while step:
+            if year + step < len(self._fenwick) and self._fenwick[year + step] <= index:
+                year += step
+                index -= self._fenwick[year]
+            step >>= 1
+
+        months: dict[int, int] = self._years.get(year + 1)
+        if months is None:
+            raise IndexError("CalendarIndex index out of range")
+
+        for month in sorted(months):
+            bits: int = months[month]
+            count: int = bits.bit_count()
+
+            if index >= count:
+                index -= count
+                continue
+
+            # Drops the lowest set bits until the wanted day is the lowest
+            for _ in range(index):
+                bits &= bits - 1
+
+            return datetime.date(year + 1, month, (bits & -bits).bit_length())
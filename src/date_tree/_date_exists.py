@@ -1,4 +1,5 @@
 import datetime
+from typing import Iterable
 
 from bintrees import RBTree
 
@@ -6,16 +7,61 @@ class DateExists:
     """
     Internal helper for checking whether a given date exists in an RBTree.
     """
+    __slots__ = ()
+
+    @staticmethod
+    def _check_date_type(date: datetime.date) -> None:
+        """
+        Validate that the given value is a date.
+        :param date: The value being checked.
+        :raises ValueError: Raises if invalid date type
+        :return: None
+        """
+        if not isinstance(date, datetime.date):
+            raise ValueError("Invalid date type. Date must be of type datetime.date")
+
     @staticmethod
     def date_exist(tree: RBTree, date: datetime.date) -> bool:
         """
-        Check whether the given date exists in the tree.
+        Check whether the given date exists in the tree. The lookup descends the tree by key so it costs O(log n)
+        rather than a scan of every key.
         :param tree: The tree to be searched. Keys are expected to be datetime.date.
         :param date: The date being searched for.
         :raises ValueError: Raises if invalid date type
         :return: True if the date exists in the tree, False otherwise.
         """
-        if isinstance(date, datetime.date):
-            return date in tree.keys()
-        else:
-            raise ValueError("Invalid date type. Date must be of type datetime.date")
+        DateExists._check_date_type(date)
+        return date in tree
+
+    @staticmethod
+    def dates_exist(tree: RBTree, dates: Iterable[datetime.date]) -> list[bool]:
+        """
+        Check whether each of the given dates exists in the tree. Every date is validated before any lookup is made
+        so an invalid entry raises without partial results, then each date is answered with a keyed O(log n) lookup.
+        :param tree: The tree to be searched. Keys are expected to be datetime.date.
+        :param dates: Iterable of dates being searched for.
+        :raises ValueError: Raises if any date is of an invalid date type
+        :return: A list of bools in the same order as dates, True where the date exists in the tree.
+        """
+        dates = list(dates)
+
+        for date in dates:
+            DateExists._check_date_type(date)
+
+        return [date in tree for date in dates]
+
+    @staticmethod
+    def date_value(tree: RBTree, date: datetime.date) -> object:
+        """
+        Get the value stored with the given date. Like date_exist, the lookup descends the tree by key in O(log n).
+        :param tree: The tree to be searched. Keys are expected to be datetime.date.
+        :param date: The date whose value is wanted.
+        :raises ValueError: Raises if invalid date type or if the date does not exist in the tree
+        :return: The value stored with the date.
+        """
+        DateExists._check_date_type(date)
+
+        try:
+            return tree.get_value(date)
+        except KeyError:
+            raise ValueError("Date is not found in the tree")
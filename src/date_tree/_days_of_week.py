@@ -1,23 +1,58 @@
+# Mask with the bit of every day of the week set
+ALL_DAYS_MASK: int = 0b1111111
+
 
 class DaysOfWeek:
     """
     Manage a set of included weekdays represented as integers 0–6. Weekdays follow the datetime convention:
-    0 = Monday, 1 = Tuesday, ..., 6 = Sunday. The included_days_list field stores the indices of weekdays that are
-    currently enabled for operations such as adding or filtering dates.
+    0 = Monday, 1 = Tuesday, ..., 6 = Sunday. The set is stored as a 7-bit mask where bit w is set when weekday w is
+    enabled for operations such as adding or filtering dates, so membership is a single bit test and including a day
+    more than once has no effect.
     """
+    __slots__ = ("_mask",)
+
     def __init__(self):
         """
         Initialize with no days of the week included.
         """
-        self.included_days_list: list[int] = []
+        self._mask: int = 0
+
+    @classmethod
+    def from_weekdays(cls, weekdays: list[int]) -> "DaysOfWeek":
+        """
+        Create a selection already holding the given weekdays, for callers that pass their selection by value rather
+        than sharing one DaysOfWeek.
+        :param weekdays: Weekdays to include (0 = Monday, ..., 6 = Sunday).
+        :raises ValueError: If a weekday is not in the range 0–6.
+        :return: The new DaysOfWeek.
+        """
+        days_of_week: DaysOfWeek = cls()
+        days_of_week._mask = cls.to_mask(weekdays)
+        return days_of_week
+
+    @property
+    def mask(self) -> int:
+        """
+        Return the included weekdays as a bitmask.
+        :return: An int where bit w is set when weekday w is included (bit 0 = Monday, ..., bit 6 = Sunday).
+        """
+        return self._mask
 
     @property
     def included(self) -> list[int]:
         """
         Return the list of included weekdays.
-        :return: A list of integers representing included weekdays (0 = Monday, ..., 6 = Sunday).
+        :return: A sorted list of integers representing included weekdays (0 = Monday, ..., 6 = Sunday).
+        """
+        return [day for day in range(7) if self._mask >> day & 1]
+
+    @property
+    def included_days_list(self) -> list[int]:
+        """
+        Return the list of included weekdays. Kept for compatibility, see included.
+        :return: A sorted list of integers representing included weekdays (0 = Monday, ..., 6 = Sunday).
         """
-        return self.included_days_list
+        return self.included
 
     def _include_exclude_check(self, days_list: list[bool], action: str) -> None:
         """
@@ -38,8 +73,7 @@ class DaysOfWeek:
         :return: None
         """
         self._include_exclude_check(days_list, "include")
-        for i in range(0, 7):
-            self.included_days_list.append(i)
+        self._mask = ALL_DAYS_MASK
 
     def _exclude_all(self, days_list: list[bool]) -> None:
         """
@@ -48,7 +82,7 @@ class DaysOfWeek:
         :return: None
         """
         self._include_exclude_check(days_list, "exclude")
-        self.included_days_list.clear()
+        self._mask = 0
 
     def included_days(self, monday=False, tuesday=False, wednesday=False, thursday=False, friday=False, saturday=False,
                      sunday=None, include_all=False, exclude_all=False) -> None:
@@ -84,9 +118,27 @@ class DaysOfWeek:
             # Includes particular days of week
             for i in range(len(days)):
                 if days[i] is True:
-                    self.included_days_list.append(i)
-
-
+                    self._mask |= 1 << i
 
+    def clear(self) -> None:
+        """
+        Exclude every day of the week, the same as included_days(exclude_all=True) without checking any flags.
+        :return: None
+        """
+        self._mask = 0
 
+    @staticmethod
+    def to_mask(weekdays: list[int]) -> int:
+        """
+        Convert a list of weekdays to a bitmask.
+        :param weekdays: Weekdays (0 = Monday, ..., 6 = Sunday).
+        :raises ValueError: If a weekday is not in the range 0–6.
+        :return: The bitmask with bit w set for each weekday w.
+        """
+        mask: int = 0
+        for day in weekdays:
+            if not 0 <= day <= 6:
+                raise ValueError(f"Invalid day of week {day}, days of week are 0 (Monday) to 6 (Sunday)")
+            mask |= 1 << day
 
+        return mask
@@ -1,24 +1,28 @@
 import datetime
+from typing import Callable, Iterable
+
 from bintrees import RBTree
 
+from ._calendar_index import CalendarIndex
 from ._date_exists import DateExists
-from ._days_of_week import DaysOfWeek
+from ._range_query import RangeQuery
+from .date_runs import DateRuns
 
 
 class DeleteDates:
     """
-    Internal helper for deleting single dates or date ranges from an RBTree.
+    Internal helper for deleting single dates or date ranges from an RBTree. One helper lives as long as its DateTree.
     """
+    __slots__ = ("tree", "index")
 
-    def __init__(self, tree: RBTree, days_of_week: DaysOfWeek):
+    def __init__(self, tree: RBTree, index: CalendarIndex = None):
         """
         Initialize a DeleteDates helper.
         :param tree: The RBTree that stores dates as keys and values as associated objects.
-        :param days_of_week: DaysOfWeek instance.
+        :param index: Optional CalendarIndex kept in step with the dates removed from the tree.
         """
         self.tree = tree
-        self.days_of_week: DaysOfWeek = days_of_week
-        self.find = DateExists()
+        self.index: CalendarIndex = index
 
     def delete_date(self, date: datetime.date) -> RBTree:
         """
@@ -27,10 +31,17 @@ class DeleteDates:
         :raises ValueError: If the date is not found in the tree.
         :return: The tree with the date removed.
         """
-        if not self.find.date_exist(self.tree, date):
+        DateExists._check_date_type(date)
+
+        # Removing straight away finds the date once, rather than once to check it and again to remove it
+        try:
+            self.tree.remove(date)
+        except KeyError:
             raise ValueError("Date is not found in the tree")
 
-        self.tree.remove(date)
+        if self.index is not None:
+            self.index.remove(date)
+
         return self.tree
 
     def delete_date_range(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> RBTree:
@@ -56,21 +67,71 @@ class DeleteDates:
             if lower_date > upper_date:
                 raise ValueError(f"Lower date must be less than or equal to upper date")
 
-        keys_to_delete: list[datetime.date] = []
-
-        for key in self.tree.keys():
-            # If lower bound exists and key is below it continue to next iteration
-            if lower_date is not None and key < lower_date:
-                continue
+        # A DateRuns cuts the range out of its runs without visiting the dates, it never has an index to update
+        if isinstance(self.tree, DateRuns):
+            self.tree.remove_range(lower_date, upper_date)
+            return self.tree
 
-            # If upper bound exists and key is above it break from loop
-            if upper_date is not None and key > upper_date:
-                break
-            # Add keys to be deleted to list
-            keys_to_delete.append(key)
+        # Collects the keys first since the tree can not be modified while it is being walked
+        keys_to_delete: list[datetime.date] = list(RangeQuery.keys_between(self.tree, lower_date, upper_date))
 
         # Delete elements from tree
-        for key in keys_to_delete:
-            self.tree.remove(key)
+        self.remove_keys(keys_to_delete)
+
+        return self.tree
+
+    def remove_keys(self, keys: list[datetime.date]) -> None:
+        """
+        Remove dates that are known to be in the tree, as one batch, and keep the index in step.
+        :param keys: The dates to remove.
+        :return: None
+        """
+        self.tree.remove_items(keys)
+
+        if self.index is not None:
+            for key in keys:
+                self.index.remove(key)
+
+    def delete_dates(self, dates: Iterable[datetime.date]) -> list[datetime.date]:
+        """
+        Delete every given date that exists in the tree. Dates that are not in the tree are skipped and reported
+        instead of raising. Every date is validated before anything is removed.
+        :param dates: The dates to be removed, in any order. Duplicates are removed once.
+        :raises ValueError: If any of the dates is not of type datetime.date.
+        :return: The requested dates that were not found in the tree, in ascending order.
+        """
+        requested: list[datetime.date] = list(set(dates))
+
+        # Checks the types before sorting so an invalid entry raises ValueError rather than failing to compare
+        found: list[bool] = DateExists.dates_exist(self.tree, requested)
+        checked: list[tuple[datetime.date, bool]] = sorted(zip(requested, found))
+
+        keys_to_delete: list[datetime.date] = [date for date, exists in checked if exists]
+        missing: list[datetime.date] = [date for date, exists in checked if not exists]
+
+        self.remove_keys(keys_to_delete)
+
+        return missing
+
+    def delete_where(self, predicate: Callable[[datetime.date, object], bool], lower_date: datetime.date = None,
+                     upper_date: datetime.date = None) -> list[datetime.date]:
+        """
+        Delete every date for which predicate(date, value) is True. The matches are collected in one ordered walk of
+        the tree, optionally limited to an inclusive range, and then removed as one batch.
+        :param predicate: Called with each date and its value, returns True if the date should be removed.
+        :param lower_date: Lower bound of dates to consider (inclusive), or None for no lower bound.
+        :param upper_date: Upper bound of dates to consider (inclusive), or None for no upper bound.
+        :raises ValueError: If lower_date is greater than upper_date.
+        :return: The removed dates in ascending order.
+        """
+        if lower_date is not None and upper_date is not None:
+            if lower_date > upper_date:
+                raise ValueError(f"Lower date must be less than or equal to upper date")
+
+        keys_to_delete: list[datetime.date] = [key for key, value in
+                                               RangeQuery.items_between(self.tree, lower_date, upper_date)
+                                               if predicate(key, value)]
+
+        self.remove_keys(keys_to_delete)
 
-        return self.tree
\ No newline at end of file
+        return keys_to_delete
@@ -0,0 +1,118 @@
+import datetime
+import threading
+from collections import OrderedDict, namedtuple
+
+from bintrees import RBTree
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+FilterKey = tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...], int]
+
+
+class FilterCache:
+    """
+    Internal least recently used cache of filter results, keyed by the normalized filter arguments.
+
+    Cached trees are shared between every caller that hits the same entry, so they must be treated as read-only. Every
+    operation holds an internal lock, so one cache can be used from several threads.
+    """
+    def __init__(self, maxsize: int):
+        """
+        Create an empty cache.
+        :param maxsize: Largest number of results kept before the least recently used one is evicted.
+        :raises ValueError: If maxsize is less than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict[FilterKey, RBTree] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def make_key(days: list[int], months: list[int], years: list[int], weekday_mask: int) -> FilterKey:
+        """
+        Normalize filter arguments so that calls selecting the same dates share an entry regardless of order,
+        duplicates, or None versus an empty list.
+        :param days: Days of the month filtered by.
+        :param months: Months filtered by.
+        :param years: Years filtered by.
+        :param weekday_mask: Bitmask of the weekdays filtered by.
+        :return: The cache key.
+        """
+        return (tuple(sorted(set(days or []))), tuple(sorted(set(months or []))), tuple(sorted(set(years or []))),
+                weekday_mask)
+
+    @property
+    def info(self) -> CacheInfo:
+        """
+        Gets the cache statistics.
+        :return: A CacheInfo of hits, misses, maxsize and currsize.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def get(self, key: FilterKey) -> RBTree | None:
+        """
+        Look up a cached result and mark it as most recently used.
+        :param key: Key built by make_key.
+        :return: The cached tree, or None on a miss.
+        """
+        with self._lock:
+            result: RBTree = self._entries.get(key)
+
+            if result is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: FilterKey, result: RBTree) -> None:
+        """
+        Store a result, evicting the least recently used entry if the cache is full.
+        :param key: Key built by make_key.
+        :param result: The filtered tree.
+        :return: None
+        """
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> None:
+        """
+        Drop every entry whose result could change when dates between lower_date and upper_date (inclusive) are added
+        or removed. Entries filtered to years entirely outside the range are kept.
+        :param lower_date: Lower bound of the changed range, or None if it is open.
+        :param upper_date: Upper bound of the changed range, or None if it is open.
+        :return: None
+        """
+        lower_year: int = datetime.MINYEAR if lower_date is None else lower_date.year
+        upper_year: int = datetime.MAXYEAR if upper_date is None else upper_date.year
+
+        with self._lock:
+            stale: list[FilterKey] = []
+            for key in self._entries:
+                years: tuple[int, ...] = key[2]
+
+                if len(years) == 0 or any(lower_year <= year <= upper_year for year in years):
+                    stale.append(key)
+
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the statistics.
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
@@ -1,79 +1,272 @@
+import datetime
+import threading
+from typing import Callable, Iterator
+
 from bintrees import RBTree
 
+from ._calendar_index import CalendarIndex
 from ._days_of_week import DaysOfWeek
+from ._filter_cache import FilterCache, FilterKey
+from ._range_query import RangeQuery
+from .date_array import DateArray
+from .date_runs import DateRuns
+
+
+class FilteredView:
+    """
+    Lazy, read-only result of a filter. Iterating yields the matching (date, value) pairs in sorted order straight from
+    the source tree, without copying them into a new tree. Each iteration runs the filter again, so the source tree
+    must not be changed while a view is being iterated.
+    """
+    __slots__ = ("_matches", "_tree_type")
+
+    def __init__(self, matches: Callable[[], Iterator[tuple[datetime.date, object]]], tree_type: type):
+        """
+        Create a FilteredView.
+        :param matches: Callable returning a fresh iterator of the matching (date, value) pairs.
+        :param tree_type: Type of the source tree, used by to_tree.
+        """
+        self._matches = matches
+        self._tree_type = tree_type
+
+    def __iter__(self) -> Iterator[tuple[datetime.date, object]]:
+        """
+        :return: An iterator of the matching (date, value) pairs in ascending date order.
+        """
+        return self._matches()
+
+    def keys(self) -> Iterator[datetime.date]:
+        """
+        :return: An iterator of the matching dates in ascending order.
+        """
+        return (key for key, _ in self._matches())
+
+    def to_tree(self) -> RBTree:
+        """
+        Materialize the view.
+        :return: A new tree of the same type as the source tree containing the matching dates and values.
+        """
+        tree: RBTree = self._tree_type()
+        for key, value in self._matches():
+            tree.insert(key, value)
+
+        return tree
 
 
 class FilteredDates:
     """
-    Internal helper for filtering dates from an RBTree based on year, month, day, and/or day of week.
+    Internal helper for filtering dates from an RBTree based on year, month, day, and/or day of week. One helper lives
+    as long as its DateTree; the weekdays to keep are passed to each call, so concurrent filters can share it.
+
+    Each filter that builds a tree also notes how many stored dates it considered, per thread, for take_scanned.
     """
+    __slots__ = ("tree", "index", "cache", "_scans")
 
-    def __init__(self, tree: RBTree, days_of_week: DaysOfWeek):
+    def __init__(self, tree: RBTree, index: CalendarIndex = None, cache: FilterCache = None):
         """
         Construct a FilteredDates helper with the required dependencies.
         :param tree: Tree to filter from. Keys are expected to be datetime.date.
-        :param days_of_week: DaysOfWeek instance controlling which weekdays are considered when filtering.
+        :param index: Optional CalendarIndex of the tree. When given, only the matching year and month buckets are
+        visited instead of the tree itself.
+        :param cache: Optional FilterCache. When given, materialized results are looked up in and stored to it.
         """
         self.tree = tree
-        self.days_of_week = days_of_week
+        self.index: CalendarIndex = index
+        self.cache: FilterCache = cache
+        self._scans: threading.local = threading.local()
 
-    def _reset_days_of_week(self) -> None:
+    @staticmethod
+    def _reset_days_of_week(days_of_week: DaysOfWeek) -> None:
         """
         Reset the DaysOfWeek configuration to exclude all days. This is called after each filtering operation.
+        :param days_of_week: The DaysOfWeek the filter used.
+        """
+        days_of_week.clear()
+
+    def _matches(self, days: list[int], months: list[int], years: list[int], weekday_mask: int,
+                 scanned: list[int] = None) -> Iterator[tuple[datetime.date, object]]:
+        """
+        Yield the (date, value) pairs of the tree matching every filter, in ascending date order.
+        :param days: List of day-of-month values to filter by, empty for all.
+        :param months: List of month values (1–12) to filter by, empty for all.
+        :param years: List of year values to filter by, empty for all.
+        :param weekday_mask: Bitmask of the weekdays a date must fall on, bit w set when weekday w is included.
+        :param scanned: Optional one-item list set to the number of stored dates considered once the iterator is
+        exhausted: the dates of the visited index buckets, or the dates walked in the calendar windows. Not set for a
+        DateRuns, whose filter visits runs rather than dates.
+        :return: An iterator of (date, value) tuples.
+        """
+        if isinstance(self.tree, DateRuns):
+            yield from self.tree.filtered(days, months, years, weekday_mask).items()
+            return
+
+        if self.index is not None:
+            if scanned is not None:
+                scanned[0] = self.index.count(months, years)
+
+            for key in self.index.dates(days, months, years, weekday_mask):
+                yield key, self.tree.get_value(key)
+            return
+
+        walked: int = 0
+
+        # Only the windows that can hold the requested years (and months) are walked
+        for lower_date, upper_date in RangeQuery.calendar_windows(months, years):
+            for key, value in RangeQuery.items_between(self.tree, lower_date, upper_date):
+                walked += 1
+
+                # Filter by year
+                if len(years) > 0 and key.year not in years:
+                    continue
+
+                # Filter by month
+                if len(months) > 0 and key.month not in months:
+                    continue
+
+                # Filter by day of month
+                if len(days) > 0 and key.day not in days:
+                    continue
+
+                # Filter by day of week if any are configured
+                if not weekday_mask >> key.weekday() & 1:
+                    continue
+
+                yield key, value
+
+        if scanned is not None:
+            scanned[0] = walked
+
+    def take_scanned(self) -> int | None:
+        """
+        Get the number of stored dates considered by the calling thread's last filter that built a tree, and forget
+        it. A filter answered from the cache considered none.
+        :return: The number of dates, or None if no filter has run since the last call or the filter was lazy.
+        """
+        scanned: int = getattr(self._scans, "scanned", None)
+        self._scans.scanned = None
+        return scanned
+
+    def count(self, days_of_week: DaysOfWeek, days: list[int] = None, months: list[int] = None,
+              years: list[int] = None) -> int:
+        """
+        Count the dates filtered_date_range would return without building a tree: from the index buckets, by clipping
+        the runs of a DateRuns to each calendar window, or by walking the calendar windows of an unindexed tree.
+        :param days_of_week: DaysOfWeek selecting the weekdays to count. It is reset afterwards.
+        :param days: Optional list of day-of-month values to filter by.
+        :param months: Optional list of month values (1–12) to filter by.
+        :param years: Optional list of year values to filter by.
+        :return: The number of matching dates, 0 if none match.
+        """
+        days = list(days or [])
+        months = list(months or [])
+        years = list(years or [])
+        weekday_mask: int = days_of_week.mask
+
+        # Reset all days of week after each filtering call
+        self._reset_days_of_week(days_of_week)
+
+        if isinstance(self.tree, DateRuns):
+            return self.tree.count_matching(days, months, years, weekday_mask)
+
+        if self.index is not None:
+            return self.index.count_matching(days, months, years, weekday_mask)
+
+        return sum(1 for _ in self._matches(days, months, years, weekday_mask))
+
+    def count_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Count the dates from lower_date to upper_date (inclusive). A DateArray or DateRuns counts them in O(log n) and
+        the index in O(log years); only an unindexed RBTree walks the range.
+        :param lower_date: Lower bound of the range, or None for no lower bound.
+        :param upper_date: Upper bound of the range, or None for no upper bound.
+        :return: The number of dates in the range.
         """
-        self.days_of_week.included_days(exclude_all=True)
+        if isinstance(self.tree, (DateArray, DateRuns)):
+            return self.tree.count_between(lower_date, upper_date)
 
-    def filtered_date_range(self, days: list[int] = None, months: list[int] = None,
-                            years: list[int] = None) -> RBTree:
+        if self.index is not None:
+            return self.index.count_between(lower_date, upper_date)
+
+        return sum(1 for _ in RangeQuery.keys_between(self.tree, lower_date, upper_date))
+
+    def filtered_date_range(self, days_of_week: DaysOfWeek, days: list[int] = None, months: list[int] = None,
+                            years: list[int] = None, lazy: bool = False) -> RBTree | FilteredView:
         """
         Retrieve dates filtered by optional lists of days, months, years, and/or day of week. If the DaysOfWeek
         configuration has included weekdays, the date's weekday must also be one of those.
+        :param days_of_week: DaysOfWeek selecting the weekdays to keep. It is reset afterwards.
         :param days: Optional list of day-of-month values to filter by.
         :param months: Optional list of month values (1–12) to filter by.
         :param years: Optional list of year values to filter by.
+        :param lazy: If True, return a FilteredView that yields the matches on iteration instead of copying them into a
+        new tree. The included weekdays are captured when the view is created. A view is not checked for matches, so an
+        empty result does not raise.
         :raises ValueError: If no dates match the given filters.
-        :return: A new RBTree containing only the filtered dates.
+        :return: A new tree of the same type as the source tree containing only the filtered dates, or a FilteredView.
+        Trees served from the cache are shared between callers and must not be modified.
         """
-        filtered_range: RBTree = RBTree()
+        days = list(days or [])
+        months = list(months or [])
+        years = list(years or [])
+        weekday_mask: int = days_of_week.mask
+        self._scans.scanned = None
+
+        if lazy:
+            # Reset all days of week after each filtering call
+            self._reset_days_of_week(days_of_week)
+
+            return FilteredView(lambda: self._matches(days, months, years, weekday_mask), self.tree.__class__)
 
-        for key in self.tree.keys():
-            # Filter by year
-            if len(years) > 0 and key.year not in years:
-                continue
+        cache_key: FilterKey = None
+        if self.cache is not None:
+            cache_key = FilterCache.make_key(days, months, years, weekday_mask)
+            cached: RBTree = self.cache.get(cache_key)
 
-            # Filter by month
-            if len(months) > 0  and key.month not in months:
-                continue
+            if cached is not None:
+                self._scans.scanned = 0
 
-            # Filter by day of month
-            if len(days) > 0 and key.day not in days:
-                continue
+                # Reset all days of week after each filtering call
+                self._reset_days_of_week(days_of_week)
 
-            # Filter by day of week if any are configured
-            included_weekdays = self.days_of_week.included
-            if key.weekday() not in included_weekdays:
-                continue
+                return cached
 
-            # If the date meets all criteria insert into the filtered tree
-            value: object = self.tree.get_value(key)
-            filtered_range.insert(key, value)
+        scanned: list[int] = [0]
+
+        # A DateRuns works out the matching runs arithmetically rather than inserting date by date
+        if isinstance(self.tree, DateRuns):
+            filtered_range: RBTree = self.tree.filtered(days, months, years, weekday_mask)
+            scanned[0] = sum(self.tree.count_between(lower_date, upper_date)
+                             for lower_date, upper_date in RangeQuery.calendar_windows(months, years))
+        else:
+            filtered_range = self.tree.__class__()
+            for key, value in self._matches(days, months, years, weekday_mask, scanned):
+                # If the date meets all criteria insert into the filtered tree
+                filtered_range.insert(key, value)
+
+        self._scans.scanned = scanned[0]
 
         if len(filtered_range) == 0:
             raise ValueError("No filtered elements available")
 
+        if self.cache is not None:
+            self.cache.put(cache_key, filtered_range)
+
         # Reset all days of week after each filtering call
-        self._reset_days_of_week()
+        self._reset_days_of_week(days_of_week)
 
         return filtered_range
 
-    def filtered_dates(self, day: int = None, month: int = None, year: int  = None) -> RBTree:
+    def filtered_dates(self, days_of_week: DaysOfWeek, day: int = None, month: int = None, year: int  = None,
+                       lazy: bool = False) -> RBTree | FilteredView:
         """
         Retrieve dates filtered by optional single day, month, and/or year.
+        :param days_of_week: DaysOfWeek selecting the weekdays to keep. It is reset afterwards.
         :param day: Optional day-of-month to filter by.
         :param month: Optional month (1–12) to filter by.
         :param year: Optional year to filter by.
+        :param lazy: If True, return a FilteredView instead of a new tree. See filtered_date_range.
         :raises ValueError: If no dates match the given filters.
-        :return: A new RBTree containing filtered dates.
+        :return: A new RBTree containing filtered dates, or a FilteredView.
         """
         years: list[int]  = []
         months: list[int] = []
@@ -88,4 +281,4 @@ class FilteredDates:
         if day is not None:
             days = [day]
 
-        return self.filtered_date_range(years=years, months=months, days=days)
\ No newline at end of file
+        return self.filtered_date_range(days_of_week, years=years, months=months, days=days, lazy=lazy)
@@ -1,4 +1,6 @@
+from datetime import date as date_type
 from datetime import datetime
+from typing import Iterable
 
 class HelperMethods:
     """
@@ -8,11 +10,51 @@ class HelperMethods:
     def str_to_date(date: str) -> datetime.date:
         """
         Convert a date string into a datetime.date object.
+
+        Strings in the exact fixed-width MM/DD/YYYY form are parsed by slicing out the fields, which avoids the regex
+        and locale handling of strptime. Anything else, such as unpadded fields, goes through strptime so accepted
+        inputs and raised errors are unchanged.
         :param date: Date string in MM/DD/YYYY format.
         :raises ValueError: If the date string does not match the expected format.
+        :raises TypeError: If date is not a str.
         :return: A datetime.date object.
         """
+        if isinstance(date, str) and len(date) == 10 and date[2] == "/" and date[5] == "/":
+            month: str = date[0:2]
+            day: str = date[3:5]
+            year: str = date[6:10]
+
+            if month.isdigit() and day.isdigit() and year.isdigit():
+                try:
+                    return date_type(int(year), int(month), int(day))
+                except ValueError:
+                    raise ValueError("Invalid date format. Use dd/mm/yyyy format!")
+
         try:
             return datetime.strptime(date, "%m/%d/%Y").date()
         except ValueError:
-            raise ValueError("Invalid date format. Use dd/mm/yyyy format!")
\ No newline at end of file
+            raise ValueError("Invalid date format. Use dd/mm/yyyy format!")
+
+    @staticmethod
+    def strs_to_dates(dates: Iterable[str]) -> list[datetime.date]:
+        """
+        Convert many date strings into datetime.date objects. Each distinct string is parsed once, so repeated dates
+        in a batch cost a dictionary lookup.
+        :param dates: Date strings in MM/DD/YYYY format.
+        :raises ValueError: If any date string does not match the expected format.
+        :raises TypeError: If any date is not a str.
+        :return: A list of datetime.date objects in the same order as dates.
+        """
+        parsed: dict[str, datetime.date] = {}
+        results: list[datetime.date] = []
+
+        for date in dates:
+            try:
+                result: datetime.date = parsed[date]
+            except (KeyError, TypeError):
+                result = HelperMethods.str_to_date(date)
+                parsed[date] = result
+
+            results.append(result)
+
+        return results
@@ -0,0 +1,209 @@
+import datetime
+from bisect import bisect_left
+from itertools import islice
+from typing import Iterable
+
+from bintrees import RBTree
+
+from ._calendar_index import CalendarIndex
+from ._date_exists import DateExists
+from ._range_query import RangeQuery
+from .date_array import DateArray
+from .date_runs import DateRuns
+
+
+class OrderStatistics:
+    """
+    Internal helper for positional queries over the sorted dates of a tree: the nearest stored date to a date, the
+    number of dates before a date (rank) and the date at a position (select). One helper lives as long as its DateTree.
+
+    A DateArray or DateRuns answers rank and select itself in O(log n). An RBTree keeps no subtree sizes, so its
+    queries go to the CalendarIndex, whose per-year prefix counts answer them in O(log years). Only an unindexed
+    RBTree walks its dates.
+
+    Shifting a date by n stored dates, and counting the stored dates between two dates, are built on rank and select,
+    so a calendar of valid days answers business-day arithmetic in O(log n) per date.
+    """
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: RBTree, index: CalendarIndex = None):
+        """
+        Initialize an OrderStatistics helper.
+        :param tree: Tree to query. Keys are expected to be datetime.date.
+        :param index: Optional CalendarIndex of the tree, used for rank and select on an RBTree.
+        """
+        self.tree = tree
+        self.index: CalendarIndex = index
+
+    def ceiling(self, date: datetime.date, inclusive: bool = True) -> datetime.date | None:
+        """
+        Get the smallest stored date on or after a date in O(log n).
+        :param date: The date.
+        :param inclusive: If False, only dates after date are considered.
+        :raises ValueError: If date is not of type datetime.date.
+        :return: The stored date, or None if there is none.
+        """
+        DateExists._check_date_type(date)
+
+        try:
+            if not inclusive:
+                date += datetime.timedelta(days=1)
+
+            return self.tree.ceiling_key(date)
+        except (KeyError, OverflowError):
+            return None
+
+    def floor(self, date: datetime.date, inclusive: bool = True) -> datetime.date | None:
+        """
+        Get the largest stored date on or before a date in O(log n).
+        :param date: The date.
+        :param inclusive: If False, only dates before date are considered.
+        :raises ValueError: If date is not of type datetime.date.
+        :return: The stored date, or None if there is none.
+        """
+        DateExists._check_date_type(date)
+
+        try:
+            if not inclusive:
+                date -= datetime.timedelta(days=1)
+
+            return self.tree.floor_key(date)
+        except (KeyError, OverflowError):
+            return None
+
+    def rank(self, date: datetime.date) -> int:
+        """
+        Count the stored dates earlier than a date.
+        :param date: The date. It does not have to be stored.
+        :raises ValueError: If date is not of type datetime.date.
+        :return: The number of earlier dates.
+        """
+        DateExists._check_date_type(date)
+
+        if isinstance(self.tree, (DateArray, DateRuns)):
+            return self.tree.rank(date)
+
+        if self.index is not None:
+            return self.index.rank(date)
+
+        if date == datetime.date.min:
+            return 0
+
+        return sum(1 for _ in RangeQuery.keys_between(self.tree, None, date - datetime.timedelta(days=1)))
+
+    def select(self, index: int) -> datetime.date:
+        """
+        Get the stored date at a position in ascending order.
+        :param index: Position from 0 to len(tree) - 1.
+        :raises IndexError: If the position is out of range.
+        :return: The date.
+        """
+        if not 0 <= index < len(self.tree):
+            raise IndexError("Tree index out of range")
+
+        if isinstance(self.tree, (DateArray, DateRuns)):
+            return self.tree.select(index)
+
+        if self.index is not None:
+            return self.index.select(index)
+
+        return next(islice(self.tree.keys(), index, None))
+
+    def _position(self, date: datetime.date) -> tuple[int, bool]:
+        """
+        Get the rank of a date and whether it is stored. A DateArray answers both with a single binary search.
+        :param date: The date.
+        :raises ValueError: If date is not of type datetime.date.
+        :return: The number of earlier stored dates, and True if date is stored.
+        """
+        if isinstance(self.tree, DateArray):
+            DateExists._check_date_type(date)
+
+            ordinals = self.tree.ordinals
+            ordinal: int = date.toordinal()
+            position: int = bisect_left(ordinals, ordinal)
+            return position, position < len(ordinals) and ordinals[position] == ordinal
+
+        # An RBTree's index answers membership with a bit test rather than a walk down the tree
+        if self.index is not None and not isinstance(self.tree, DateRuns):
+            return self.rank(date), date in self.index
+
+        return self.rank(date), date in self.tree
+
+    @staticmethod
+    def _target(position: int, stored: bool, n: int) -> int:
+        """
+        Get the position of the date n stored dates away from a date. A date that is not stored counts from where it
+        would sit: one step forward reaches the next stored date and one step back the previous one, and no step rolls
+        forward to the next stored date.
+        :param position: Rank of the date.
+        :param stored: Whether the date is stored.
+        :param n: Number of stored dates to move, negative to move back.
+        :return: The position, which may be out of range.
+        """
+        return position + n - 1 if not stored and n > 0 else position + n
+
+    def shift(self, date: datetime.date, n: int) -> datetime.date:
+        """
+        Get the date n stored dates after date, or before it if n is negative.
+        :param date: The date to move from. It does not have to be stored.
+        :param n: Number of stored dates to move.
+        :raises ValueError: If date is not of type datetime.date.
+        :raises IndexError: If the move goes past the first or last stored date.
+        :return: The date reached.
+        """
+        position, stored = self._position(date)
+        target: int = self._target(position, stored, n)
+
+        if target < 0:
+            raise IndexError("Tree index out of range")
+
+        return self.select(target)
+
+    def shift_all(self, dates: Iterable[datetime.date], offsets: Iterable[int]) -> list[datetime.date]:
+        """
+        Shift each date by its offset, see shift. The rank of each distinct date is looked up once, so dates repeated
+        across a batch cost a dictionary lookup after the first.
+        :param dates: Dates to move from.
+        :param offsets: Number of stored dates to move each date, in the same order as dates.
+        :raises ValueError: If a date is not of type datetime.date or dates and offsets differ in length.
+        :raises IndexError: If a move goes past the first or last stored date.
+        :return: The dates reached, in the same order as dates.
+        """
+        positions: dict[datetime.date, tuple[int, bool]] = {}
+        size: int = len(self.tree)
+        shifted: list[datetime.date] = []
+
+        for date, n in zip(dates, offsets, strict=True):
+            found: tuple[int, bool] = positions.get(date)
+            if found is None:
+                found = positions[date] = self._position(date)
+
+            target: int = self._target(found[0], found[1], n)
+            if not 0 <= target < size:
+                raise IndexError("Tree index out of range")
+
+            shifted.append(self.select(target))
+
+        return shifted
+
+    def between_all(self, starts: Iterable[datetime.date], ends: Iterable[datetime.date]) -> list[int]:
+        """
+        Count the stored dates from each start up to but excluding its end, negative when the end is earlier than the
+        start. The rank of each distinct date is looked up once.
+        :param starts: First dates of the spans.
+        :param ends: Dates after the spans, in the same order as starts.
+        :raises ValueError: If a date is not of type datetime.date or starts and ends differ in length.
+        :return: The counts, in the same order as starts.
+        """
+        ranks: dict[datetime.date, int] = {}
+        counts: list[int] = []
+
+        for start, end in zip(starts, ends, strict=True):
+            for date in (start, end):
+                if date not in ranks:
+                    ranks[date] = self._position(date)[0]
+
+            counts.append(ranks[end] - ranks[start])
+
+        return counts
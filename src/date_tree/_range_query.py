@@ -0,0 +1,99 @@
+import calendar
+import datetime
+from typing import Iterator
+
+from bintrees import RBTree
+
+
+class RangeQuery:
+    """
+    Internal helper for bounded, ordered range queries over an RBTree of dates.
+    """
+    @staticmethod
+    def items_between(tree: RBTree, lower_date: datetime.date = None,
+                      upper_date: datetime.date = None) -> Iterator[tuple[datetime.date, object]]:
+        """
+        Yield the (date, value) items of the tree with lower_date <= date <= upper_date in ascending order. A missing
+        bound leaves that side of the range open.
+
+        bintrees' own iter_items and key_slice visit every node and test the range on each one, so for bintrees trees
+        the walk is done here instead: subtrees entirely below lower_date are never entered and the walk stops at the
+        first key above upper_date, giving O(log n + k) for k results. Any other tree type is expected to provide an
+        iter_items(start_key, end_key) that seeks to start_key itself.
+        :param tree: Tree to query. Keys are expected to be datetime.date.
+        :param lower_date: Lower bound of the range (inclusive), or None for no lower bound.
+        :param upper_date: Upper bound of the range (inclusive), or None for no upper bound.
+        :return: An iterator of (date, value) tuples.
+        """
+        root = getattr(tree, "_root", None)
+
+        if root is None:
+            if not tree.is_empty():
+                for key, value in tree.iter_items(lower_date, None):
+                    if upper_date is not None and key > upper_date:
+                        return
+                    yield key, value
+            return
+
+        stack: list = []
+        node = root
+        while stack or node is not None:
+            if node is not None:
+                # Everything left of a node below the lower bound is also below it, so only go right
+                if lower_date is not None and node.key < lower_date:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+
+                # Keys only increase from here so the range is exhausted
+                if upper_date is not None and node.key > upper_date:
+                    return
+
+                yield node.key, node.value
+                node = node.right
+
+    @staticmethod
+    def keys_between(tree: RBTree, lower_date: datetime.date = None,
+                     upper_date: datetime.date = None) -> Iterator[datetime.date]:
+        """
+        Yield the dates of the tree with lower_date <= date <= upper_date in ascending order.
+        :param tree: Tree to query. Keys are expected to be datetime.date.
+        :param lower_date: Lower bound of the range (inclusive), or None for no lower bound.
+        :param upper_date: Upper bound of the range (inclusive), or None for no upper bound.
+        :return: An iterator of dates.
+        """
+        return (key for key, _ in RangeQuery.items_between(tree, lower_date, upper_date))
+
+    @staticmethod
+    def calendar_windows(months: list[int], years: list[int]) -> list[tuple[datetime.date, datetime.date]]:
+        """
+        Build the sorted, non-overlapping date windows that can contain dates matching the given years and months.
+        Without years there is nothing to narrow the search so a single open window is returned. Years and months that
+        cannot exist in a datetime.date are skipped since no stored date can match them.
+        :param months: List of month values (1–12), empty for all months.
+        :param years: List of year values, empty for all years.
+        :return: A list of (lower_date, upper_date) tuples, both bounds inclusive.
+        """
+        if len(years) == 0:
+            return [(None, None)]
+
+        windows: list[tuple[datetime.date, datetime.date]] = []
+        for year in sorted(set(years)):
+            if not datetime.MINYEAR <= year <= datetime.MAXYEAR:
+                continue
+
+            if len(months) == 0:
+                windows.append((datetime.date(year, 1, 1), datetime.date(year, 12, 31)))
+                continue
+
+            for month in sorted(set(months)):
+                if not 1 <= month <= 12:
+                    continue
+
+                last_day: int = calendar.monthrange(year, month)[1]
+                windows.append((datetime.date(year, month, 1), datetime.date(year, month, last_day)))
+
+        return windows
@@ -0,0 +1,103 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class LockBusy(Exception):
+    """
+    Raised instead of waiting when a ReadWriteLock is acquired in non-blocking mode and can not be taken straight away.
+    """
+
+
+class ReadWriteLock:
+    """
+    Internal reader/writer lock. Any number of readers may hold the lock together, a writer holds it alone. Waiting
+    writers are let in before new readers so a steady stream of reads can not hold off a write indefinitely.
+
+    The lock is not reentrant, a thread holding it must not acquire it again.
+
+    Inside a non_blocking() block, acquiring the lock raises LockBusy instead of waiting. This lets an event loop run a
+    short call inline when the lock is free and hand it to another thread when it is not.
+    """
+    def __init__(self):
+        """
+        Create an unlocked ReadWriteLock.
+        """
+        self._condition: threading.Condition = threading.Condition(threading.Lock())
+        self._readers: int = 0
+        self._writing: bool = False
+        self._waiting_writers: int = 0
+        self._local: threading.local = threading.local()
+
+    @property
+    def blocking(self) -> bool:
+        """
+        Gets whether the calling thread waits for the lock, False inside a non_blocking() block.
+        :return: True if acquiring the lock waits.
+        """
+        return not getattr(self._local, "non_blocking", False)
+
+    @contextmanager
+    def non_blocking(self) -> Iterator[None]:
+        """
+        Make the calling thread's acquisitions raise LockBusy instead of waiting for the duration of the with block.
+        :return: A context manager.
+        """
+        self._local.non_blocking = True
+
+        try:
+            yield
+        finally:
+            self._local.non_blocking = False
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Hold the lock for reading for the duration of the with block.
+        :raises LockBusy: In non-blocking mode, if a writer holds or is waiting for the lock.
+        :return: A context manager.
+        """
+        with self._condition:
+            while self._writing or self._waiting_writers > 0:
+                if not self.blocking:
+                    raise LockBusy()
+                self._condition.wait()
+
+            self._readers += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Hold the lock for writing for the duration of the with block.
+        :raises LockBusy: In non-blocking mode, if the lock is held.
+        :return: A context manager.
+        """
+        with self._condition:
+            if not self.blocking and (self._writing or self._readers > 0):
+                raise LockBusy()
+
+            self._waiting_writers += 1
+
+            try:
+                while self._writing or self._readers > 0:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+
+            self._writing = True
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
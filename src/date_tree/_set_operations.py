@@ -0,0 +1,139 @@
+import datetime
+from typing import Callable, Iterator
+
+from bintrees import RBTree
+
+# Called with a date stored in both trees and its two values, returns the value the result keeps
+Resolver = Callable[[datetime.date, object, object], object]
+
+# Marks the side of a merged date that does not hold it
+_MISSING: object = object()
+
+# For each operation, whether dates found only in the left tree, only in the right tree, or in both are kept
+_RULES: dict[str, tuple[bool, bool, bool]] = {
+    "union": (True, True, True),
+    "intersection": (False, False, True),
+    "difference": (True, False, False),
+    "symmetric_difference": (True, True, False),
+}
+
+
+class SetOperations:
+    """
+    Internal helper for combining the dates of two trees. Both trees are walked once, in step, in ascending date order,
+    so every operation costs O(n + m) comparisons and its output comes out sorted.
+    """
+    @staticmethod
+    def _rule(operation: str) -> tuple[bool, bool, bool]:
+        """
+        Get the dates an operation keeps.
+        :param operation: "union", "intersection", "difference" or "symmetric_difference".
+        :raises ValueError: If the operation is not one of those.
+        :return: Whether left only, right only and shared dates are kept.
+        """
+        try:
+            return _RULES[operation]
+        except KeyError:
+            raise ValueError(f"Unknown set operation {operation}")
+
+    @staticmethod
+    def merge(left: RBTree, right: RBTree) -> Iterator[tuple[datetime.date, object, object]]:
+        """
+        Walk both trees in step.
+        :param left: First tree. Keys are expected to be datetime.date.
+        :param right: Second tree.
+        :return: An iterator of (date, left value, right value) in ascending date order for every date in either tree,
+        with _MISSING as the value of the tree that does not hold the date.
+        """
+        left_items: Iterator[tuple[datetime.date, object]] = iter(left.items())
+        right_items: Iterator[tuple[datetime.date, object]] = iter(right.items())
+        left_pair: tuple[datetime.date, object] = next(left_items, None)
+        right_pair: tuple[datetime.date, object] = next(right_items, None)
+
+        while left_pair is not None and right_pair is not None:
+            if left_pair[0] < right_pair[0]:
+                yield left_pair[0], left_pair[1], _MISSING
+                left_pair = next(left_items, None)
+
+            elif right_pair[0] < left_pair[0]:
+                yield right_pair[0], _MISSING, right_pair[1]
+                right_pair = next(right_items, None)
+
+            else:
+                yield left_pair[0], left_pair[1], right_pair[1]
+                left_pair = next(left_items, None)
+                right_pair = next(right_items, None)
+
+        # One of the trees is used up, the rest of the other needs no more comparisons
+        if left_pair is not None:
+            yield left_pair[0], left_pair[1], _MISSING
+            for key, value in left_items:
+                yield key, value, _MISSING
+
+        if right_pair is not None:
+            yield right_pair[0], _MISSING, right_pair[1]
+            for key, value in right_items:
+                yield key, _MISSING, value
+
+    @staticmethod
+    def combine(operation: str, left: RBTree, right: RBTree,
+                resolve: Resolver = None) -> Iterator[tuple[datetime.date, object]]:
+        """
+        Get the dates of the result of an operation.
+        :param operation: "union", "intersection", "difference" or "symmetric_difference".
+        :param left: First tree.
+        :param right: Second tree.
+        :param resolve: For dates in both trees, called with the date and both values to pick the value kept. If None,
+        the value of the left tree is kept.
+        :raises ValueError: If the operation is unknown.
+        :return: An iterator of (date, value) in ascending date order.
+        """
+        keep_left, keep_right, keep_both = SetOperations._rule(operation)
+
+        for key, left_value, right_value in SetOperations.merge(left, right):
+            if right_value is _MISSING:
+                if keep_left:
+                    yield key, left_value
+
+            elif left_value is _MISSING:
+                if keep_right:
+                    yield key, right_value
+
+            elif keep_both:
+                yield key, left_value if resolve is None else resolve(key, left_value, right_value)
+
+    @staticmethod
+    def changes(operation: str, left: RBTree, right: RBTree,
+                resolve: Resolver = None) -> tuple[list[tuple[datetime.date, object]], list[datetime.date]]:
+        """
+        Work out how the left tree has to change to hold the result of an operation. Both lists are complete before
+        anything is changed, so the left and right tree may be the same tree.
+        :param operation: "union", "intersection", "difference" or "symmetric_difference".
+        :param left: Tree to be changed.
+        :param right: Second tree.
+        :param resolve: See combine. A date whose resolved value is not the object already stored is rewritten.
+        :raises ValueError: If the operation is unknown.
+        :return: The (date, value) pairs to insert or rewrite and the dates to remove, both in ascending date order.
+        """
+        keep_left, keep_right, keep_both = SetOperations._rule(operation)
+        additions: list[tuple[datetime.date, object]] = []
+        removals: list[datetime.date] = []
+
+        for key, left_value, right_value in SetOperations.merge(left, right):
+            if right_value is _MISSING:
+                if not keep_left:
+                    removals.append(key)
+
+            elif left_value is _MISSING:
+                if keep_right:
+                    additions.append((key, right_value))
+
+            elif not keep_both:
+                removals.append(key)
+
+            elif resolve is not None:
+                value: object = resolve(key, left_value, right_value)
+                if value is not left_value:
+                    additions.append((key, value))
+
+        return additions, removals
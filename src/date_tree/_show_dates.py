@@ -1,5 +1,19 @@
+import datetime
+import os
+import sys
+from typing import Callable, TextIO
+
 from bintrees import RBTree
 
+from ._days_of_week import DaysOfWeek
+from ._range_query import RangeQuery
+
+# Formatters for the supported output formats
+_FORMATS: dict[str, Callable[[datetime.date], str]] = {
+    "iso": datetime.date.isoformat,
+    "mdy": lambda date: f"{date.month:02d}/{date.day:02d}/{date.year:04d}",
+}
+
 class ShowDates:
     """
     Internal helper for displaying the contents of an RBTree of dates.
@@ -12,8 +26,68 @@ class ShowDates:
         :raises ValueError: If the tree is empty.
         :return: None
         """
+        ShowDates.write_dates(tree, sys.stdout)
+
+    @staticmethod
+    def write_dates(tree: RBTree, output: TextIO | str | os.PathLike, date_format: str = "iso",
+                    lower_date: datetime.date = None, upper_date: datetime.date = None, weekdays: list[int] = None,
+                    chunk_size: int = 8192) -> int:
+        """
+        Write the dates stored in the tree, one per line, to a text stream or file. Lines are joined and written in
+        chunks of chunk_size dates so large trees cost one write per chunk rather than one per date.
+        :param tree: RBTree containing dates as keys.
+        :param output: Text stream to write to, or a path of a file to create or overwrite.
+        :param date_format: "iso" for YYYY-MM-DD or "mdy" for MM/DD/YYYY.
+        :param lower_date: Only write dates on or after this date, if given.
+        :param upper_date: Only write dates on or before this date, if given.
+        :param weekdays: Only write dates falling on these weekdays (0 = Monday, ..., 6 = Sunday), if given.
+        :param chunk_size: Number of dates written per write call.
+        :raises ValueError: If the tree is empty, the format is unknown, a weekday is not 0–6 or chunk_size is less
+        than 1.
+        :return: The number of dates written.
+        """
         if tree.is_empty():
             raise ValueError("Tree is empty")
 
-        for key in tree.keys():
-            print(key)
+        if date_format not in _FORMATS:
+            raise ValueError(f"Unknown date format {date_format!r}, use one of {', '.join(_FORMATS)}")
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        if isinstance(output, (str, os.PathLike)):
+            with open(output, "w", encoding="utf-8", newline="\n") as stream:
+                return ShowDates._write_chunks(stream, tree, _FORMATS[date_format], lower_date, upper_date, weekdays,
+                                               chunk_size)
+
+        return ShowDates._write_chunks(output, tree, _FORMATS[date_format], lower_date, upper_date, weekdays,
+                                       chunk_size)
+
+    @staticmethod
+    def _write_chunks(stream: TextIO, tree: RBTree, formatter: Callable[[datetime.date], str],
+                      lower_date: datetime.date, upper_date: datetime.date, weekdays: list[int],
+                      chunk_size: int) -> int:
+        """
+        Format the selected dates and write them to the stream in chunks.
+        :return: The number of dates written.
+        """
+        weekday_mask: int = None if weekdays is None else DaysOfWeek.to_mask(weekdays)
+        chunk: list[str] = []
+        written: int = 0
+
+        for key in RangeQuery.keys_between(tree, lower_date, upper_date):
+            if weekday_mask is not None and not weekday_mask >> key.weekday() & 1:
+                continue
+
+            chunk.append(formatter(key))
+
+            if len(chunk) == chunk_size:
+                stream.write("\n".join(chunk) + "\n")
+                written += len(chunk)
+                chunk.clear()
+
+        if chunk:
+            stream.write("\n".join(chunk) + "\n")
+            written += len(chunk)
+
+        return written
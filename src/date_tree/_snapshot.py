@@ -0,0 +1,153 @@
+import datetime
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+from array import array
+from typing import BinaryIO
+
+from bintrees import RBTree
+
+from .date_array import DateArray
+from ._value_table import ValueTable
+
+# File signature and the current format version
+_MAGIC: bytes = b"DTRE"
+_VERSION: int = 1
+
+# magic, version, reserved, date count, value table size in bytes
+_HEADER: struct.Struct = struct.Struct("<4sHHQQ")
+
+
+class Snapshot:
+    """
+    Internal helper for saving a tree of dates to, and loading it from, a compact binary snapshot.
+
+    Layout, all integers little endian:
+        header        magic b"DTRE", uint16 version, uint16 reserved, uint64 date count, uint64 value table size
+        ordinals      date count int32 values, the sorted date ordinals
+        handles       date count uint32 values, the index of each date's value in the value table
+        value table   pickled list of the distinct values, the default date object first. Loading unpickles it, so
+                      snapshots must only be loaded from trusted sources.
+
+    The header is 24 bytes, so both arrays start on 4-byte boundaries and can be used straight from a memory-mapped
+    file without being copied.
+    """
+    @staticmethod
+    def save(path: str | os.PathLike, tree: RBTree, date_obj: object) -> None:
+        """
+        Write the tree to a snapshot file. Values are stored once per distinct object, so dates sharing a value cost
+        four bytes of handle each. The file is written beside path and then renamed over it, so an existing file is
+        replaced whole and snapshots already loaded from it with use_mmap are left intact.
+
+        The values are stored with pickle, so loading the file can run code of the saver's choosing: only load
+        snapshots from trusted sources.
+        :param path: Path of the file to create or replace.
+        :param tree: Tree to save. Keys must be of type datetime.date.
+        :param date_obj: Default value of the DateTree being saved.
+        :raises ValueError: If a key is not of type datetime.date.
+        :return: None
+        """
+        table: ValueTable = ValueTable([date_obj])
+
+        # A DateArray already holds its dates as ordinals and its values as handles, so only its value table has to be
+        # renumbered to put date_obj first and leave out values no date uses. Any other tree has its items converted
+        # one by one.
+        if isinstance(tree, DateArray):
+            ordinals: array = array("i", tree.ordinals)
+            values: ValueTable = tree.value_table
+            renumbered: dict[int, int] = {handle: table.intern(values[handle]) for handle in sorted(set(tree.handles))}
+
+            if all(handle == new for handle, new in renumbered.items()):
+                handles: array = array("I", tree.handles)
+            else:
+                handles = array("I", map(renumbered.__getitem__, tree.handles))
+        else:
+            ordinals = array("i")
+            handles = array("I")
+            for key, value in tree.items():
+                if type(key) is not datetime.date:
+                    raise ValueError("Invalid date type. Date must be of type datetime.date")
+                ordinals.append(key.toordinal())
+                handles.append(table.intern(value))
+
+        if sys.byteorder != "little":
+            ordinals.byteswap()
+            handles.byteswap()
+
+        table_bytes: bytes = pickle.dumps(list(table), protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Writes a new file and renames it over the old one, so a DateTree loaded from the old file with use_mmap keeps
+        # mapping the old contents rather than seeing them truncated and rewritten underneath it
+        directory: str = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".snapshot-", suffix=".tmp")
+
+        try:
+            file: BinaryIO = os.fdopen(descriptor, "wb")
+        except BaseException:
+            # The descriptor is only closed with the file object, so it is closed here if that was never created
+            os.close(descriptor)
+            os.unlink(temporary)
+            raise
+
+        try:
+            with file:
+                file.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(ordinals), len(table_bytes)))
+                file.write(ordinals.tobytes())
+                file.write(handles.tobytes())
+                file.write(table_bytes)
+
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @staticmethod
+    def load(path: str | os.PathLike, use_mmap: bool = True) -> tuple[DateArray, object]:
+        """
+        Read a snapshot file into a DateArray.
+
+        WARNING: the value table is read with pickle.loads, which can run arbitrary code. Never load a snapshot from
+        an untrusted source.
+        :param path: Path of the snapshot file.
+        :param use_mmap: If True, the ordinals and value handles are read straight from a read-only memory map of the
+        file and only copied if the store is later modified. If False, the file is read into memory.
+        :raises ValueError: If the file is not a snapshot, is truncated or has an unsupported version.
+        :return: A tuple of the loaded DateArray and the saved default date object.
+        """
+        with open(path, "rb") as file:
+            if use_mmap and sys.byteorder == "little" and os.fstat(file.fileno()).st_size > 0:
+                buffer: memoryview = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                buffer = memoryview(file.read())
+
+        if len(buffer) < _HEADER.size:
+            raise ValueError("File is not a DateTree snapshot")
+
+        magic, version, _, count, table_size = _HEADER.unpack_from(buffer)
+
+        if magic != _MAGIC:
+            raise ValueError("File is not a DateTree snapshot")
+
+        if version != _VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}, expected {_VERSION}")
+
+        ordinals_end: int = _HEADER.size + 4 * count
+        handles_end: int = ordinals_end + 4 * count
+
+        if len(buffer) != handles_end + table_size:
+            raise ValueError("Snapshot file is truncated or corrupt")
+
+        ordinals: memoryview | array = buffer[_HEADER.size:ordinals_end].cast("i")
+        handles: memoryview | array = buffer[ordinals_end:handles_end].cast("I")
+        table: ValueTable = ValueTable(pickle.loads(buffer[handles_end:]))
+
+        if sys.byteorder != "little":
+            ordinals = array("i", ordinals)
+            ordinals.byteswap()
+            handles = array("I", handles)
+            handles.byteswap()
+
+        return DateArray.from_buffers(ordinals, handles, table), table[0]
@@ -0,0 +1,57 @@
+from typing import Iterable, Iterator
+
+
+class ValueTable:
+    """
+    Internal table of the distinct values held by a DateArray. Each distinct object is stored once and referred to by
+    a small integer handle, so dates sharing a value cost a four byte handle each rather than a list slot.
+
+    Values are interned by identity, which allows unhashable values and keeps two equal but distinct objects apart:
+    only dates given the very same object share an entry. Entries are never removed from a table; the DateArray
+    replaces its table with a compacted one, holding only the values still in use, once unused values could outnumber
+    its dates.
+    """
+    def __init__(self, values: Iterable[object] = ()):
+        """
+        Create a table holding the given values, the first value at handle 0.
+        :param values: Values to load into the table in handle order.
+        """
+        self._values: list[object] = []
+        self._handles: dict[int, int] = {}
+
+        for value in values:
+            self._values.append(value)
+            self._handles.setdefault(id(value), len(self._values) - 1)
+
+    def intern(self, value: object) -> int:
+        """
+        Get the handle of the value, adding the value to the table if it is not already held.
+        :param value: The value being interned.
+        :return: The handle of the value.
+        """
+        handle: int = self._handles.get(id(value))
+
+        if handle is None:
+            handle = len(self._values)
+            self._handles[id(value)] = handle
+            self._values.append(value)
+
+        return handle
+
+    def __getitem__(self, handle: int) -> object:
+        """
+        :return: The value with the given handle.
+        """
+        return self._values[handle]
+
+    def __len__(self) -> int:
+        """
+        :return: The number of values held.
+        """
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[object]:
+        """
+        :return: An iterator over the values in handle order.
+        """
+        return iter(self._values)
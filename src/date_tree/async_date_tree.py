@@ -0,0 +1,316 @@
+"""
+    async_date_tree.py
+
+    This module provides the AsyncDateTree class, an asyncio facade over a
+    DateTree for applications running on an event loop.
+
+    Calls that touch few dates run straight away on the loop, as they would
+    on a DateTree, provided the tree's lock is free. If another thread holds
+    it, for instance while a large add_dates runs in the executor, the call
+    is handed to the executor too rather than waiting, so the loop is never
+    blocked. Calls expected to touch at least offload_threshold dates, such
+    as adding a long range or filtering a large tree, always run in an
+    executor so the loop keeps serving other tasks meanwhile. Results can also be read
+    with async iteration, a chunk of chunk_size dates at a time, handing
+    control back to the loop between chunks:
+
+        from datetime import date
+        from bintrees import RBTree
+        from date_tree import AsyncDateTree
+
+        async def main():
+            dates = AsyncDateTree(RBTree(), date_obj="example")
+
+            await dates.add_dates(date(2000, 1, 1), date(2099, 12, 31), weekdays=[0, 1, 2, 3, 4])
+            fridays = await dates.filter_dates(year=2025, weekdays=[4])
+
+            async for day, value in dates.iter_items(date(2025, 1, 1)):
+                ...
+
+    The dates are held in a ConcurrentDateTree, so work running in the
+    executor never overlaps a change made from the loop. Weekdays are best
+    passed to each call. A selection made with include_days_of_week on the
+    loop's thread is also honoured: it is read, and reset as a DateTree would,
+    before the call is handed to the executor.
+    """
+import asyncio
+import datetime
+import os
+from concurrent.futures import Executor
+from functools import partial
+from typing import AsyncIterator, Callable, Iterable
+
+from bintrees import RBTree
+
+from ._batch_filter import FilterSpec
+from ._days_of_week import DaysOfWeek
+from ._filter_dates import FilteredView
+from ._rw_lock import LockBusy
+from .concurrent_date_tree import ConcurrentDateTree
+
+
+class AsyncDateTree:
+    """
+    Awaitable interface to a ConcurrentDateTree that keeps large operations off the event loop.
+    """
+    def __init__(self, tree: RBTree, date_obj: object, indexed: bool = True, cache_size: int = 0,
+                 executor: Executor = None, offload_threshold: int = 4096, chunk_size: int = 1024):
+        """
+        Create a new AsyncDateTree.
+        :param tree: RBTree (or DateArray or DateRuns) instance used to store dates as keys.
+        :param date_obj: Default value to associate with dates.
+        :param indexed: See DateTree.
+        :param cache_size: See DateTree.
+        :param executor: Executor large operations run in, or None for the event loop's default executor.
+        :param offload_threshold: Number of dates from which an operation is run in the executor rather than on the
+                                  event loop.
+        :param chunk_size: Number of dates read at a time by async iteration before control returns to the loop.
+        :raises ValueError: Raised if offload_threshold or chunk_size is less than 1.
+        """
+        if offload_threshold < 1:
+            raise ValueError("Offload threshold must be at least 1")
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        self._dates: ConcurrentDateTree = ConcurrentDateTree(tree, date_obj, indexed=indexed, cache_size=cache_size)
+        self._executor: Executor = executor
+        self._offload_threshold: int = offload_threshold
+        self._chunk_size: int = chunk_size
+
+    @property
+    def date_tree(self) -> ConcurrentDateTree:
+        """
+        Gets the underlying ConcurrentDateTree, for synchronous use.
+        :return: The ConcurrentDateTree holding the dates.
+        """
+        return self._dates
+
+    @property
+    def tree(self) -> RBTree:
+        """
+        Gets the instance of the RBTree.
+        :return: Returns the instance of the RBTree containing its elements.
+        """
+        return self._dates.tree
+
+    @property
+    def date_obj(self) -> object:
+        """
+        Gets the date object to be used as the value.
+        :return: The date object
+        """
+        return self._dates.date_obj
+
+    @property
+    def count(self) -> int:
+        """
+        Keeps track of the number of elements in the tree. The size is read without taking the lock, so it never waits
+        for a change running in the executor and may not yet include it.
+        :return: The number of elements in the tree.
+        """
+        return len(self._dates.tree)
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        Gets the number of dates read at a time by async iteration.
+        :return: The chunk size.
+        """
+        return self._chunk_size
+
+    @staticmethod
+    def _span(lower_date: datetime.date, upper_date: datetime.date, default: int) -> int:
+        """
+        Estimate the number of dates an operation on a range touches.
+        :param lower_date: Lower bound of the range, or None if open.
+        :param upper_date: Upper bound of the range, or None if open.
+        :param default: Estimate used when the range is open or its bounds are not dates.
+        :return: The number of days in the range, or default.
+        """
+        try:
+            return (upper_date - lower_date).days + 1
+        except TypeError:
+            return default
+
+    def _weekdays(self, weekdays: list[int] = None) -> list[int]:
+        """
+        Gets the weekdays for a call that may run on another thread. Weekdays given to the call are used as they are.
+        Otherwise the selection made with include_days_of_week on the loop's thread is read and reset, as the call
+        would have reset it, so the result does not depend on which thread runs the call.
+        :param weekdays: Weekdays given to the call, or None to use the loop thread's selection.
+        :return: The weekdays to pass to the call.
+        """
+        if weekdays is not None:
+            return weekdays
+
+        selection: DaysOfWeek = self._dates._selection()
+        included: list[int] = selection.included
+        selection.clear()
+
+        return included
+
+    async def _call(self, size: int, function: Callable, *args, **kwargs) -> object:
+        """
+        Run a DateTree call on the event loop if it touches fewer than offload_threshold dates and the lock can be
+        taken without waiting, otherwise in the executor. The event loop therefore never waits for the lock.
+        :param size: Estimated number of dates the call touches.
+        :param function: The ConcurrentDateTree method to call.
+        :return: The result of the call.
+        """
+        if size < self._offload_threshold:
+            # A busy lock raises before the call changes anything, so the call is simply made again in the executor
+            try:
+                with self._dates._non_blocking():
+                    return function(*args, **kwargs)
+            except LockBusy:
+                pass
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    async def add_dates(self, first_date: datetime.date, last_date: datetime.date = None, bulk: bool = False,
+                        value: object = None, weekdays: list[int] = None) -> RBTree:
+        """
+        Adds dates to the tree. See DateTree.add_dates.
+        :return: The tree with the added dates.
+        """
+        size: int = 1 if last_date is None else self._span(first_date, last_date, 1)
+        return await self._call(size, self._dates.add_dates, first_date, last_date, bulk=bulk, value=value,
+                                weekdays=self._weekdays(weekdays))
+
+    async def date_existance(self, date: datetime.date) -> bool:
+        """
+        Checks if a date exists in the tree. See DateTree.date_existance.
+        :return: Bool response if the date has been found.
+        """
+        return await self._call(1, self._dates.date_existance, self._dates.tree, date)
+
+    async def dates_existance(self, dates: Iterable[datetime.date]) -> list[bool]:
+        """
+        Checks if each of the given dates exists in the tree. See DateTree.dates_existance.
+        :return: A list of bools in the same order as dates, True where the date has been found.
+        """
+        dates = list(dates)
+        return await self._call(len(dates), self._dates.dates_existance, self._dates.tree, dates)
+
+    async def value_of(self, date: datetime.date) -> object:
+        """
+        Gets the value stored with a date. See DateTree.value_of.
+        :return: The value stored with the date.
+        """
+        return await self._call(1, self._dates.value_of, date)
+
+    async def delete_date(self, date: datetime.date) -> RBTree:
+        """
+        Deletes a single date from the tree. See DateTree.delete_date.
+        :return: The tree with the date removed.
+        """
+        return await self._call(1, self._dates.delete_date, date)
+
+    async def delete_date_range(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> RBTree:
+        """
+        Deletes a range of dates from the tree. See DateTree.delete_date_range.
+        :return: Returns a tree without the deleted dates
+        """
+        size: int = min(self._span(lower_date, upper_date, self.count), self.count)
+        return await self._call(size, self._dates.delete_date_range, lower_date, upper_date)
+
+    async def delete_dates(self, dates: Iterable[datetime.date]) -> list[datetime.date]:
+        """
+        Deletes every given date that exists in the tree. See DateTree.delete_dates.
+        :return: The requested dates that were not found in the tree, in ascending order.
+        """
+        dates = list(dates)
+        return await self._call(len(dates), self._dates.delete_dates, dates)
+
+    async def delete_where(self, predicate: Callable[[datetime.date, object], bool], lower_date: datetime.date = None,
+                           upper_date: datetime.date = None) -> list[datetime.date]:
+        """
+        Deletes every date for which predicate(date, value) returns True. A large tree is walked in the executor, so
+        the predicate may run on another thread. See DateTree.delete_where.
+        :return: The removed dates in ascending order.
+        """
+        size: int = min(self._span(lower_date, upper_date, self.count), self.count)
+        return await self._call(size, self._dates.delete_where, predicate, lower_date, upper_date)
+
+    async def filter_dates(self, day: int = None, month: int = None, year: int = None, lazy: bool = False,
+                           weekdays: list[int] = None) -> RBTree | FilteredView:
+        """
+        Retrieve dates filtered by optional month, day, day of week, and/or year. See DateTree.filter_dates.
+        :return: A new tree containing filtered dates, or a FilteredView if lazy is True.
+        """
+        return await self._call(self.count, self._dates.filter_dates, day, month, year, lazy=lazy,
+                                weekdays=self._weekdays(weekdays))
+
+    async def filtered_date_range(self, days: list[int] = None, months: list[int] = None, years: list[int] = None,
+                                  lazy: bool = False, weekdays: list[int] = None) -> RBTree | FilteredView:
+        """
+        Retrieve range of dates filtered by optional month, day, day of week, and/or year. See
+        DateTree.filtered_date_range.
+        :return: A new tree containing filtered dates, or a FilteredView if lazy is True.
+        """
+        return await self._call(self.count, self._dates.filtered_date_range, days, months, years, lazy=lazy,
+                                weekdays=self._weekdays(weekdays))
+
+    async def batch_filter(self, specs: Iterable[FilterSpec | dict | tuple], processes: int = None,
+                           executor: Executor = None) -> list[RBTree]:
+        """
+        Evaluates many filters in worker processes, waiting for them in the executor. See DateTree.batch_filter.
+        :return: One new tree per spec, in the order of the specs.
+        """
+        specs = list(specs)
+        return await self._call(self.count * len(specs), self._dates.batch_filter, specs, processes, executor)
+
+    async def iter_items(self, lower_date: datetime.date = None,
+                         upper_date: datetime.date = None) -> AsyncIterator[tuple[datetime.date, object]]:
+        """
+        Asynchronously iterate over the dates and values between lower_date and upper_date (inclusive) in ascending
+        order. Dates are read chunk_size at a time and control returns to the event loop after each chunk. Changes made
+        between chunks are seen by the chunks that follow.
+        :param lower_date: Lower bound of the dates, or None for no lower bound.
+        :param upper_date: Upper bound of the dates, or None for no upper bound.
+        :return: An async iterator of (date, value) tuples.
+        """
+        while True:
+            chunk: list[tuple[datetime.date, object]] = await self._call(self._chunk_size, self._dates.items_between,
+                                                                          lower_date, upper_date, self._chunk_size)
+            for item in chunk:
+                yield item
+
+            if len(chunk) < self._chunk_size or chunk[-1][0] == datetime.date.max:
+                return
+
+            lower_date = chunk[-1][0] + datetime.timedelta(days=1)
+            await asyncio.sleep(0)
+
+    async def iter_filtered(self, days: list[int] = None, months: list[int] = None, years: list[int] = None,
+                            weekdays: list[int] = None) -> AsyncIterator[tuple[datetime.date, object]]:
+        """
+        Asynchronously iterate over the dates matching a filter, returning control to the event loop after every
+        chunk_size dates. The matches are collected when iteration starts, in the executor for a large tree. An empty
+        result ends the iteration instead of raising. See DateTree.filtered_date_range for the filters.
+        :return: An async iterator of (date, value) tuples.
+        """
+        matches: list[tuple[datetime.date, object]] = list(await self.filtered_date_range(days, months, years,
+                                                                                         lazy=True, weekdays=weekdays))
+
+        for start in range(0, len(matches), self._chunk_size):
+            if start > 0:
+                await asyncio.sleep(0)
+
+            for item in matches[start:start + self._chunk_size]:
+                yield item
+
+    def __aiter__(self) -> AsyncIterator[tuple[datetime.date, object]]:
+        """
+        :return: An async iterator over every date and value in ascending order, see iter_items.
+        """
+        return self.iter_items()
+
+    async def save(self, path: str | os.PathLike) -> None:
+        """
+        Saves the dates to a snapshot file. See DateTree.save.
+        :return: None
+        """
+        await self._call(self.count, self._dates.save, path)
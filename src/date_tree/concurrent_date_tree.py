@@ -0,0 +1,410 @@
+"""
+    concurrent_date_tree.py
+
+    This module provides the ConcurrentDateTree class, a DateTree that can be
+    shared between threads, such as the workers of a web service.
+
+    Every method takes a reader/writer lock: existence checks, value lookups,
+    counts, filters and saves hold it for reading and run alongside each
+    other, while adding and deleting dates hold it alone. The days of the
+    week selected with include_days_of_week belong to the calling thread, so
+    one thread selecting or resetting weekdays never affects another. Each
+    call can also take its selection by value:
+
+        from datetime import date
+        from bintrees import RBTree
+        from date_tree import ConcurrentDateTree
+
+        shared = ConcurrentDateTree(RBTree(), date_obj="example")
+
+        # In any thread
+        shared.add_dates(date(2025, 1, 1), date(2025, 12, 31), weekdays=[0, 2, 4])
+        mondays = shared.filter_dates(month=3, year=2025, weekdays=[0])
+
+    Lazy filters are resolved while the lock is held, so the returned view
+    iterates a private copy of the matches. The resolve callable of a set
+    operation runs without the lock and may call back into the tree; the
+    delete_where predicate runs under it and must not. The store returned by the tree
+    property, and trees served from the filter cache, are not protected by
+    the lock and must only be read.
+    """
+import datetime
+import os
+import threading
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, ContextManager, Iterable
+
+from bintrees import RBTree
+
+from ._batch_filter import FilterSpec
+from ._calendar_index import CalendarIndex
+from ._days_of_week import DaysOfWeek
+from ._filter_dates import FilteredView
+from ._rw_lock import LockBusy, ReadWriteLock
+from ._set_operations import Resolver, SetOperations
+from .date_tree import DateTree
+from .recurrence import Recurrence
+
+
+class _StaleResolution(Exception):
+    """
+    Raised when a value resolved for an in-place set operation changed before the result could be applied.
+    """
+
+
+class ConcurrentDateTree(DateTree):
+    """
+    DateTree guarded by a reader/writer lock, with a separate weekday selection for each thread.
+    """
+    def __init__(self, tree: RBTree, date_obj: object, indexed: bool = True, cache_size: int = 0):
+        """
+        Create a new ConcurrentDateTree. See DateTree for the parameters.
+        """
+        super().__init__(tree, date_obj, indexed=indexed, cache_size=cache_size)
+        self._lock: ReadWriteLock = ReadWriteLock()
+        self._local: threading.local = threading.local()
+        self._index_lock: threading.Lock = threading.Lock()
+
+    def _selection(self, weekdays: list[int] = None) -> DaysOfWeek:
+        """
+        Gets the weekday selection for one call. Without weekdays, the calling thread's own selection is used.
+        :param weekdays: Weekdays given to the call (0 = Monday, ..., 6 = Sunday), or None for the thread's selection.
+        :raises ValueError: Raised if a weekday is not in the range 0–6.
+        :return: The DaysOfWeek the call should use and reset.
+        """
+        if weekdays is not None:
+            return DaysOfWeek.from_weekdays(weekdays)
+
+        days_of_week: DaysOfWeek = getattr(self._local, "days_of_week", None)
+        if days_of_week is None:
+            days_of_week = DaysOfWeek()
+            self._local.days_of_week = days_of_week
+
+        return days_of_week
+
+    def _calendar_index(self) -> CalendarIndex:
+        """
+        Gets the calendar index. Filters only hold the lock for reading, so building the index on the first filter is
+        guarded separately to build it once.
+        :return: The CalendarIndex, or None if the DateTree is not indexed.
+        """
+        if self._index is not None:
+            return self._index
+
+        # Another thread may be building the index, which a non-blocking call must not wait for
+        if not self._index_lock.acquire(blocking=self._lock.blocking):
+            raise LockBusy()
+
+        try:
+            return super()._calendar_index()
+        finally:
+            self._index_lock.release()
+
+    def _non_blocking(self) -> ContextManager[None]:
+        """
+        Make the calling thread's calls raise LockBusy instead of waiting for the lock, for the duration of the with
+        block. A call that raises LockBusy has not changed anything and can be made again.
+        :return: A context manager.
+        """
+        return self._lock.non_blocking()
+
+    @staticmethod
+    def _resolve(result: RBTree | FilteredView, tree_type: type) -> RBTree | FilteredView:
+        """
+        Copy the matches of a lazy filter so the view can be iterated after the lock is released.
+        :param result: Result of a filter.
+        :param tree_type: Type of the source tree, used by the view's to_tree.
+        :return: The result, with a FilteredView replaced by one over a copy of its matches.
+        """
+        if isinstance(result, FilteredView):
+            return FilteredView(partial(iter, list(result)), tree_type)
+
+        return result
+
+    @property
+    def count(self) -> int:
+        """
+        Keeps track of the number of elements in the tree.
+        :return: The number of elements in the tree.
+        """
+        with self._lock.read():
+            return super().count
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        Returns a bool value to check if tree is empty.
+        :return: True if tree is empty and False if tree is not empty.
+        """
+        with self._lock.read():
+            return super().is_empty
+
+    def add_dates(self, first_date: datetime.date, last_date: datetime.date = None, bulk: bool = False,
+                  value: object = None, weekdays: list[int] = None) -> RBTree:
+        """
+        Adds dates to the tree while holding the lock for writing. See DateTree.add_dates.
+        :return: The tree with the added dates.
+        """
+        with self._lock.write():
+            return super().add_dates(first_date, last_date, bulk=bulk, value=value, weekdays=weekdays)
+
+    def add_recurrence(self, recurrence: Recurrence, value: object = None) -> RBTree:
+        """
+        Adds the dates of a recurrence rule while holding the lock for writing. See DateTree.add_recurrence.
+        :return: The tree with the added dates.
+        """
+        with self._lock.write():
+            return super().add_recurrence(recurrence, value)
+
+    def date_existance(self, tree: RBTree, date: datetime.date) -> bool:
+        """
+        Checks if a date exists in the tree while holding the lock for reading. See DateTree.date_existance.
+        :return: Bool response if the date has been found.
+        """
+        with self._lock.read():
+            return super().date_existance(tree, date)
+
+    def dates_existance(self, tree: RBTree, dates: Iterable[datetime.date]) -> list[bool]:
+        """
+        Checks if each of the given dates exists in the tree while holding the lock for reading. See
+        DateTree.dates_existance.
+        :return: A list of bools in the same order as dates, True where the date has been found.
+        """
+        with self._lock.read():
+            return super().dates_existance(tree, dates)
+
+    def value_of(self, date: datetime.date) -> object:
+        """
+        Gets the value stored with a date while holding the lock for reading. See DateTree.value_of.
+        :return: The value stored with the date.
+        """
+        with self._lock.read():
+            return super().value_of(date)
+
+    def items_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None,
+                      limit: int = None) -> list[tuple[datetime.date, object]]:
+        """
+        Gets the dates and their values in a range while holding the lock for reading. See DateTree.items_between.
+        :return: A list of (date, value) tuples.
+        """
+        with self._lock.read():
+            return super().items_between(lower_date, upper_date, limit)
+
+    def next_date(self, date: datetime.date, inclusive: bool = True) -> datetime.date:
+        """
+        Gets the first stored date on or after a date while holding the lock for reading. See DateTree.next_date.
+        :return: The next stored date.
+        """
+        with self._lock.read():
+            return super().next_date(date, inclusive)
+
+    def prev_date(self, date: datetime.date, inclusive: bool = False) -> datetime.date:
+        """
+        Gets the last stored date before a date while holding the lock for reading. See DateTree.prev_date.
+        :return: The previous stored date.
+        """
+        with self._lock.read():
+            return super().prev_date(date, inclusive)
+
+    def nth_date(self, n: int) -> datetime.date:
+        """
+        Gets the stored date at a position while holding the lock for reading. See DateTree.nth_date.
+        :return: The date.
+        """
+        with self._lock.read():
+            return super().nth_date(n)
+
+    def rank(self, date: datetime.date) -> int:
+        """
+        Gets the number of stored dates earlier than a date while holding the lock for reading. See DateTree.rank.
+        :return: The number of earlier dates.
+        """
+        with self._lock.read():
+            return super().rank(date)
+
+    def shift(self, date: datetime.date, n: int) -> datetime.date:
+        """
+        Moves a date by n stored dates while holding the lock for reading. See DateTree.shift.
+        :return: The date reached.
+        """
+        with self._lock.read():
+            return super().shift(date, n)
+
+    def shift_dates(self, dates: Iterable[datetime.date], offsets: Iterable[int] | int) -> list[datetime.date]:
+        """
+        Moves a batch of dates while holding the lock for reading. See DateTree.shift_dates.
+        :return: The dates reached.
+        """
+        with self._lock.read():
+            return super().shift_dates(dates, offsets)
+
+    def business_days_between(self, start_date: datetime.date, end_date: datetime.date) -> int:
+        """
+        Counts the stored dates between two dates while holding the lock for reading. See
+        DateTree.business_days_between.
+        :return: The number of stored dates.
+        """
+        with self._lock.read():
+            return super().business_days_between(start_date, end_date)
+
+    def business_days_between_dates(self, start_dates: Iterable[datetime.date],
+                                    end_dates: Iterable[datetime.date]) -> list[int]:
+        """
+        Counts the stored dates between each pair of a batch of dates while holding the lock for reading. See
+        DateTree.business_days_between_dates.
+        :return: The counts.
+        """
+        with self._lock.read():
+            return super().business_days_between_dates(start_dates, end_dates)
+
+    def delete_date(self, date: datetime.date) -> RBTree:
+        """
+        Deletes a single date while holding the lock for writing. See DateTree.delete_date.
+        :return: The tree with the date removed.
+        """
+        with self._lock.write():
+            return super().delete_date(date)
+
+    def delete_date_range(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> RBTree:
+        """
+        Deletes a range of dates while holding the lock for writing. See DateTree.delete_date_range.
+        :return: Returns a tree without the deleted dates
+        """
+        with self._lock.write():
+            return super().delete_date_range(lower_date, upper_date)
+
+    def delete_dates(self, dates: Iterable[datetime.date]) -> list[datetime.date]:
+        """
+        Deletes every given date that exists while holding the lock for writing. See DateTree.delete_dates.
+        :return: The requested dates that were not found in the tree, in ascending order.
+        """
+        with self._lock.write():
+            return super().delete_dates(dates)
+
+    def delete_where(self, predicate: Callable[[datetime.date, object], bool], lower_date: datetime.date = None,
+                     upper_date: datetime.date = None) -> list[datetime.date]:
+        """
+        Deletes every date for which predicate(date, value) returns True while holding the lock for writing. The
+        predicate must not call back into this ConcurrentDateTree. See DateTree.delete_where.
+        :return: The removed dates in ascending order.
+        """
+        with self._lock.write():
+            return super().delete_where(predicate, lower_date, upper_date)
+
+    def _combine(self, operation: str, other: DateTree | RBTree, resolve: Resolver = None,
+                 source: RBTree = None) -> DateTree:
+        """
+        Builds the result of union, intersection, difference or symmetric_difference from a copy of the tree taken
+        while holding the lock for reading. The lock is released before resolve is called, so resolve may call back
+        into this ConcurrentDateTree. The other operand is read without taking its lock, so it must not be changed
+        meanwhile.
+        :return: The new ConcurrentDateTree.
+        """
+        with self._lock.read():
+            if resolve is None:
+                return super()._combine(operation, other)
+
+            source = self._tree.copy()
+
+        return super()._combine(operation, other, resolve, source)
+
+    def _combine_update(self, operation: str, other: DateTree | RBTree, resolve: Resolver = None) -> RBTree:
+        """
+        Applies an in-place set operation while holding the lock for writing. The other operand is read without taking
+        its lock, so it must not be changed meanwhile.
+
+        resolve is called without the lock, so it may call back into this ConcurrentDateTree: the dates in both trees
+        are collected while holding the lock for reading, resolved, and the results applied while holding it for
+        writing. If a value resolved meanwhile has changed, the dates are collected and resolved again, so resolve
+        may be called more than once for a date.
+        :return: The tree holding the result.
+        """
+        if resolve is None:
+            with self._lock.write():
+                return super()._combine_update(operation, other)
+
+        while True:
+            pending: list[tuple[datetime.date, object, object]] = []
+
+            def collect(date: datetime.date, value: object, other_value: object) -> object:
+                pending.append((date, value, other_value))
+                return value
+
+            # Collects the dates in both trees without changing anything
+            with self._lock.read():
+                SetOperations.changes(operation, self._tree, self._other_tree(other), collect)
+
+            resolved: dict[datetime.date, tuple[object, object, object]] = {
+                date: (value, other_value, resolve(date, value, other_value)) for date, value, other_value in pending}
+
+            def replay(date: datetime.date, value: object, other_value: object) -> object:
+                known: tuple[object, object, object] = resolved.get(date)
+                if known is None or known[0] is not value or known[1] is not other_value:
+                    raise _StaleResolution
+
+                return known[2]
+
+            # SetOperations.changes works out every change before applying any, so a stale value changes nothing
+            try:
+                with self._lock.write():
+                    return super()._combine_update(operation, other, replay)
+            except _StaleResolution:
+                continue
+
+    def filter_dates(self, day: int = None, month: int = None, year: int = None, lazy: bool = False,
+                     weekdays: list[int] = None) -> RBTree | FilteredView:
+        """
+        Retrieve filtered dates while holding the lock for reading. See DateTree.filter_dates.
+        :return: A new tree containing filtered dates, or a FilteredView over a copy of the matches if lazy is True.
+        """
+        with self._lock.read():
+            result: RBTree | FilteredView = super().filter_dates(day, month, year, lazy=lazy, weekdays=weekdays)
+            return self._resolve(result, self._tree.__class__)
+
+    def filtered_date_range(self, days: list[int] = None, months: list[int] = None, years: list[int] = None,
+                            lazy: bool = False, weekdays: list[int] = None) -> RBTree | FilteredView:
+        """
+        Retrieve a filtered range of dates while holding the lock for reading. See DateTree.filtered_date_range.
+        :return: A new tree containing filtered dates, or a FilteredView over a copy of the matches if lazy is True.
+        """
+        with self._lock.read():
+            result: RBTree | FilteredView = super().filtered_date_range(days, months, years, lazy=lazy,
+                                                                        weekdays=weekdays)
+            return self._resolve(result, self._tree.__class__)
+
+    def count_in(self, day: int = None, month: int = None, year: int = None, weekdays: list[int] = None) -> int:
+        """
+        Counts the dates filter_dates would return while holding the lock for reading. See DateTree.count_in.
+        :return: The number of matching dates.
+        """
+        with self._lock.read():
+            return super().count_in(day, month, year, weekdays=weekdays)
+
+    def count_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Counts the dates between lower_date and upper_date while holding the lock for reading. Readers that race to
+        build the index's prefix counts each build the same counts, so the lock does not need to be exclusive. See
+        DateTree.count_between.
+        :return: The number of dates in the range.
+        """
+        with self._lock.read():
+            return super().count_between(lower_date, upper_date)
+
+    def batch_filter(self, specs: Iterable[FilterSpec | dict | tuple], processes: int = None,
+                     executor: Executor = None) -> list[RBTree]:
+        """
+        Evaluates many filters while holding the lock for reading. See DateTree.batch_filter.
+        :return: One new tree per spec, in the order of the specs.
+        """
+        with self._lock.read():
+            return super().batch_filter(specs, processes, executor)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Saves a snapshot while holding the lock for reading, so it never captures a half-applied change. See
+        DateTree.save.
+        :return: None
+        """
+        with self._lock.read():
+            super().save(path)
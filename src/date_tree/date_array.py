@@ -0,0 +1,568 @@
+"""
+    date_array.py
+
+    This module provides the DateArray class, a compact, array backed store
+    of dates that can be handed to DateTree in place of an RBTree.
+
+    Dates are kept as sorted int32 ordinals (datetime.date.toordinal) in an
+    array.array buffer. Values are interned in a table of distinct values and
+    referred to by a parallel uint32 handle buffer, so each stored date costs
+    4 bytes for the ordinal plus 4 for its value handle, instead of a
+    datetime.date object and a tree node, however many dates share a value.
+    Values are shared by identity: dates given the same object share one
+    entry, while equal but distinct objects are each stored separately.
+    Values no longer used by any date are dropped from the table once they
+    could outnumber the stored dates, so replacing values does not grow the
+    store without bound.
+
+    DateArray implements the part of the bintrees RBTree interface that the
+    date_tree package relies on, so adding, deleting, existence checks,
+    filtering and sorted traversal work the same with either store:
+
+        from datetime import date
+        from date_tree import DateArray, DateTree
+
+        builder = DateTree(DateArray(), date_obj="example")
+
+        builder.include_days_of_week(include_all=True)
+        builder.add_dates(date(2025, 1, 1), date(2025, 12, 31))
+
+    Lookups are O(log n) binary searches. Inserting or removing a single date
+    shifts the tail of the buffers, which is a memmove and cheap in practice,
+    and inserting dates in ascending order (as add_dates does) only appends.
+    """
+import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, Sequence
+
+from ._value_table import ValueTable
+
+# Number of dates from which remove_items rebuilds the buffers instead of removing dates one at a time
+_REBUILD_THRESHOLD: int = 64
+
+# Number of values the table may hold beyond twice the number of dates before unused values are dropped
+_COMPACT_SLACK: int = 64
+
+
+class DateArray:
+    """
+    Sorted store of datetime.date keys with associated values, backed by an int32 ordinal array and a uint32 array of
+    value handles.
+    """
+    def __init__(self, items: Iterable[tuple[datetime.date, object]] = None):
+        """
+        Create a new DateArray.
+        :param items: Optional mapping or iterable of (date, value) pairs to load into the store.
+        """
+        self._ordinals: array = array("i")
+        self._handles: array = array("I")
+        self._table: ValueTable = ValueTable()
+
+        if items is not None:
+            self.update(items)
+
+    @classmethod
+    def from_buffers(cls, ordinals: Sequence[int], handles: Sequence[int], table: ValueTable) -> "DateArray":
+        """
+        Create a DateArray directly over existing buffers without copying or checking them. The ordinals and handles
+        may be read-only buffers such as memoryviews of a memory-mapped file, in which case they are copied into
+        arrays the first time the store is modified.
+        :param ordinals: Strictly increasing int32 date ordinals.
+        :param handles: uint32 value handles parallel to the ordinals.
+        :param table: Table holding the value of every handle.
+        :return: The new DateArray.
+        """
+        new: DateArray = cls()
+        new._ordinals = ordinals
+        new._handles = handles
+        new._table = table
+        return new
+
+    def _compact_if_sparse(self) -> None:
+        """
+        Drop the values no longer used by any date once the table holds more than twice as many values as there are
+        dates, plus some slack. At least half the table is then unused, so the O(n) compaction is paid for by the
+        values added or dates removed since the last one, and the table never exceeds 2n + _COMPACT_SLACK values.
+        :return: None
+        """
+        if len(self._table) > 2 * len(self._ordinals) + _COMPACT_SLACK:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Drop the values no longer used by any date from the value table and renumber the handles, keeping the values
+        in their existing order. This happens automatically as values are replaced or removed, but can be called
+        before handing the table to other code.
+        :return: None
+        """
+        used: list[int] = sorted(set(self._handles))
+
+        if len(used) == len(self._table):
+            return
+
+        renumbered: dict[int, int] = {handle: i for i, handle in enumerate(used)}
+        self._table = ValueTable(self._table[handle] for handle in used)
+        self._handles = array("I", map(renumbered.__getitem__, self._handles))
+
+    def _make_writable(self) -> None:
+        """
+        Copy read-only buffers, such as a memory-mapped file, into arrays before the store is modified.
+        :return: None
+        """
+        if not isinstance(self._ordinals, array):
+            self._ordinals = array("i", self._ordinals)
+
+        if not isinstance(self._handles, array):
+            self._handles = array("I", self._handles)
+
+    @staticmethod
+    def _to_ordinal(key: datetime.date) -> int:
+        """
+        Convert a date key to its ordinal.
+        :param key: The date being converted.
+        :raises ValueError: If the key is not of type datetime.date.
+        :return: The proleptic Gregorian ordinal of the date.
+        """
+        if type(key) is not datetime.date:
+            raise ValueError("Invalid date type. Date must be of type datetime.date")
+
+        return key.toordinal()
+
+    def _find(self, key: datetime.date) -> int:
+        """
+        Find the position of a stored date.
+        :param key: The date being searched for.
+        :raises KeyError: If the date is not stored.
+        :return: The index of the date in the buffers.
+        """
+        ordinal: int = self._to_ordinal(key)
+        index: int = bisect_left(self._ordinals, ordinal)
+
+        if index == len(self._ordinals) or self._ordinals[index] != ordinal:
+            raise KeyError(str(key))
+
+        return index
+
+    @property
+    def ordinals(self) -> Sequence[int]:
+        """
+        Gets the sorted int32 ordinals of the stored dates. The buffer is shared with the store and must not be
+        modified.
+        :return: The ordinal buffer.
+        """
+        return self._ordinals
+
+    @property
+    def handles(self) -> Sequence[int]:
+        """
+        Gets the uint32 value handles parallel to the ordinals. The buffer is shared with the store and must not be
+        modified.
+        :return: The handle buffer.
+        """
+        return self._handles
+
+    @property
+    def value_table(self) -> ValueTable:
+        """
+        Gets the table resolving value handles to values. It may also hold values no longer used by any date, up to
+        twice as many values as there are dates; call compact first to drop them.
+        :return: The ValueTable.
+        """
+        return self._table
+
+    def __len__(self) -> int:
+        """
+        :return: The number of dates stored.
+        """
+        return len(self._ordinals)
+
+    def __contains__(self, key: datetime.date) -> bool:
+        """
+        :return: True if the date is stored, False otherwise. Keys that are not dates are never stored.
+        """
+        if type(key) is not datetime.date:
+            return False
+
+        ordinal: int = key.toordinal()
+        index: int = bisect_left(self._ordinals, ordinal)
+        return index < len(self._ordinals) and self._ordinals[index] == ordinal
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        """
+        :return: An iterator over the stored dates in ascending order.
+        """
+        return self.keys()
+
+    def __getitem__(self, key: datetime.date) -> object:
+        """
+        :return: The value associated with the date.
+        """
+        return self.get_value(key)
+
+    def __setitem__(self, key: datetime.date, value: object) -> None:
+        """
+        Associate a value with the date, adding the date if it is not stored.
+        """
+        self.insert(key, value)
+
+    def __delitem__(self, key: datetime.date) -> None:
+        """
+        Remove the date and its value.
+        """
+        self.remove(key)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({{{', '.join(f'{k!r}: {v!r}' for k, v in self.items())}}})"
+
+    def is_empty(self) -> bool:
+        """
+        :return: True if no dates are stored.
+        """
+        return len(self._ordinals) == 0
+
+    def clear(self) -> None:
+        """
+        Remove every date and value.
+        """
+        self._ordinals = array("i")
+        self._handles = array("I")
+        self._table = ValueTable()
+
+    def copy(self) -> "DateArray":
+        """
+        :return: A new DateArray holding the same dates and values.
+        """
+        new: DateArray = self.__class__()
+        new._ordinals = array("i", self._ordinals)
+        new._handles = array("I", self._handles)
+        new._table = ValueTable(self._table)
+        return new
+
+    __copy__ = copy
+
+    def insert(self, key: datetime.date, value: object) -> None:
+        """
+        Insert the date with its value, replacing the value if the date is already stored.
+        :param key: The date to insert.
+        :param value: The value associated with the date.
+        :raises ValueError: If the key is not of type datetime.date.
+        """
+        ordinal: int = self._to_ordinal(key)
+        handle: int = self._table.intern(value)
+        self._make_writable()
+        ordinals: array = self._ordinals
+
+        # Ascending inserts, the common case, only append
+        if len(ordinals) == 0 or ordinal > ordinals[-1]:
+            ordinals.append(ordinal)
+            self._handles.append(handle)
+            return
+
+        index: int = bisect_left(ordinals, ordinal)
+        if ordinals[index] == ordinal:
+            self._handles[index] = handle
+            self._compact_if_sparse()
+        else:
+            ordinals.insert(index, ordinal)
+            self._handles.insert(index, handle)
+
+    def remove(self, key: datetime.date) -> None:
+        """
+        Remove the date and its value.
+        :param key: The date to remove.
+        :raises KeyError: If the date is not stored.
+        """
+        index: int = self._find(key)
+        self._make_writable()
+        del self._ordinals[index]
+        del self._handles[index]
+        self._compact_if_sparse()
+
+    def discard(self, key: datetime.date) -> None:
+        """
+        Remove the date if it is stored, otherwise do nothing.
+        :param key: The date to remove.
+        """
+        if key in self:
+            self.remove(key)
+
+    def remove_items(self, keys: Iterable[datetime.date]) -> None:
+        """
+        Remove every given date. Small batches are removed one at a time, larger ones rebuild the buffers in a single
+        pass so the cost does not grow with the number of dates removed. A date given more than once is removed once.
+        :param keys: The dates to remove.
+        :raises KeyError: If any date is not stored, in which case nothing is removed.
+        """
+        keys = tuple(keys)
+        for key in keys:
+            self._find(key)
+
+        # Every key is a stored date by now, so duplicates can be dropped before anything is removed
+        keys = tuple(dict.fromkeys(keys))
+
+        if len(keys) < _REBUILD_THRESHOLD:
+            for key in keys:
+                self.remove(key)
+            return
+
+        removed: set[int] = {key.toordinal() for key in keys}
+        kept: list[int] = [i for i, ordinal in enumerate(self._ordinals) if ordinal not in removed]
+
+        self._ordinals = array("i", (self._ordinals[i] for i in kept))
+        self._handles = array("I", (self._handles[i] for i in kept))
+        self._compact_if_sparse()
+
+    def get_value(self, key: datetime.date) -> object:
+        """
+        :param key: The date being looked up.
+        :raises KeyError: If the date is not stored.
+        :return: The value associated with the date.
+        """
+        return self._table[self._handles[self._find(key)]]
+
+    def get(self, key: datetime.date, default: object = None) -> object:
+        """
+        :param key: The date being looked up.
+        :param default: Returned if the date is not stored.
+        :return: The value associated with the date, or default.
+        """
+        try:
+            return self.get_value(key)
+        except (KeyError, ValueError):
+            return default
+
+    def update(self, *args) -> None:
+        """
+        Insert (date, value) pairs from mappings or iterables. Later pairs replace the values of earlier ones for the
+        same date. The incoming pairs are sorted once and merged with the stored dates in a single pass.
+        """
+        intern = self._table.intern
+        incoming: dict[int, int] = {}
+        for items in args:
+            try:
+                generator = items.items()
+            except AttributeError:
+                generator = iter(items)
+
+            for key, value in generator:
+                incoming[self._to_ordinal(key)] = intern(value)
+
+        if len(incoming) == 0:
+            return
+
+        new_ordinals: list[int] = sorted(incoming)
+
+        # Everything lands after the stored dates so the buffers can simply be extended
+        if len(self._ordinals) == 0 or new_ordinals[0] > self._ordinals[-1]:
+            self._make_writable()
+            self._ordinals.extend(new_ordinals)
+            self._handles.extend(incoming[ordinal] for ordinal in new_ordinals)
+            return
+
+        merged_ordinals: array = array("i")
+        merged_handles: array = array("I")
+        old_ordinals: array = self._ordinals
+        old_handles: array = self._handles
+        i: int = 0
+        j: int = 0
+
+        while i < len(old_ordinals) and j < len(new_ordinals):
+            if old_ordinals[i] < new_ordinals[j]:
+                merged_ordinals.append(old_ordinals[i])
+                merged_handles.append(old_handles[i])
+                i += 1
+            else:
+                # An incoming date replaces the stored value of the same date
+                if old_ordinals[i] == new_ordinals[j]:
+                    i += 1
+                merged_ordinals.append(new_ordinals[j])
+                merged_handles.append(incoming[new_ordinals[j]])
+                j += 1
+
+        merged_ordinals.extend(old_ordinals[i:])
+        merged_handles.extend(old_handles[i:])
+        merged_ordinals.extend(new_ordinals[j:])
+        merged_handles.extend(incoming[ordinal] for ordinal in new_ordinals[j:])
+
+        self._ordinals = merged_ordinals
+        self._handles = merged_handles
+        self._compact_if_sparse()
+
+    def update_sorted(self, ordinals: Sequence[int], value: object) -> None:
+        """
+        Insert dates given as strictly ascending ordinals that all share one value, replacing the values of dates
+        already stored. The value is interned once, the stored dates before and after the new ones are copied as
+        slices, and only the stored dates among the new ones are merged one by one.
+        :param ordinals: Ordinals of the dates to insert, in strictly ascending order.
+        :param value: Value stored with every date.
+        :return: None
+        """
+        if len(ordinals) == 0:
+            return
+
+        handle: int = self._table.intern(value)
+        self._make_writable()
+
+        old_ordinals: array = self._ordinals
+        old_handles: array = self._handles
+        low: int = bisect_left(old_ordinals, ordinals[0])
+        high: int = bisect_right(old_ordinals, ordinals[-1])
+
+        merged_ordinals: array = old_ordinals[:low]
+        merged_handles: array = old_handles[:low]
+
+        # Only the stored dates within the span of the new ones need comparing
+        if low == high:
+            merged_ordinals.extend(ordinals)
+            merged_handles.extend(array("I", [handle]) * len(ordinals))
+        else:
+            i: int = low
+            for ordinal in ordinals:
+                while i < high and old_ordinals[i] < ordinal:
+                    merged_ordinals.append(old_ordinals[i])
+                    merged_handles.append(old_handles[i])
+                    i += 1
+
+                # A new date replaces the stored value of the same date
+                if i < high and old_ordinals[i] == ordinal:
+                    i += 1
+
+                merged_ordinals.append(ordinal)
+                merged_handles.append(handle)
+
+        merged_ordinals.extend(old_ordinals[high:])
+        merged_handles.extend(old_handles[high:])
+
+        self._ordinals = merged_ordinals
+        self._handles = merged_handles
+        self._compact_if_sparse()
+
+    def _bounds(self, start_key: datetime.date = None, end_key: datetime.date = None) -> tuple[int, int]:
+        """
+        Find the index range of the dates with start_key <= date < end_key.
+        :param start_key: Lower bound (inclusive), or None for no lower bound.
+        :param end_key: Upper bound (exclusive), or None for no upper bound.
+        :return: A (low, high) index pair, high exclusive.
+        """
+        low: int = 0 if start_key is None else bisect_left(self._ordinals, start_key.toordinal())
+        high: int = len(self._ordinals) if end_key is None else bisect_left(self._ordinals, end_key.toordinal())
+        return low, max(low, high)
+
+    def iter_items(self, start_key: datetime.date = None, end_key: datetime.date = None,
+                   reverse: bool = False) -> Iterator[tuple[datetime.date, object]]:
+        """
+        Iterate over the (date, value) pairs with start_key <= date < end_key. The start of the range is found with a
+        binary search so only the dates inside the range are visited.
+        :param start_key: Lower bound (inclusive), or None for no lower bound.
+        :param end_key: Upper bound (exclusive), or None for no upper bound.
+        :param reverse: If True, iterate in descending order.
+        :return: An iterator of (date, value) tuples.
+        """
+        low, high = self._bounds(start_key, end_key)
+        indexes: range = range(high - 1, low - 1, -1) if reverse else range(low, high)
+
+        from_ordinal = datetime.date.fromordinal
+        ordinals: array = self._ordinals
+        handles: array = self._handles
+        table: ValueTable = self._table
+        return ((from_ordinal(ordinals[i]), table[handles[i]]) for i in indexes)
+
+    def key_slice(self, start_key: datetime.date, end_key: datetime.date,
+                  reverse: bool = False) -> Iterator[datetime.date]:
+        """
+        :return: An iterator of the dates with start_key <= date < end_key.
+        """
+        return (key for key, _ in self.iter_items(start_key, end_key, reverse))
+
+    def keys(self, reverse: bool = False) -> Iterator[datetime.date]:
+        """
+        :return: An iterator over the stored dates in ascending order, or descending if reverse is True.
+        """
+        from_ordinal = datetime.date.fromordinal
+        ordinals: Iterable[int] = reversed(self._ordinals) if reverse else self._ordinals
+        return (from_ordinal(ordinal) for ordinal in ordinals)
+
+    def values(self, reverse: bool = False) -> Iterator[object]:
+        """
+        :return: An iterator over the stored values in date order.
+        """
+        handles: Iterable[int] = reversed(self._handles) if reverse else self._handles
+        return map(self._table.__getitem__, handles)
+
+    def items(self, reverse: bool = False) -> Iterator[tuple[datetime.date, object]]:
+        """
+        :return: An iterator over the (date, value) pairs in date order.
+        """
+        return self.iter_items(reverse=reverse)
+
+    def count_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Count the dates from lower_date to upper_date (inclusive) with two binary searches.
+        :param lower_date: Lower bound of the range, or None for no lower bound.
+        :param upper_date: Upper bound of the range, or None for no upper bound.
+        :return: The number of stored dates in the range.
+        """
+        low: int = 0 if lower_date is None else bisect_left(self._ordinals, lower_date.toordinal())
+        high: int = len(self._ordinals) if upper_date is None else bisect_right(self._ordinals, upper_date.toordinal())
+        return max(0, high - low)
+
+    def rank(self, key: datetime.date) -> int:
+        """
+        :param key: The date.
+        :return: The number of stored dates earlier than key, found by binary search.
+        """
+        return bisect_left(self._ordinals, key.toordinal())
+
+    def select(self, index: int) -> datetime.date:
+        """
+        :param index: Position from 0 to len - 1.
+        :raises IndexError: If the position is out of range.
+        :return: The stored date at the position in ascending order.
+        """
+        if not 0 <= index < len(self._ordinals):
+            raise IndexError("DateArray index out of range")
+
+        return datetime.date.fromordinal(self._ordinals[index])
+
+    def min_key(self) -> datetime.date:
+        """
+        :raises ValueError: If the store is empty.
+        :return: The smallest stored date.
+        """
+        if self.is_empty():
+            raise ValueError("Tree is empty")
+
+        return datetime.date.fromordinal(self._ordinals[0])
+
+    def max_key(self) -> datetime.date:
+        """
+        :raises ValueError: If the store is empty.
+        :return: The largest stored date.
+        """
+        if self.is_empty():
+            raise ValueError("Tree is empty")
+
+        return datetime.date.fromordinal(self._ordinals[-1])
+
+    def ceiling_key(self, key: datetime.date) -> datetime.date:
+        """
+        :raises KeyError: If there is no such date.
+        :return: The smallest stored date greater than or equal to key.
+        """
+        index: int = bisect_left(self._ordinals, key.toordinal())
+        if index == len(self._ordinals):
+            raise KeyError(str(key))
+
+        return datetime.date.fromordinal(self._ordinals[index])
+
+    def floor_key(self, key: datetime.date) -> datetime.date:
+        """
+        :raises KeyError: If there is no such date.
+        :return: The largest stored date less than or equal to key.
+        """
+        index: int = bisect_right(self._ordinals, key.toordinal())
+        if index == 0:
+            raise KeyError(str(key))
+
+        return datetime.date.fromordinal(self._ordinals[index - 1])
@@ -0,0 +1,764 @@
+"""
+    date_runs.py
+
+    This module provides the DateRuns class, a run-length store of dates
+    that can be handed to DateTree in place of an RBTree.
+
+    Dates are kept as runs of [start, end, weekday mask]: a run holds every
+    date from start to end (inclusive) that falls on a weekday in its mask,
+    so a calendar of every weekday for a century is a single run rather than
+    some 26,000 tree nodes. Each run also records the value of each of its
+    weekdays, so ranges added with different values stay apart.
+
+    Runs are kept sorted and never overlap. Adding dates merges them into the
+    runs they touch and deleting dates splits runs, so the store always holds
+    few runs for calendars made of contiguous or weekly ranges:
+
+        from datetime import date
+        from date_tree import DateRuns, DateTree
+
+        builder = DateTree(DateRuns(), date_obj="example")
+
+        builder.include_days_of_week(monday=True, tuesday=True, wednesday=True, thursday=True, friday=True)
+        builder.add_dates(date(2000, 1, 1), date(2099, 12, 31))
+
+    Counting, existence checks and filtering by year, month, day and day of
+    week are worked out arithmetically from the runs, so their cost grows
+    with the number of runs and calendar windows involved rather than with
+    the number of dates. DateRuns also implements the part of the bintrees
+    RBTree interface that the date_tree package relies on, so single dates
+    can be inserted, removed and iterated as with any other store.
+    """
+import datetime
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+from ._days_of_week import ALL_DAYS_MASK
+from ._range_query import RangeQuery
+
+# Values of a run indexed by weekday (0 = Monday, ..., 6 = Sunday), None for the weekdays not in its mask
+RunValues = tuple[object, ...]
+
+# A run as (start ordinal, end ordinal, weekday mask, values)
+Run = tuple[int, int, int, RunValues]
+
+_MIN_ORDINAL: int = datetime.date.min.toordinal()
+_MAX_ORDINAL: int = datetime.date.max.toordinal()
+
+
+class DateRuns:
+    """
+    Sorted store of datetime.date keys with associated values, backed by runs of dates sharing a weekday mask.
+    """
+    def __init__(self, items: Iterable[tuple[datetime.date, object]] = None):
+        """
+        Create a new DateRuns.
+        :param items: Optional mapping or iterable of (date, value) pairs to load into the store.
+        """
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._masks: list[int] = []
+        self._values: list[RunValues] = []
+        self._size: int = 0
+
+        # Number of dates before each run, built on the first rank or select and dropped when the runs change
+        self._prefix: list[int] = None
+
+        if items is not None:
+            self.update(items)
+
+    @staticmethod
+    def _to_ordinal(key: datetime.date) -> int:
+        """
+        Convert a date key to its ordinal.
+        :param key: The date being converted.
+        :raises ValueError: If the key is not of type datetime.date.
+        :return: The proleptic Gregorian ordinal of the date.
+        """
+        if type(key) is not datetime.date:
+            raise ValueError("Invalid date type. Date must be of type datetime.date")
+
+        return key.toordinal()
+
+    @staticmethod
+    def _weekday(ordinal: int) -> int:
+        """
+        :return: The weekday of the ordinal (0 = Monday, ..., 6 = Sunday). Ordinal 1, 0001-01-01, is a Monday.
+        """
+        return (ordinal - 1) % 7
+
+    @staticmethod
+    def _count(start: int, end: int, mask: int) -> int:
+        """
+        Count the dates from start to end (inclusive) falling on a weekday in mask, without visiting them.
+        :param start: First ordinal of the span.
+        :param end: Last ordinal of the span.
+        :param mask: Bitmask of the weekdays counted.
+        :return: The number of matching dates.
+        """
+        if end < start:
+            return 0
+
+        weeks, remainder = divmod(end - start + 1, 7)
+        first: int = DateRuns._weekday(start)
+
+        # Rotates the mask so bit k is the weekday k days after start, then counts the days of the partial week
+        rotated: int = ((mask >> first) | (mask << (7 - first))) & ALL_DAYS_MASK
+        return weeks * mask.bit_count() + (rotated & ((1 << remainder) - 1)).bit_count()
+
+    @staticmethod
+    def _normalize(start: int, end: int, mask: int, values: RunValues) -> Run | None:
+        """
+        Narrow a run so that it starts and ends on dates it holds, drop weekdays that do not occur in runs shorter
+        than a week, and clear the values of weekdays outside the mask. Equal sets of dates then always give equal
+        runs, which lets neighbouring runs be merged.
+        :return: The normalized run, or None if it holds no dates.
+        """
+        mask &= ALL_DAYS_MASK
+        if mask == 0:
+            return None
+
+        while start <= end and not mask >> DateRuns._weekday(start) & 1:
+            start += 1
+
+        if start > end:
+            return None
+
+        while not mask >> DateRuns._weekday(end) & 1:
+            end -= 1
+
+        if end - start < 6:
+            present: int = 0
+            for ordinal in range(start, end + 1):
+                present |= 1 << DateRuns._weekday(ordinal)
+            mask &= present
+
+        return start, end, mask, tuple(values[day] if mask >> day & 1 else None for day in range(7))
+
+    @staticmethod
+    def _merge(left: Run, right: Run) -> Run | None:
+        """
+        Join two runs, left ending before right starts, into one run if that neither adds dates between them nor
+        changes the value of any date.
+        :param left: The earlier run.
+        :param right: The later run.
+        :return: The joined run, or None if the runs can not be joined.
+        """
+        start, left_end, left_mask, left_values = left
+        right_start, end, right_mask, right_values = right
+
+        for day in range(7):
+            if (left_mask & right_mask) >> day & 1 and left_values[day] is not right_values[day]:
+                return None
+
+        mask: int = left_mask | right_mask
+
+        # The joined run covers both runs, so it adds no dates exactly when it holds no more than the two together
+        if DateRuns._count(start, end, mask) != (DateRuns._count(start, left_end, left_mask) +
+                                                 DateRuns._count(right_start, end, right_mask)):
+            return None
+
+        values: RunValues = tuple(left_values[day] if left_mask >> day & 1 else right_values[day] for day in range(7))
+        return start, end, mask, values
+
+    @staticmethod
+    def _coalesce(runs: list[Run]) -> list[Run]:
+        """
+        Merge every pair of neighbouring runs that can be joined.
+        :param runs: Sorted, non-overlapping runs.
+        :return: The merged runs.
+        """
+        merged: list[Run] = []
+        for run in runs:
+            joined: Run = DateRuns._merge(merged[-1], run) if merged else None
+
+            if joined is None:
+                merged.append(run)
+            else:
+                merged[-1] = joined
+
+        return merged
+
+    def _run(self, index: int) -> Run:
+        """
+        :return: The run at the given position.
+        """
+        return self._starts[index], self._ends[index], self._masks[index], self._values[index]
+
+    def _overlapping(self, low: int, high: int) -> tuple[int, int]:
+        """
+        Find the runs overlapping the ordinals from low to high (inclusive). Runs never overlap, so both their starts
+        and their ends are sorted.
+        :return: A (first, last) index pair, last exclusive.
+        """
+        return bisect_left(self._ends, low), bisect_right(self._starts, high)
+
+    def _splice(self, first: int, last: int, runs: list[Run]) -> None:
+        """
+        Replace the runs from first to last (exclusive) with the given runs and keep the date count in step.
+        :return: None
+        """
+        removed: int = sum(self._count(*self._run(index)[:3]) for index in range(first, last))
+        added: int = sum(self._count(start, end, mask) for start, end, mask, _ in runs)
+
+        self._starts[first:last] = [run[0] for run in runs]
+        self._ends[first:last] = [run[1] for run in runs]
+        self._masks[first:last] = [run[2] for run in runs]
+        self._values[first:last] = [run[3] for run in runs]
+        self._size += added - removed
+        self._prefix = None
+
+    def _add(self, start: int, end: int, mask: int, values: RunValues) -> None:
+        """
+        Add the dates of a run. Where the run overlaps stored runs the weekday masks are combined and the new values
+        replace the old ones, then the affected runs are merged with their neighbours where possible.
+        :return: None
+        """
+        new: Run = self._normalize(start, end, mask, values)
+        if new is None:
+            return
+
+        start, end, mask, values = new
+        first, last = self._overlapping(start, end)
+
+        pieces: list[Run] = []
+        cursor: int = start
+        for index in range(first, last):
+            old_start, old_end, old_mask, old_values = self._run(index)
+
+            # Part of the stored run before the new one
+            if old_start < start:
+                pieces.append((old_start, start - 1, old_mask, old_values))
+
+            # Part of the new run in the gap before the stored one
+            if cursor < old_start:
+                pieces.append((cursor, old_start - 1, mask, values))
+
+            # Overlap, holding the dates of both
+            low: int = max(old_start, start)
+            high: int = min(old_end, end)
+            pieces.append((low, high, old_mask | mask,
+                           tuple(values[day] if mask >> day & 1 else old_values[day] for day in range(7))))
+
+            # Part of the stored run after the new one
+            if old_end > end:
+                pieces.append((end + 1, old_end, old_mask, old_values))
+
+            cursor = high + 1
+
+        if cursor <= end:
+            pieces.append((cursor, end, mask, values))
+
+        # The runs either side may now join up with the new dates
+        before: int = max(first - 1, 0)
+        after: int = min(last + 1, len(self._starts))
+
+        runs: list[Run] = [self._run(index) for index in range(before, first)]
+        runs.extend(run for run in (self._normalize(*piece) for piece in pieces) if run is not None)
+        runs.extend(self._run(index) for index in range(last, after))
+
+        self._splice(before, after, self._coalesce(runs))
+
+    def _append(self, start: int, end: int, mask: int, values: RunValues) -> None:
+        """
+        Add a run that starts after every stored date, merging it into the last run where possible.
+        :return: None
+        """
+        run: Run = self._normalize(start, end, mask, values)
+        if run is None:
+            return
+
+        if self._starts:
+            joined: Run = self._merge(self._run(-1), run)
+
+            if joined is not None:
+                self._splice(len(self._starts) - 1, len(self._starts), [joined])
+                return
+
+        self._splice(len(self._starts), len(self._starts), [run])
+
+    def _remove(self, start: int, end: int) -> None:
+        """
+        Remove every date from start to end (inclusive), splitting the runs that reach outside the span.
+        :return: None
+        """
+        first, last = self._overlapping(start, end)
+
+        kept: list[Run] = []
+        for index in range(first, last):
+            old_start, old_end, mask, values = self._run(index)
+
+            for piece in ((old_start, start - 1, mask, values), (end + 1, old_end, mask, values)):
+                run: Run = self._normalize(*piece)
+                if run is not None:
+                    kept.append(run)
+
+        self._splice(first, last, kept)
+
+    def _locate(self, ordinal: int) -> int:
+        """
+        Find the run holding a date.
+        :param ordinal: Ordinal of the date.
+        :return: The index of the run, or -1 if the date is not stored.
+        """
+        index: int = bisect_right(self._starts, ordinal) - 1
+
+        if index >= 0 and ordinal <= self._ends[index] and self._masks[index] >> self._weekday(ordinal) & 1:
+            return index
+
+        return -1
+
+    def _ordinals(self, low: int, high: int, reverse: bool = False) -> Iterator[tuple[int, object]]:
+        """
+        Yield the (ordinal, value) pairs of the stored dates from low to high (inclusive).
+        :param low: Lowest ordinal.
+        :param high: Highest ordinal.
+        :param reverse: If True, yield in descending order.
+        :return: An iterator of (ordinal, value) tuples.
+        """
+        first, last = self._overlapping(low, high)
+        indexes: range = range(last - 1, first - 1, -1) if reverse else range(first, last)
+
+        for index in indexes:
+            start: int = max(self._starts[index], low)
+            end: int = min(self._ends[index], high)
+            mask: int = self._masks[index]
+            values: RunValues = self._values[index]
+
+            for ordinal in range(end, start - 1, -1) if reverse else range(start, end + 1):
+                weekday: int = (ordinal - 1) % 7
+                if mask >> weekday & 1:
+                    yield ordinal, values[weekday]
+
+    @property
+    def run_count(self) -> int:
+        """
+        Gets the number of runs the dates are stored in.
+        :return: The number of runs.
+        """
+        return len(self._starts)
+
+    def runs(self) -> Iterator[tuple[datetime.date, datetime.date, int]]:
+        """
+        :return: An iterator over the runs as (first date, last date, weekday mask) tuples in ascending order. Bit w of
+        the mask is set when the run holds the dates falling on weekday w (0 = Monday, ..., 6 = Sunday).
+        """
+        from_ordinal = datetime.date.fromordinal
+        return ((from_ordinal(start), from_ordinal(end), mask)
+                for start, end, mask in zip(self._starts, self._ends, self._masks))
+
+    def add_run(self, first_date: datetime.date, last_date: datetime.date, weekday_mask: int,
+                value: object) -> None:
+        """
+        Add every date from first_date to last_date (inclusive) falling on a weekday in weekday_mask, with the same
+        value. The cost depends on the number of runs touched, not on the number of dates added.
+        :param first_date: The first date of the range.
+        :param last_date: The last date of the range (inclusive).
+        :param weekday_mask: Bitmask of the weekdays to add, bit w set for weekday w (0 = Monday, ..., 6 = Sunday).
+        :param value: The value associated with every added date.
+        :raises ValueError: If either date is not of type datetime.date.
+        """
+        self._add(self._to_ordinal(first_date), self._to_ordinal(last_date), weekday_mask, (value,) * 7)
+
+    def remove_range(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Remove every date from lower_date to upper_date (inclusive), splitting the runs at the bounds.
+        :param lower_date: Lower bound of the range, or None for no lower bound.
+        :param upper_date: Upper bound of the range, or None for no upper bound.
+        :return: The number of dates removed.
+        """
+        size: int = self._size
+        self._remove(_MIN_ORDINAL if lower_date is None else lower_date.toordinal(),
+                     _MAX_ORDINAL if upper_date is None else upper_date.toordinal())
+
+        return size - self._size
+
+    def count_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Count the dates from lower_date to upper_date (inclusive) without visiting them.
+        :param lower_date: Lower bound of the range, or None for no lower bound.
+        :param upper_date: Upper bound of the range, or None for no upper bound.
+        :return: The number of stored dates in the range.
+        """
+        low: int = _MIN_ORDINAL if lower_date is None else lower_date.toordinal()
+        high: int = _MAX_ORDINAL if upper_date is None else upper_date.toordinal()
+        first, last = self._overlapping(low, high)
+
+        return sum(self._count(max(self._starts[index], low), min(self._ends[index], high), self._masks[index])
+                   for index in range(first, last))
+
+    def _prefix_counts(self) -> list[int]:
+        """
+        Gets the number of dates before each run, plus the total as a last entry, building it if the runs changed.
+        :return: The prefix counts, one longer than the runs.
+        """
+        if self._prefix is None:
+            prefix: list[int] = [0]
+            for start, end, mask in zip(self._starts, self._ends, self._masks):
+                prefix.append(prefix[-1] + self._count(start, end, mask))
+
+            self._prefix = prefix
+
+        return self._prefix
+
+    def rank(self, key: datetime.date) -> int:
+        """
+        Count the stored dates before key from the prefix counts, in O(log r) for r runs.
+        :param key: The date.
+        :return: The number of stored dates earlier than key.
+        """
+        ordinal: int = key.toordinal()
+
+        # Runs ending before the date are wholly counted, the next run may hold some dates before it
+        index: int = bisect_left(self._ends, ordinal)
+        total: int = self._prefix_counts()[index]
+
+        if index < len(self._starts) and self._starts[index] < ordinal:
+            total += self._count(self._starts[index], ordinal - 1, self._masks[index])
+
+        return total
+
+    def select(self, index: int) -> datetime.date:
+        """
+        Get the stored date at a position in ascending order, in O(log r) for r runs.
+        :param index: Position from 0 to len - 1.
+        :raises IndexError: If the position is out of range.
+        :return: The date.
+        """
+        if not 0 <= index < self._size:
+            raise IndexError("DateRuns index out of range")
+
+        prefix: list[int] = self._prefix_counts()
+        run: int = bisect_right(prefix, index) - 1
+        mask: int = self._masks[run]
+
+        # Whole weeks of the run hold bit_count dates each, the rest is found within one week
+        weeks, remainder = divmod(index - prefix[run], mask.bit_count())
+        ordinal: int = self._starts[run] + 7 * weeks
+
+        while True:
+            if mask >> self._weekday(ordinal) & 1:
+                if remainder == 0:
+                    return datetime.date.fromordinal(ordinal)
+                remainder -= 1
+            ordinal += 1
+
+    def _matching_spans(self, days: list[int], months: list[int], years: list[int],
+                        weekday_mask: int) -> Iterator[tuple[int, int, int, RunValues]]:
+        """
+        Cut the runs to the calendar windows of the requested years and months, narrowing their masks to weekday_mask.
+        Only days of the month are picked out date by date, as one-day spans.
+        :param days: Days of the month to keep, empty or None for all.
+        :param months: Months (1–12) to keep, empty or None for all.
+        :param years: Years to keep, empty or None for all.
+        :param weekday_mask: Bitmask of the weekdays to keep.
+        :return: An iterator of (start, end, mask, values) spans in ascending order. A span may hold no dates.
+        """
+        if self.is_empty():
+            return
+
+        days = sorted(set(days or []))
+        months = list(months or [])
+
+        # Without any calendar filter every run is kept whole
+        if not days and not months and not years:
+            for index in range(len(self._starts)):
+                yield self._starts[index], self._ends[index], self._masks[index] & weekday_mask, self._values[index]
+            return
+
+        years = list(years or range(self.min_key().year, self.max_key().year + 1))
+
+        # Days of the month can only be picked out of month windows
+        if days and not months:
+            months = list(range(1, 13))
+
+        for lower_date, upper_date in RangeQuery.calendar_windows(months, years):
+            low: int = lower_date.toordinal()
+            high: int = upper_date.toordinal()
+            first, last = self._overlapping(low, high)
+
+            for index in range(first, last):
+                start: int = max(self._starts[index], low)
+                end: int = min(self._ends[index], high)
+                mask: int = self._masks[index] & weekday_mask
+                values: RunValues = self._values[index]
+
+                if not days:
+                    yield start, end, mask, values
+                    continue
+
+                for day in days:
+                    ordinal: int = low + day - 1
+                    if 1 <= day <= upper_date.day and start <= ordinal <= end:
+                        yield ordinal, ordinal, mask, values
+
+    def filtered(self, days: list[int] = None, months: list[int] = None, years: list[int] = None,
+                 weekday_mask: int = ALL_DAYS_MASK) -> "DateRuns":
+        """
+        Select the dates matching every given filter into a new DateRuns. Each run is cut to the calendar windows of
+        the requested years and months and its mask narrowed to weekday_mask, so only days of the month are picked out
+        date by date.
+        :param days: Days of the month to keep, empty or None for all.
+        :param months: Months (1–12) to keep, empty or None for all.
+        :param years: Years to keep, empty or None for all.
+        :param weekday_mask: Bitmask of the weekdays to keep.
+        :return: A new DateRuns holding the matching dates and their values.
+        """
+        result: DateRuns = self.__class__()
+
+        for start, end, mask, values in self._matching_spans(days, months, years, weekday_mask):
+            result._append(start, end, mask, values)
+
+        return result
+
+    def count_matching(self, days: list[int] = None, months: list[int] = None, years: list[int] = None,
+                       weekday_mask: int = ALL_DAYS_MASK) -> int:
+        """
+        Count the dates filtered would select without building a DateRuns: each run is cut to the calendar windows as
+        in filtered and the weekday-masked days of every piece are counted arithmetically.
+        :param days: Days of the month to count, empty or None for all.
+        :param months: Months (1–12) to count, empty or None for all.
+        :param years: Years to count, empty or None for all.
+        :param weekday_mask: Bitmask of the weekdays to count.
+        :return: The number of matching dates.
+        """
+        return sum(self._count(start, end, mask)
+                   for start, end, mask, _ in self._matching_spans(days, months, years, weekday_mask))
+
+    def __len__(self) -> int:
+        """
+        :return: The number of dates stored.
+        """
+        return self._size
+
+    def __contains__(self, key: datetime.date) -> bool:
+        """
+        :return: True if the date is stored, False otherwise. Keys that are not dates are never stored.
+        """
+        if type(key) is not datetime.date:
+            return False
+
+        return self._locate(key.toordinal()) >= 0
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        """
+        :return: An iterator over the stored dates in ascending order.
+        """
+        return self.keys()
+
+    def __getitem__(self, key: datetime.date) -> object:
+        """
+        :return: The value associated with the date.
+        """
+        return self.get_value(key)
+
+    def __setitem__(self, key: datetime.date, value: object) -> None:
+        """
+        Associate a value with the date, adding the date if it is not stored.
+        """
+        self.insert(key, value)
+
+    def __delitem__(self, key: datetime.date) -> None:
+        """
+        Remove the date and its value.
+        """
+        self.remove(key)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({{{', '.join(f'{k!r}: {v!r}' for k, v in self.items())}}})"
+
+    def is_empty(self) -> bool:
+        """
+        :return: True if no dates are stored.
+        """
+        return self._size == 0
+
+    def clear(self) -> None:
+        """
+        Remove every date and value.
+        """
+        self._starts = []
+        self._ends = []
+        self._masks = []
+        self._values = []
+        self._size = 0
+        self._prefix = None
+
+    def copy(self) -> "DateRuns":
+        """
+        :return: A new DateRuns holding the same dates and values.
+        """
+        new: DateRuns = self.__class__()
+        new._starts = list(self._starts)
+        new._ends = list(self._ends)
+        new._masks = list(self._masks)
+        new._values = list(self._values)
+        new._size = self._size
+        return new
+
+    __copy__ = copy
+
+    def insert(self, key: datetime.date, value: object) -> None:
+        """
+        Insert the date with its value, replacing the value if the date is already stored.
+        :param key: The date to insert.
+        :param value: The value associated with the date.
+        :raises ValueError: If the key is not of type datetime.date.
+        """
+        ordinal: int = self._to_ordinal(key)
+        self._add(ordinal, ordinal, 1 << self._weekday(ordinal), (value,) * 7)
+
+    def remove(self, key: datetime.date) -> None:
+        """
+        Remove the date and its value, splitting its run.
+        :param key: The date to remove.
+        :raises KeyError: If the date is not stored.
+        """
+        ordinal: int = self._to_ordinal(key)
+        if self._locate(ordinal) < 0:
+            raise KeyError(str(key))
+
+        self._remove(ordinal, ordinal)
+
+    def discard(self, key: datetime.date) -> None:
+        """
+        Remove the date if it is stored, otherwise do nothing.
+        :param key: The date to remove.
+        """
+        if key in self:
+            self.remove(key)
+
+    def remove_items(self, keys: Iterable[datetime.date]) -> None:
+        """
+        Remove every given date. A date given more than once is removed once.
+        :param keys: The dates to remove.
+        :raises KeyError: If any date is not stored, in which case nothing is removed.
+        """
+        keys = tuple(keys)
+        for key in keys:
+            if self._locate(self._to_ordinal(key)) < 0:
+                raise KeyError(str(key))
+
+        for key in keys:
+            ordinal: int = key.toordinal()
+            self._remove(ordinal, ordinal)
+
+    def get_value(self, key: datetime.date) -> object:
+        """
+        :param key: The date being looked up.
+        :raises KeyError: If the date is not stored.
+        :return: The value associated with the date.
+        """
+        ordinal: int = self._to_ordinal(key)
+        index: int = self._locate(ordinal)
+
+        if index < 0:
+            raise KeyError(str(key))
+
+        return self._values[index][self._weekday(ordinal)]
+
+    def get(self, key: datetime.date, default: object = None) -> object:
+        """
+        :param key: The date being looked up.
+        :param default: Returned if the date is not stored.
+        :return: The value associated with the date, or default.
+        """
+        try:
+            return self.get_value(key)
+        except (KeyError, ValueError):
+            return default
+
+    def update(self, *args) -> None:
+        """
+        Insert (date, value) pairs from mappings or iterables. Later pairs replace the values of earlier ones for the
+        same date.
+        """
+        for items in args:
+            try:
+                generator = items.items()
+            except AttributeError:
+                generator = iter(items)
+
+            for key, value in generator:
+                self.insert(key, value)
+
+    def iter_items(self, start_key: datetime.date = None, end_key: datetime.date = None,
+                   reverse: bool = False) -> Iterator[tuple[datetime.date, object]]:
+        """
+        Iterate over the (date, value) pairs with start_key <= date < end_key. The first run in the range is found with
+        a binary search so only the runs inside the range are visited.
+        :param start_key: Lower bound (inclusive), or None for no lower bound.
+        :param end_key: Upper bound (exclusive), or None for no upper bound.
+        :param reverse: If True, iterate in descending order.
+        :return: An iterator of (date, value) tuples.
+        """
+        low: int = _MIN_ORDINAL if start_key is None else start_key.toordinal()
+        high: int = _MAX_ORDINAL if end_key is None else end_key.toordinal() - 1
+
+        from_ordinal = datetime.date.fromordinal
+        return ((from_ordinal(ordinal), value) for ordinal, value in self._ordinals(low, high, reverse))
+
+    def key_slice(self, start_key: datetime.date, end_key: datetime.date,
+                  reverse: bool = False) -> Iterator[datetime.date]:
+        """
+        :return: An iterator of the dates with start_key <= date < end_key.
+        """
+        return (key for key, _ in self.iter_items(start_key, end_key, reverse))
+
+    def keys(self, reverse: bool = False) -> Iterator[datetime.date]:
+        """
+        :return: An iterator over the stored dates in ascending order, or descending if reverse is True.
+        """
+        return (key for key, _ in self.iter_items(reverse=reverse))
+
+    def values(self, reverse: bool = False) -> Iterator[object]:
+        """
+        :return: An iterator over the stored values in date order.
+        """
+        return (value for _, value in self._ordinals(_MIN_ORDINAL, _MAX_ORDINAL, reverse))
+
+    def items(self, reverse: bool = False) -> Iterator[tuple[datetime.date, object]]:
+        """
+        :return: An iterator over the (date, value) pairs in date order.
+        """
+        return self.iter_items(reverse=reverse)
+
+    def min_key(self) -> datetime.date:
+        """
+        :raises ValueError: If the store is empty.
+        :return: The smallest stored date.
+        """
+        if self.is_empty():
+            raise ValueError("Tree is empty")
+
+        return datetime.date.fromordinal(self._starts[0])
+
+    def max_key(self) -> datetime.date:
+        """
+        :raises ValueError: If the store is empty.
+        :return: The largest stored date.
+        """
+        if self.is_empty():
+            raise ValueError("Tree is empty")
+
+        return datetime.date.fromordinal(self._ends[-1])
+
+    def ceiling_key(self, key: datetime.date) -> datetime.date:
+        """
+        :raises KeyError: If there is no such date.
+        :return: The smallest stored date greater than or equal to key.
+        """
+        for ordinal, _ in self._ordinals(key.toordinal(), _MAX_ORDINAL):
+            return datetime.date.fromordinal(ordinal)
+
+        raise KeyError(str(key))
+
+    def floor_key(self, key: datetime.date) -> datetime.date:
+        """
+        :raises KeyError: If there is no such date.
+        :return: The largest stored date less than or equal to key.
+        """
+        for ordinal, _ in self._ordinals(_MIN_ORDINAL, key.toordinal(), reverse=True):
+            return datetime.date.fromordinal(ordinal)
+
+        raise KeyError(str(key))
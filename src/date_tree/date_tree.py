@@ -16,6 +16,14 @@
     - Deterministic, sorted traversal
     - Efficient range queries
 
+    A DateArray (see date_array.py) can be passed in place of the RBTree
+    when memory matters more than insertion speed. It stores the dates as
+    sorted int32 ordinals and supports every DateTree operation.
+
+    A DateRuns (see date_runs.py) stores contiguous and weekly ranges as
+    [start, end, weekday mask] runs, so long calendars take a handful of
+    runs and are counted and filtered without visiting each date.
+
     Typical usage:
 
         from bintrees import RBTree
@@ -32,17 +40,33 @@
     operations) are propagated through the DateTree API and documented
     on individual methods.
     """
+import inspect
+import os
+from concurrent.futures import Executor
 from datetime import datetime
+from itertools import islice
+from types import FunctionType
+from typing import Callable, Iterable, TextIO
 
 from bintrees import RBTree
 
-from ._filter_dates import FilteredDates
+from ._batch_filter import BatchFilter, FilterSpec
+from ._calendar_index import CalendarIndex
+from ._filter_cache import CacheInfo, FilterCache
+from ._filter_dates import FilteredDates, FilteredView
 from ._days_of_week import DaysOfWeek
 from ._delete_dates import DeleteDates
 from ._date_exists import DateExists
 from ._add_dates import AddDates
 from ._helper_methods import HelperMethods
+from ._order_statistics import OrderStatistics
+from ._range_query import RangeQuery
+from ._set_operations import Resolver, SetOperations
 from ._show_dates import ShowDates
+from ._snapshot import Snapshot
+from .date_runs import DateRuns
+from .instrumentation import Instrumentation, OperationEvent
+from .recurrence import Recurrence
 
 class DateTree:
     """
@@ -52,17 +76,33 @@ class DateTree:
         adding dates or date ranges, deleting dates, and filtering dates by
         day, month, year, and day of week.
         """
-    def __init__(self, tree: RBTree, date_obj: object):
+    def __init__(self, tree: RBTree, date_obj: object, indexed: bool = True, cache_size: int = 0):
         """
         Create a new DateTree.
 
-        :param tree: RBTree instance used to store dates as keys.
+        :param tree: RBTree (or DateArray or DateRuns) instance used to store dates as keys.
         :param date_obj: Default value to associate with dates.
+        :param indexed: If True, keeps an index of the stored dates by year and month so filtering only visits the
+                        matching months. The index is built from the tree on the first filter, after which the tree
+                        should only be changed through this DateTree so the index stays in step.
+        :param cache_size: If greater than 0, the most recent filter results, up to this many, are cached and served
+                           again for the same filter arguments until add_dates, delete_date or delete_date_range change
+                           the years they cover. Cached trees are shared and must not be modified.
         """
         self._date_obj = date_obj
         self._tree = tree
         self._days_of_week: DaysOfWeek = DaysOfWeek()
         self._exists = DateExists()
+        self._indexed: bool = indexed
+        self._index: CalendarIndex = None
+        self._cache: FilterCache = FilterCache(cache_size) if cache_size > 0 else None
+        self._instrumentation: Instrumentation = None
+
+        # Helpers live as long as the DateTree, the weekdays for each call are passed to them
+        self._adder: AddDates = AddDates(date_obj, tree)
+        self._deleter: DeleteDates = DeleteDates(tree)
+        self._filterer: FilteredDates = FilteredDates(tree, cache=self._cache)
+        self._ranker: OrderStatistics = OrderStatistics(tree)
 
     @property
     def date_obj(self) -> object:
@@ -86,7 +126,7 @@ class DateTree:
         Gets the list of days of the week that have been included by user.
         :return: Returns the list of days of the week.
         """
-        return self._days_of_week.included
+        return self._selection().included
 
     @property
     def count(self) -> int:
@@ -104,12 +144,146 @@ class DateTree:
         """
         return self._tree.is_empty()
 
-    def add_dates(self, first_date: datetime.date, last_date: datetime.date = None) -> RBTree:
+    def cache_info(self) -> CacheInfo:
+        """
+        Gets the statistics of the filter result cache.
+        :raises ValueError: Raised if the DateTree was created without a cache.
+        :return: A CacheInfo of hits, misses, maxsize and currsize.
+        """
+        if self._cache is None:
+            raise ValueError("Filter cache is not enabled, create the DateTree with cache_size greater than 0")
+
+        return self._cache.info
+
+    def cache_clear(self) -> None:
+        """
+        Empties the filter result cache and resets its statistics. Does nothing if there is no cache.
+        :return: None
+        """
+        if self._cache is not None:
+            self._cache.clear()
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        """
+        Gets the Instrumentation recording the calls of this DateTree.
+        :return: The Instrumentation, or None if the DateTree is not instrumented.
+        """
+        return self._instrumentation
+
+    def instrument(self, instrumentation: Instrumentation = None,
+                   callback: Callable[[OperationEvent], None] = None) -> Instrumentation:
+        """
+        Starts recording every call of the public methods of this DateTree: its latency, whether it raised, the size
+        of the tree after it and, for filter_dates and filtered_date_range, the dates considered and returned. The
+        methods of this instance are replaced by timed wrappers until uninstrument is called, so a DateTree that is
+        not instrumented pays nothing.
+
+        :param instrumentation: Instrumentation to record into, such as one shared by several DateTrees. If None, a
+                                new one is created.
+        :param callback: Callable given each OperationEvent, used when a new Instrumentation is created.
+
+        Recommended Usage:
+            Parameter usage:
+                instrument(): Records into a new Instrumentation, read its totals with instrumentation.stats()
+                instrument(callback=send): Also passes every call to send, for example to feed a metrics client
+
+        :return: The Instrumentation recording the calls.
+        """
+        self.uninstrument()
+
+        if instrumentation is None:
+            instrumentation = Instrumentation(callback)
+
+        # Filters note the stored dates they considered as they run, so nothing is counted twice
+        scanned: dict[str, Callable[..., int]] = {
+            "filter_dates": lambda *_, **__: self._filterer.take_scanned(),
+            "filtered_date_range": lambda *_, **__: self._filterer.take_scanned(),
+        }
+
+        # Forgets a count left by a filter made before instrumenting
+        self._filterer.take_scanned()
+
+        for name in self._public_methods():
+            setattr(self, name, instrumentation.wrap(name, getattr(self, name), lambda: len(self._tree),
+                                                     scanned.get(name)))
+
+        self._instrumentation = instrumentation
+        return instrumentation
+
+    def uninstrument(self) -> None:
+        """
+        Stops recording calls and restores the unwrapped methods. Does nothing if the DateTree is not instrumented.
+        :return: None
+        """
+        for name in self._public_methods():
+            vars(self).pop(name, None)
+
+        self._instrumentation = None
+
+    @classmethod
+    def _public_methods(cls) -> list[str]:
+        """
+        Gets the names of the methods recorded by instrument: every public method and static method, but not
+        properties, class methods or the instrumentation methods themselves.
+        :return: The method names.
+        """
+        return [name for name in dir(cls)
+                if not name.startswith("_") and name not in ("instrument", "uninstrument")
+                and isinstance(inspect.getattr_static(cls, name), (FunctionType, staticmethod))]
+
+    def _calendar_index(self) -> CalendarIndex:
+        """
+        Gets the calendar index, building it from the tree the first time it is needed. Until then there is nothing to
+        keep in step, so adding and deleting dates skip it. A DateRuns answers filters from its runs and is never
+        indexed.
+        :return: The CalendarIndex, or None if the DateTree is not indexed.
+        """
+        if self._indexed and self._index is None and not isinstance(self._tree, DateRuns):
+            index: CalendarIndex = CalendarIndex(self._tree.keys())
+            self._adder.index = self._deleter.index = self._filterer.index = self._ranker.index = index
+            self._index = index
+
+        return self._index
+
+    def _selection(self, weekdays: list[int] = None) -> DaysOfWeek:
+        """
+        Gets the weekday selection for one call. Weekdays passed to the call are used by value and leave the shared
+        selection made with include_days_of_week untouched.
+        :param weekdays: Weekdays given to the call (0 = Monday, ..., 6 = Sunday), or None to use the shared selection.
+        :raises ValueError: Raised if a weekday is not in the range 0–6.
+        :return: The DaysOfWeek the call should use and reset.
+        """
+        if weekdays is None:
+            return self._days_of_week
+
+        return DaysOfWeek.from_weekdays(weekdays)
+
+    def _invalidate_cache(self, lower_date: datetime.date, upper_date: datetime.date) -> None:
+        """
+        Drops cached filter results that may include dates between lower_date and upper_date.
+        :param lower_date: Lower bound of the changed dates, or None if open.
+        :param upper_date: Upper bound of the changed dates, or None if open.
+        :return: None
+        """
+        if self._cache is not None:
+            self._cache.invalidate(lower_date, upper_date)
+
+    def add_dates(self, first_date: datetime.date, last_date: datetime.date = None, bulk: bool = False,
+                  value: object = None, weekdays: list[int] = None) -> RBTree:
         """
         Adds dates desired dates to the tree
 
         :param first_date: The first date to add to the tree.
         :param last_date: The last date to add to the tree.
+        :param bulk: If True, all qualifying dates are computed in one pass and inserted as a single batch. Produces
+                     the same tree and is faster for long ranges.
+        :param value: Value stored with every added date in place of the date object, such as a shift pattern for
+                      the range. The one object is shared by all the dates rather than copied, and a DateArray stores
+                      it once, so giving each range its own value does not grow memory per date. Values are
+                      shared by identity: equal but distinct objects passed to separate calls are stored separately.
+        :param weekdays: Days of the week to add (0 = Monday, ..., 6 = Sunday) for this call only. If given, they are
+                         used instead of the days included with include_days_of_week, which are left unchanged.
         :raises ValueError: Raised if first date is less than last date, or no days of week have been added.
 
         Recommended Usage:
@@ -117,6 +291,8 @@ class DateTree:
                 add_dates(first_date): adds just one date to the tree.
                 add_dates(first_date, last_date): adds dates in the range between the first and last dates inclusive of
                                                   the first and last dates.
+                add_dates(first_date, last_date, value=shift): adds the range with shift as the value of its dates.
+                add_dates(first_date, last_date, weekdays=[0, 4]): adds the Mondays and Fridays in the range.
 
             General Usage:
                 - IMPORTANT: At least one day of week must be included to add dates. If at least one is not include a
@@ -124,7 +300,45 @@ class DateTree:
 
         :return: The tree with the added dates.
         """
-        return AddDates(self._date_obj, self._tree, self._days_of_week).add_date(first_date, last_date)
+        # A single date skips the range set up
+        if last_date is None:
+            tree: RBTree = self._adder.add_one(self._selection(weekdays), first_date, value)
+            self._invalidate_cache(first_date, first_date)
+            return tree
+
+        if bulk:
+            tree = self._adder.add_date_bulk(self._selection(weekdays), first_date, last_date, value)
+        else:
+            tree = self._adder.add_date(self._selection(weekdays), first_date, last_date, value)
+
+        self._invalidate_cache(first_date, last_date)
+        return tree
+
+    def add_recurrence(self, recurrence: Recurrence, value: object = None) -> RBTree:
+        """
+        Adds the dates of a recurrence rule, such as the last Friday of each month, as one batch. Only the dates the
+        rule produces are generated, so the cost follows their number rather than the length of the span.
+
+        :param recurrence: A Recurrence with an until date or a count, see recurrence.py.
+        :param value: Value stored with every added date in place of the date object, shared as in add_dates.
+        :raises ValueError: If the recurrence has no until date and no count.
+
+        Recommended Usage:
+            add_recurrence(Recurrence("MONTHLY", date(2025, 1, 1), count=12, by_weekday=[(4, -1)])): adds the last
+                                                                                                  Friday of 12 months.
+            add_recurrence(Recurrence.from_rule("FREQ=WEEKLY;INTERVAL=2;BYDAY=TU", start, until=end)): adds every
+                                                                                                   second Tuesday.
+
+            The days of week included with include_days_of_week do not apply, the rule decides which dates are added.
+
+        :return: The tree with the added dates.
+        """
+        dates: list[datetime.date] = self._adder.add_recurrence(recurrence, value)
+
+        if len(dates) > 0:
+            self._invalidate_cache(dates[0], dates[-1])
+
+        return self._tree
 
     def date_existance(self, tree: RBTree, date: datetime.date) -> bool:
         """
@@ -135,6 +349,169 @@ class DateTree:
         """
         return self._exists.date_exist(tree, date)
 
+    def dates_existance(self, tree: RBTree, dates: Iterable[datetime.date]) -> list[bool]:
+        """
+        Checks if each of the given dates exists in the tree.
+        :param tree: Tree where the dates are stored.
+        :param dates: The dates being searched for.
+        :raises ValueError: Raised if any of the dates is not a date.
+        :return: A list of bools in the same order as dates, True where the date has been found.
+        """
+        return self._exists.dates_exist(tree, dates)
+
+    def value_of(self, date: datetime.date) -> object:
+        """
+        Gets the value stored with a date in O(log n).
+        :param date: The date whose value is wanted.
+        :raises ValueError: Raised if date is not a date or does not exist in the tree.
+        :return: The value stored with the date, the date object unless add_dates was given another value.
+        """
+        return self._exists.date_value(self._tree, date)
+
+    def items_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None,
+                      limit: int = None) -> list[tuple[datetime.date, object]]:
+        """
+        Gets the dates and their values between lower_date and upper_date (inclusive) in ascending order. The walk
+        starts at lower_date, so reading a large tree a page at a time costs O(log n) per page plus the page itself.
+        :param lower_date: Lower bound of the dates, or None for no lower bound.
+        :param upper_date: Upper bound of the dates, or None for no upper bound.
+        :param limit: Largest number of dates returned, or None for all of them.
+
+        Recommended Usage:
+            Parameter usage:
+                items_between(lower_date, upper_date): Every date between lower date and upper date (inclusive)
+                items_between(lower_date, limit=100): The first 100 dates from lower date on
+
+        :return: A list of (date, value) tuples.
+        """
+        return list(islice(RangeQuery.items_between(self._tree, lower_date, upper_date), limit))
+
+    def next_date(self, date: datetime.date, inclusive: bool = True) -> datetime.date:
+        """
+        Gets the first stored date on or after a date in O(log n).
+        :param date: The date to search from. It does not have to be stored.
+        :param inclusive: If True, date itself is returned when it is stored. If False, only later dates are.
+        :raises ValueError: Raised if date is not a date or no stored date follows it.
+        :return: The next stored date.
+        """
+        found: datetime.date = self._ranker.ceiling(date, inclusive)
+        if found is None:
+            raise ValueError(f"No stored date after {date}")
+
+        return found
+
+    def prev_date(self, date: datetime.date, inclusive: bool = False) -> datetime.date:
+        """
+        Gets the last stored date before a date in O(log n).
+        :param date: The date to search from. It does not have to be stored.
+        :param inclusive: If True, date itself is returned when it is stored. If False, only earlier dates are.
+        :raises ValueError: Raised if date is not a date or no stored date precedes it.
+        :return: The previous stored date.
+        """
+        found: datetime.date = self._ranker.floor(date, inclusive)
+        if found is None:
+            raise ValueError(f"No stored date before {date}")
+
+        return found
+
+    def nth_date(self, n: int) -> datetime.date:
+        """
+        Gets the stored date at a position in ascending order. A DateArray or DateRuns finds it in O(log n), an
+        indexed RBTree in O(log years) from the index's per-year counts.
+        :param n: Position of the date, 0 for the first. Negative positions count from the end, -1 is the last.
+        :raises ValueError: Raised if n is out of range.
+        :return: The date.
+        """
+        # Builds the index on the first query
+        self._calendar_index()
+
+        try:
+            return self._ranker.select(n + len(self._tree) if n < 0 else n)
+        except IndexError:
+            raise ValueError(f"Position {n} is out of range for {len(self._tree)} dates")
+
+    def rank(self, date: datetime.date) -> int:
+        """
+        Gets the number of stored dates earlier than a date, the position date has or would have among the stored
+        dates. Answered in O(log n) like nth_date, which it inverts: nth_date(rank(date)) == date for a stored date.
+        :param date: The date. It does not have to be stored.
+        :raises ValueError: Raised if date is not a date.
+        :return: The number of earlier dates.
+        """
+        self._calendar_index()
+        return self._ranker.rank(date)
+
+    def shift(self, date: datetime.date, n: int) -> datetime.date:
+        """
+        Treats the stored dates as the valid days of a calendar, such as business days, and gets the date n of them
+        after date, or before it if n is negative, in O(log n) through rank and nth_date.
+        :param date: The date to move from. It does not have to be stored.
+        :param n: Number of stored dates to move.
+        :raises ValueError: Raised if date is not a date or the move goes past the first or last stored date.
+
+        Recommended Usage:
+            shift(friday, 1): The next business day after friday, the following Monday in a Monday–Friday calendar.
+            shift(saturday, 1): Also that Monday, a date that is not stored counts from where it would sit.
+            shift(saturday, 0): That Monday as well, a date that is not stored rolls forward to the next stored date.
+            shift(monday, -1): The business day before monday.
+
+        :return: The date reached.
+        """
+        self._calendar_index()
+
+        try:
+            return self._ranker.shift(date, n)
+        except IndexError:
+            raise ValueError(f"Shifting {date} by {n} goes past the stored dates")
+
+    def shift_dates(self, dates: Iterable[datetime.date], offsets: Iterable[int] | int) -> list[datetime.date]:
+        """
+        Shifts each of a batch of dates, see shift. The rank of each distinct date is worked out once however often it
+        appears, so large batches over few dates, such as a pricing run over many trades, cost little more than their
+        distinct dates.
+        :param dates: Dates to move from.
+        :param offsets: Number of stored dates to move each date, in the same order as dates, or one number for all.
+        :raises ValueError: Raised if a date is not a date, a move goes past the stored dates, or dates and offsets
+                            differ in length.
+        :return: The dates reached, in the same order as dates.
+        """
+        self._calendar_index()
+
+        if isinstance(offsets, int):
+            dates = list(dates)
+            offsets = [offsets] * len(dates)
+
+        try:
+            return self._ranker.shift_all(dates, offsets)
+        except IndexError:
+            raise ValueError("A shift goes past the stored dates")
+
+    def business_days_between(self, start_date: datetime.date, end_date: datetime.date) -> int:
+        """
+        Counts the stored dates from start_date up to but excluding end_date in O(log n), as the difference of their
+        ranks. Like a business-day count, shift(start_date, business_days_between(start_date, end_date)) is end_date
+        when both are stored.
+        :param start_date: First date of the span. It does not have to be stored.
+        :param end_date: Date after the span. It does not have to be stored.
+        :raises ValueError: Raised if either is not a date.
+        :return: The number of stored dates, negative if end_date is earlier than start_date.
+        """
+        self._calendar_index()
+        return self._ranker.rank(end_date) - self._ranker.rank(start_date)
+
+    def business_days_between_dates(self, start_dates: Iterable[datetime.date],
+                                    end_dates: Iterable[datetime.date]) -> list[int]:
+        """
+        Counts the stored dates between each pair of a batch of dates, see business_days_between. The rank of each
+        distinct date is worked out once.
+        :param start_dates: First dates of the spans.
+        :param end_dates: Dates after the spans, in the same order as start_dates.
+        :raises ValueError: Raised if a date is not a date or start_dates and end_dates differ in length.
+        :return: The counts, in the same order as start_dates.
+        """
+        self._calendar_index()
+        return self._ranker.between_all(start_dates, end_dates)
+
     def delete_date(self, date: datetime.date) -> RBTree:
         """
         Deletes a single date from the tree if the date exists within the tree. If the date does not exist then a
@@ -143,7 +520,9 @@ class DateTree:
         :raises ValueError: Raised if date does not exist in tree.
         :return: The tree with the date removed.
         """
-        return DeleteDates(self._tree, self._days_of_week).delete_date(date)
+        tree: RBTree = self._deleter.delete_date(date)
+        self._invalidate_cache(date, date)
+        return tree
 
     def delete_date_range(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> RBTree:
         """
@@ -161,16 +540,187 @@ class DateTree:
 
         :return: Returns a tree without the deleted dates
         """
-        return DeleteDates(self._tree, self._days_of_week).delete_date_range(lower_date, upper_date)
+        tree: RBTree = self._deleter.delete_date_range(lower_date, upper_date)
+        self._invalidate_cache(lower_date, upper_date)
+        return tree
+
+
+    def delete_dates(self, dates: Iterable[datetime.date]) -> list[datetime.date]:
+        """
+        Deletes every given date that exists in the tree in one batch. Unlike delete_date, dates that are not in the
+        tree do not raise, they are returned instead.
+        :param dates: The dates to be removed.
+        :raises ValueError: Raised if any of the dates is not a date.
+        :return: The requested dates that were not found in the tree, in ascending order.
+        """
+        dates = list(dates)
+
+        missing: list[datetime.date] = self._deleter.delete_dates(dates)
+
+        if len(dates) > len(missing):
+            self._invalidate_cache(min(dates), max(dates))
+
+        return missing
+
+    def delete_where(self, predicate: Callable[[datetime.date, object], bool], lower_date: datetime.date = None,
+                     upper_date: datetime.date = None) -> list[datetime.date]:
+        """
+        Deletes every date for which predicate(date, value) returns True.
+        :param predicate: Called with each date and its value, returns True if the date should be removed.
+        :param lower_date: Lower bound of dates to consider (inclusive).
+        :param upper_date: Upper bound of dates to consider (inclusive).
+        :raises ValueError: Raised if lower_date is greater than upper_date.
+
+        Recommended Usage:
+            Parameter usage:
+                delete_where(lambda date, value: date.day == 13): Deletes the 13th of every month
+                delete_where(predicate, lower_date, upper_date): Only dates between lower date and upper date
+                                                                 (inclusive) are passed to the predicate
+
+        :return: The removed dates in ascending order.
+        """
+        removed: list[datetime.date] = self._deleter.delete_where(predicate, lower_date, upper_date)
+
+        if len(removed) > 0:
+            self._invalidate_cache(removed[0], removed[-1])
+
+        return removed
+
+    @staticmethod
+    def _other_tree(other: "DateTree | RBTree") -> RBTree:
+        """
+        Gets the tree of the other operand of a set operation.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :return: The tree holding the other operand's dates.
+        """
+        return other.tree if isinstance(other, DateTree) else other
+
+    def _combine(self, operation: str, other: "DateTree | RBTree", resolve: Resolver = None,
+                 source: RBTree = None) -> "DateTree":
+        """
+        Builds a new DateTree holding the result of a set operation, see SetOperations.combine.
+        :param source: Tree to use as this operand in place of the DateTree's own, such as a copy of it.
+        :return: The new DateTree, of the same class and store type as this one.
+        """
+        source = self._tree if source is None else source
+        result: RBTree = source.__class__()
+        result.update(SetOperations.combine(operation, source, self._other_tree(other), resolve))
+
+        cache_size: int = self._cache.info.maxsize if self._cache is not None else 0
+        return self.__class__(result, self._date_obj, indexed=self._indexed, cache_size=cache_size)
+
+    def _combine_update(self, operation: str, other: "DateTree | RBTree", resolve: Resolver = None) -> RBTree:
+        """
+        Changes this DateTree to hold the result of a set operation, see SetOperations.changes.
+        :return: The tree holding the result.
+        """
+        additions, removals = SetOperations.changes(operation, self._tree, self._other_tree(other), resolve)
+
+        self._deleter.remove_keys(removals)
+        self._adder.insert_items(additions)
+
+        changed: list[datetime.date] = [date for date, _ in additions] + removals
+        if len(changed) > 0:
+            self._invalidate_cache(min(changed), max(changed))
+
+        return self._tree
+
+    def union(self, other: "DateTree | RBTree", resolve: Resolver = None) -> "DateTree":
+        """
+        Gets the dates in this DateTree, in other, or in both, as a new DateTree. Both trees are walked once in step,
+        so the cost is linear in their sizes rather than one lookup per date.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :param resolve: Called as resolve(date, this_value, other_value) for a date in both, returns the value kept.
+                        If None, the value of this DateTree is kept.
+
+        Recommended Usage:
+            Parameter usage:
+                team_a.union(team_b): Every date on either team's calendar
+                team_a.union(team_b, lambda date, mine, theirs: theirs): Dates on both take team b's value
+
+        :return: A new DateTree of the same store type holding the result.
+        """
+        return self._combine("union", other, resolve)
+
+    def intersection(self, other: "DateTree | RBTree", resolve: Resolver = None) -> "DateTree":
+        """
+        Gets the dates in both this DateTree and other as a new DateTree, in one linear walk of both trees.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :param resolve: Called as resolve(date, this_value, other_value), returns the value kept. If None, the value
+                        of this DateTree is kept.
+        :return: A new DateTree of the same store type holding the result.
+        """
+        return self._combine("intersection", other, resolve)
+
+    def difference(self, other: "DateTree | RBTree") -> "DateTree":
+        """
+        Gets the dates in this DateTree that are not in other as a new DateTree, in one linear walk of both trees.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+
+        Recommended Usage:
+            Parameter usage:
+                working_days.difference(holidays): The working days that are not holidays
+
+        :return: A new DateTree of the same store type holding the result.
+        """
+        return self._combine("difference", other)
+
+    def symmetric_difference(self, other: "DateTree | RBTree") -> "DateTree":
+        """
+        Gets the dates in exactly one of this DateTree and other as a new DateTree, in one linear walk of both trees.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :return: A new DateTree of the same store type holding the result.
+        """
+        return self._combine("symmetric_difference", other)
+
+    def union_update(self, other: "DateTree | RBTree", resolve: Resolver = None) -> RBTree:
+        """
+        Adds the dates of other to this DateTree in place. See union.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :param resolve: Called as resolve(date, this_value, other_value) for a date in both, returns the value kept.
+                        If None, the value of this DateTree is kept.
+        :return: The tree with the result.
+        """
+        return self._combine_update("union", other, resolve)
+
+    def intersection_update(self, other: "DateTree | RBTree", resolve: Resolver = None) -> RBTree:
+        """
+        Removes the dates that are not in other from this DateTree in place. See intersection.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :param resolve: Called as resolve(date, this_value, other_value), returns the value kept. If None, the value
+                        of this DateTree is kept.
+        :return: The tree with the result.
+        """
+        return self._combine_update("intersection", other, resolve)
 
+    def difference_update(self, other: "DateTree | RBTree") -> RBTree:
+        """
+        Removes the dates of other from this DateTree in place. See difference.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :return: The tree with the result.
+        """
+        return self._combine_update("difference", other)
 
-    def filter_dates(self, day: int = None, month: int = None, year: int = None) -> RBTree:
+    def symmetric_difference_update(self, other: "DateTree | RBTree") -> RBTree:
+        """
+        Removes the dates in both and adds the dates only in other, in place. See symmetric_difference.
+        :param other: A DateTree, or a tree (RBTree, DateArray or DateRuns) of dates.
+        :return: The tree with the result.
+        """
+        return self._combine_update("symmetric_difference", other)
+
+    def filter_dates(self, day: int = None, month: int = None, year: int = None, lazy: bool = False,
+                     weekdays: list[int] = None) -> RBTree | FilteredView:
         """
         Retrieve dates filtered by optional month, day, day of week, and/or year.
 
         :param day: Day to be included.
         :param month: Month to be included.
         :param year: Year to be included.
+        :param lazy: If True, returns a FilteredView yielding (date, value) pairs in sorted order instead of copying
+                     them into a new tree. Call to_tree() on the view to materialize it. An empty view does not raise.
+        :param weekdays: Days of the week to keep (0 = Monday, ..., 6 = Sunday) for this call only, used instead of
+                         the days included with include_days_of_week, which are left unchanged.
         :raises ValueError: Raised if no days of week have been added
 
         Recommended usage:
@@ -194,18 +744,24 @@ class DateTree:
                 - Filtering by month and year for example get_dates(month=1, year=2020) will add all dates in january
                   2020 to a tree.
 
-        :return: A new tree containing filtered dates.
+        :return: A new tree containing filtered dates, or a FilteredView if lazy is True.
         """
-        return FilteredDates(self._tree, self._days_of_week).filtered_dates(day=day, month=month, year=year)
+        # Builds the index on the first filter
+        self._calendar_index()
+        return self._filterer.filtered_dates(self._selection(weekdays), day=day, month=month, year=year, lazy=lazy)
 
-    def filtered_date_range(self, days: list[int] = None, months: list[int] = None,
-                                years: list[int] = None) -> RBTree:
+    def filtered_date_range(self, days: list[int] = None, months: list[int] = None, years: list[int] = None,
+                            lazy: bool = False, weekdays: list[int] = None) -> RBTree | FilteredView:
         """
         Retrieve range of dates filtered by optional month, day, day of week, and/or year.
 
         :param days: List of days to include.
         :param months: List of Months to include.
         :param years: List of years to include.
+        :param lazy: If True, returns a FilteredView yielding (date, value) pairs in sorted order instead of copying
+                     them into a new tree. Call to_tree() on the view to materialize it. An empty view does not raise.
+        :param weekdays: Days of the week to keep (0 = Monday, ..., 6 = Sunday) for this call only, used instead of
+                         the days included with include_days_of_week, which are left unchanged.
         :raises ValueError: Raised if no days of week have been added.
 
         Recommended usage:
@@ -227,9 +783,71 @@ class DateTree:
                     -- IMPORTANT: At least one day of week must be included to add dates. If at least one is not
                                   include a ValueError Exception will be raised.
 
-        :return: A new tree containing filtered dates.
+        :return: A new tree containing filtered dates, or a FilteredView if lazy is True.
+        """
+        # Builds the index on the first filter
+        self._calendar_index()
+        return self._filterer.filtered_date_range(self._selection(weekdays), days=days, months=months, years=years,
+                                                  lazy=lazy)
+
+    def count_in(self, day: int = None, month: int = None, year: int = None, weekdays: list[int] = None) -> int:
         """
-        return FilteredDates(self._tree, self._days_of_week).filtered_date_range(days=days, months=months, years=years)
+        Counts the dates filter_dates would return, without building a tree. An indexed DateTree counts each visited
+        month with one bit count, and a year filtered by nothing else from its running total.
+
+        :param day: Day to be included.
+        :param month: Month to be included.
+        :param year: Year to be included.
+        :param weekdays: Days of the week to count (0 = Monday, ..., 6 = Sunday) for this call only, used instead of
+                         the days included with include_days_of_week, which are left unchanged.
+
+        Recommended usage:
+            count_in(month=3, year=2025, weekdays=list(range(7))): The number of dates in March 2025.
+            count_in(year=2025, weekdays=[0]): The number of Mondays stored in 2025.
+
+        :return: The number of matching dates, 0 if none match.
+        """
+        # Builds the index on the first count
+        self._calendar_index()
+
+        years: list[int] = [] if year is None else [year]
+        months: list[int] = [] if month is None else [month]
+        days: list[int] = [] if day is None else [day]
+        return self._filterer.count(self._selection(weekdays), days=days, months=months, years=years)
+
+    def count_between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+        """
+        Counts the dates between lower_date and upper_date (inclusive) without visiting them. A DateArray or DateRuns
+        counts them in O(log n), an indexed RBTree from per-year prefix counts in O(log years).
+        :param lower_date: Lower bound of the dates, or None for no lower bound.
+        :param upper_date: Upper bound of the dates, or None for no upper bound.
+        :return: The number of dates in the range.
+        """
+        self._calendar_index()
+        return self._filterer.count_between(lower_date, upper_date)
+
+    def batch_filter(self, specs: Iterable[FilterSpec | dict | tuple], processes: int = None,
+                     executor: Executor = None) -> list[RBTree]:
+        """
+        Evaluates many filters against the tree in one call, spread over several processes. The dates are copied once
+        into shared memory and split into shards by year, each process matches its shards against every spec, and the
+        shard results are joined back in date order.
+
+        :param specs: The filters, each a FilterSpec(days, months, years, weekdays), a dict of those fields or a tuple
+                      of them. Unlike filter_dates, weekdays are given by the spec, None keeps every day of the week.
+        :param processes: Number of worker processes, None for one per CPU. With 1 the batch runs in this process.
+        :param executor: Optional process pool to reuse across batches instead of starting one per call.
+        :raises ValueError: Raised if a spec has a weekday outside 0–6 or processes is less than 1.
+
+        Recommended Usage:
+            Parameter usage:
+                batch_filter([FilterSpec(years=[2025], weekdays=[0]), FilterSpec(days=[1], months=[1])]): Returns the
+                    Mondays of 2025 and every 1st of January
+                batch_filter(specs, processes=1): Evaluates the specs without starting any processes
+
+        :return: One new tree per spec, in the order of the specs. A spec that matches nothing gives an empty tree.
+        """
+        return BatchFilter.filter_batch(self._tree, specs, processes, executor)
 
     def include_days_of_week(self, monday=False, tuesday=False, wednesday=False, thursday=False, friday=False,
                              saturday=False, sunday=False, include_all=False, exclude_all=False) -> None:
@@ -246,8 +864,40 @@ class DateTree:
         :param exclude_all: If marked True excludes all days of week.
         :return: None
         """
-        self._days_of_week.included_days(monday, tuesday, wednesday, thursday, friday, saturday, sunday, include_all,
-                                         exclude_all)
+        self._selection().included_days(monday, tuesday, wednesday, thursday, friday, saturday, sunday, include_all,
+                                        exclude_all)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Saves the dates, their values and the date object to a compact, versioned binary snapshot file. The snapshot is
+        written to a temporary file and renamed over path, so a DateTree loaded from path with use_mmap is unaffected.
+        Values are pickled, see load.
+        :param path: Path of the file to create or replace.
+        :raises ValueError: Raised if a date in the tree is not of type datetime.date.
+        :raises pickle.PicklingError: Raised if a value can not be pickled.
+        :return: None
+        """
+        Snapshot.save(path, self._tree, self._date_obj)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, use_mmap: bool = True, indexed: bool = True,
+             cache_size: int = 0) -> "DateTree":
+        """
+        Loads a DateTree saved with save. The dates are loaded into a DateArray.
+
+        WARNING: the values in a snapshot are unpickled, and unpickling can run arbitrary code. Only load snapshots
+        from trusted sources.
+        :param path: Path of the snapshot file.
+        :param use_mmap: If True, the dates are read straight from a memory map of the file rather than copied into
+                         memory, so even very large snapshots open almost instantly. They are copied on the first
+                         change to the tree.
+        :param indexed: Passed to the new DateTree, see __init__.
+        :param cache_size: Passed to the new DateTree, see __init__.
+        :raises ValueError: Raised if the file is not a snapshot or has an unsupported version.
+        :return: The loaded DateTree.
+        """
+        tree, date_obj = Snapshot.load(path, use_mmap)
+        return cls(tree, date_obj, indexed=indexed, cache_size=cache_size)
 
     @staticmethod
     def display_dates(tree: RBTree) -> None:
@@ -257,6 +907,31 @@ class DateTree:
         """
         ShowDates.show_dates(tree)
 
+    @staticmethod
+    def export_dates(tree: RBTree, output: TextIO | str | os.PathLike, date_format: str = "iso",
+                     lower_date: datetime.date = None, upper_date: datetime.date = None, weekdays: list[int] = None,
+                     chunk_size: int = 8192) -> int:
+        """
+        Writes the dates in the tree, one per line, to a text stream or a file in large buffered chunks.
+        :param tree: Tree where the dates are stored.
+        :param output: Text stream to write to, or path of the file to write.
+        :param date_format: "iso" for YYYY-MM-DD or "mdy" for MM/DD/YYYY.
+        :param lower_date: Only dates on or after lower date are written.
+        :param upper_date: Only dates on or before upper date are written.
+        :param weekdays: Only dates on these days of the week (0 = Monday, ..., 6 = Sunday) are written.
+        :param chunk_size: Number of dates written per write call.
+        :raises ValueError: Raised if the tree is empty, the format is unknown or chunk size is less than 1.
+
+        Recommended Usage:
+            Parameter usage:
+                export_dates(tree, "dates.txt"): Writes every date to dates.txt in YYYY-MM-DD format
+                export_dates(tree, sys.stdout, date_format="mdy", weekdays=[0]): Prints every Monday in MM/DD/YYYY
+                                                                                 format
+
+        :return: The number of dates written.
+        """
+        return ShowDates.write_dates(tree, output, date_format, lower_date, upper_date, weekdays, chunk_size)
+
     @staticmethod
     def str_to_date(date_str: str) -> datetime.date:
         """
@@ -266,3 +941,12 @@ class DateTree:
         """
         return HelperMethods.str_to_date(date_str)
 
+    @staticmethod
+    def strs_to_dates(date_strs: Iterable[str]) -> list[datetime.date]:
+        """
+        Converts many string dates to dates in one call.
+        :param date_strs: string dates in dd/mm/yyyy format.
+        :raises ValueError: Raised if any string is not a valid date in the expected format.
+        :return: List of dates in the same order as date_strs.
+        """
+        return HelperMethods.strs_to_dates(date_strs)
@@ -0,0 +1,210 @@
+"""
+    instrumentation.py
+
+    This module provides the Instrumentation class, an opt-in record of how
+    the public methods of a DateTree are used: call and error counts, a
+    latency histogram, how many dates filters considered against how many
+    they returned, and the size of the tree after each call.
+
+    Instrumentation is switched on per DateTree with instrument(), which
+    wraps the public methods of that one instance, and switched off again
+    with uninstrument(). A DateTree that was never instrumented runs its
+    methods unwrapped, so there is nothing to pay while it is disabled:
+
+        from bintrees import RBTree
+        from date_tree import DateTree
+
+        builder = DateTree(RBTree(), date_obj="example")
+        stats = builder.instrument(callback=lambda event: metrics.observe(event.name, event.seconds))
+
+        builder.add_dates(date(2025, 1, 1), date(2025, 12, 31), weekdays=[0, 1, 2, 3, 4])
+        builder.filter_dates(month=3, year=2025, weekdays=[0])
+
+        stats["filter_dates"].calls     # 1
+        stats["filter_dates"].returned  # 5
+
+    Filters note how many stored dates they considered while they run, so
+    recording it adds no second pass over the tree. A lazy filter considers
+    its dates only when the view is iterated and records none.
+    """
+import functools
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Iterator, NamedTuple
+
+# Upper bounds in seconds of the latency histogram buckets. A last bucket counts the calls slower than all of them.
+LATENCY_BUCKETS: tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+
+class OperationEvent(NamedTuple):
+    """
+    One call of an instrumented method, as passed to the callback.
+    :param name: Name of the method.
+    :param seconds: Time the call took.
+    :param tree_size: Number of dates in the tree after the call.
+    :param scanned: For filters, the number of stored dates considered, including by calls that raised, otherwise
+                    None.
+    :param returned: For filters returning a tree, the number of dates returned, otherwise None.
+    :param error: The exception the call raised, or None.
+    """
+    name: str
+    seconds: float
+    tree_size: int
+    scanned: int | None
+    returned: int | None
+    error: BaseException | None
+
+
+class OperationStats(NamedTuple):
+    """
+    Totals of every recorded call of one method.
+    :param calls: Number of calls, including those that raised.
+    :param errors: Number of calls that raised.
+    :param total_seconds: Time spent in all the calls.
+    :param max_seconds: Time taken by the slowest call.
+    :param histogram: Number of calls per latency bucket, see LATENCY_BUCKETS.
+    :param scanned: Stored dates considered by all the calls, for filters.
+    :param returned: Dates returned by all the calls, for filters.
+    """
+    calls: int
+    errors: int
+    total_seconds: float
+    max_seconds: float
+    histogram: tuple[int, ...]
+    scanned: int
+    returned: int
+
+    @property
+    def mean_seconds(self) -> float:
+        """
+        :return: The average time per call, or 0.0 if there were no calls.
+        """
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class Instrumentation:
+    """
+    Collects an OperationEvent for each call of the instrumented methods, keeps running totals per method and passes
+    every event to an optional callback. One Instrumentation can be shared by several DateTrees and used from several
+    threads.
+    """
+    def __init__(self, callback: Callable[[OperationEvent], None] = None):
+        """
+        Create an empty Instrumentation.
+        :param callback: Optional callable given each OperationEvent after it is recorded, such as a function feeding
+                         a metrics client. It runs on the thread that made the call, and an exception it raises is
+                         passed to the caller.
+        """
+        self._callback: Callable[[OperationEvent], None] = callback
+        self._totals: dict[str, list] = {}
+        self._tree_size: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def tree_size(self) -> int:
+        """
+        Gets the size of the tree after the most recent recorded call.
+        :return: The number of dates.
+        """
+        return self._tree_size
+
+    def record(self, event: OperationEvent) -> None:
+        """
+        Add a call to the totals of its method and pass it to the callback.
+        :param event: The call to record.
+        :return: None
+        """
+        with self._lock:
+            totals: list = self._totals.get(event.name)
+            if totals is None:
+                totals = [0, 0, 0.0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1), 0, 0]
+                self._totals[event.name] = totals
+
+            totals[0] += 1
+            totals[1] += event.error is not None
+            totals[2] += event.seconds
+            totals[3] = max(totals[3], event.seconds)
+            totals[4][bisect_left(LATENCY_BUCKETS, event.seconds)] += 1
+            totals[5] += event.scanned or 0
+            totals[6] += event.returned or 0
+            self._tree_size = event.tree_size
+
+        if self._callback is not None:
+            self._callback(event)
+
+    def stats(self) -> dict[str, OperationStats]:
+        """
+        Gets the totals of every method called so far.
+        :return: A dict of method name to OperationStats, a copy that later calls do not change.
+        """
+        with self._lock:
+            return {name: OperationStats(calls, errors, total, slowest, tuple(histogram), scanned, returned)
+                    for name, (calls, errors, total, slowest, histogram, scanned, returned) in self._totals.items()}
+
+    def __getitem__(self, name: str) -> OperationStats:
+        """
+        :param name: Name of a method.
+        :return: The totals of the method, all zero if it has not been called.
+        """
+        return self.stats().get(name, OperationStats(0, 0, 0.0, 0.0, (0,) * (len(LATENCY_BUCKETS) + 1), 0, 0))
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        :return: An iterator of the names of the methods called so far.
+        """
+        return iter(self.stats())
+
+    def reset(self) -> None:
+        """
+        Clear every total.
+        :return: None
+        """
+        with self._lock:
+            self._totals.clear()
+            self._tree_size = 0
+
+    def wrap(self, name: str, method: Callable, tree_size: Callable[[], int],
+             scanned: Callable[..., int] = None) -> Callable:
+        """
+        Wrap a method so each of its calls is timed and recorded.
+        :param name: Name the calls are recorded under.
+        :param method: The bound method to wrap.
+        :param tree_size: Callable returning the number of dates in the tree.
+        :param scanned: For filters, a callable taking the method's arguments and returning the number of stored dates
+                        the call considered.
+        :return: The wrapped method.
+        """
+        @functools.wraps(method)
+        def instrumented(*args, **kwargs):
+            start: float = perf_counter()
+            result = None
+            error: BaseException = None
+
+            try:
+                result = method(*args, **kwargs)
+                return result
+            except BaseException as raised:
+                error = raised
+                raise
+            finally:
+                # Recorded however the call ends, so calls that raise are timed and counted like any other
+                seconds: float = perf_counter() - start
+                scanned_dates: int = None
+                returned_dates: int = None
+
+                if scanned is not None:
+                    try:
+                        scanned_dates = scanned(*args, **kwargs)
+                    except Exception:
+                        # Arguments the call rejected may not be countable either, and its own error is the one to raise
+                        if error is None:
+                            raise
+
+                    # A lazy view has no length until it is iterated
+                    if error is None and hasattr(result, "__len__"):
+                        returned_dates = len(result)
+
+                self.record(OperationEvent(name, seconds, tree_size(), scanned_dates, returned_dates, error))
+
+        return instrumented
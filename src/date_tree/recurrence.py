@@ -0,0 +1,344 @@
+"""
+    recurrence.py
+
+    This module provides the Recurrence class, a generator of the dates
+    matching a recurrence rule in the spirit of RFC 5545 RRULE. Rules
+    cover patterns that a range of included weekdays can not, such as
+    the last Friday of each month or every second Tuesday:
+
+        from datetime import date
+        from date_tree import Recurrence
+
+        # Last Friday of each month
+        Recurrence("MONTHLY", date(2025, 1, 1), count=12, by_weekday=[(4, -1)])
+
+        # The 15th, or the weekday before it when it falls on a weekend
+        Recurrence.from_rule("FREQ=MONTHLY;BYMONTHDAY=13,14,15;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1",
+                             date(2025, 1, 1), until=date(2025, 12, 31))
+
+    The supported parts are FREQ (DAILY, WEEKLY, MONTHLY or YEARLY),
+    INTERVAL, COUNT, UNTIL, BYMONTH, BYMONTHDAY, BYDAY (with an optional
+    ordinal, for MONTHLY and YEARLY rules) and BYSETPOS. Weeks start on
+    Monday.
+
+    Dates are produced lazily and in ascending order. Each period of the
+    rule works out its candidate dates directly from the calendar rather
+    than visiting every day, so the work grows with the number of dates
+    produced instead of the length of the span. A DAILY rule is the
+    exception, as each of its periods is a day. The dates can be added
+    to a DateTree in one batch with DateTree.add_recurrence.
+    """
+import calendar
+import datetime
+from typing import Iterable, Iterator
+
+# Supported values of FREQ
+FREQUENCIES: tuple[str, ...] = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+# Two letter weekday codes of BYDAY, in datetime order (0 = Monday)
+_WEEKDAY_CODES: tuple[str, ...] = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+class Recurrence:
+    """
+    Lazily generated dates of a recurrence rule. Iterating a Recurrence yields its dates in ascending order, starting
+    again from the first date on each iteration.
+    """
+    def __init__(self, freq: str, start: datetime.date, until: datetime.date = None, count: int = None,
+                 interval: int = 1, by_month: Iterable[int] = None, by_month_day: Iterable[int] = None,
+                 by_weekday: Iterable[int | tuple[int, int]] = None, by_set_pos: Iterable[int] = None):
+        """
+        Create a Recurrence.
+        :param freq: "DAILY", "WEEKLY", "MONTHLY" or "YEARLY", the length of each period of the rule.
+        :param start: First date of the rule. Its period is the first period, and it sets the defaults: the weekday
+                      of a WEEKLY rule, the day of a MONTHLY rule and the month and day of a YEARLY rule.
+        :param until: Last date that may be produced (inclusive), or None.
+        :param count: Largest number of dates produced, or None.
+        :param interval: Number of periods from one period of the rule to the next, 2 for every other week.
+        :param by_month: Months (1–12) to keep.
+        :param by_month_day: Days of the month to keep. Negative days count from the end of the month, -1 is the last.
+        :param by_weekday: Weekdays to keep (0 = Monday, ..., 6 = Sunday). For MONTHLY and YEARLY rules an entry can
+                           also be a (weekday, n) tuple for the nth such weekday of the month, or of the year for a
+                           YEARLY rule without by_month. Negative n counts from the end, (4, -1) is the last Friday.
+        :param by_set_pos: Positions to keep among the dates of each period, 1 for the first, -1 for the last.
+        :raises ValueError: If freq is unknown or a value is out of its range.
+        """
+        freq = freq.upper()
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency {freq}, expected one of {', '.join(FREQUENCIES)}")
+
+        if interval < 1:
+            raise ValueError("Interval must be at least 1")
+
+        if count is not None and count < 0:
+            raise ValueError("Count must not be negative")
+
+        self._freq: str = freq
+        self._start: datetime.date = start
+        self._until: datetime.date = until
+        self._count: int = count
+        self._interval: int = interval
+        self._by_month: list[int] = sorted(set(by_month or []))
+        self._by_month_day: list[int] = sorted(set(by_month_day or []))
+        self._by_set_pos: list[int] = sorted(set(by_set_pos or []))
+
+        # Plain weekdays and (weekday, n) pairs are kept apart, a plain weekday has n None
+        self._by_weekday: list[tuple[int, int]] = sorted({(entry, None) if isinstance(entry, int) else tuple(entry)
+                                                          for entry in by_weekday or []}, key=str)
+
+        if any(not 1 <= month <= 12 for month in self._by_month):
+            raise ValueError("Months must be in the range 1–12")
+
+        if any(not 1 <= abs(day) <= 31 for day in self._by_month_day):
+            raise ValueError("Days of the month must be in the range 1–31 or -31–-1")
+
+        if any(position == 0 for position in self._by_set_pos):
+            raise ValueError("Set positions must not be 0")
+
+        if self._by_month_day and freq == "WEEKLY":
+            raise ValueError("Days of the month can not be used with a WEEKLY rule")
+
+        for weekday, n in self._by_weekday:
+            if not 0 <= weekday <= 6:
+                raise ValueError(f"Invalid day of week {weekday}, days of week are 0 (Monday) to 6 (Sunday)")
+
+            if n is not None and (freq in ("DAILY", "WEEKLY") or not 1 <= abs(n) <= 53):
+                raise ValueError("Weekday ordinals must be in the range 1–53 or -53–-1 and need a MONTHLY or "
+                                 "YEARLY rule")
+
+    @classmethod
+    def from_rule(cls, rule: str, start: datetime.date, until: datetime.date = None) -> "Recurrence":
+        """
+        Create a Recurrence from RRULE text such as "FREQ=MONTHLY;INTERVAL=2;BYDAY=-1FR".
+        :param rule: The rule, with or without a leading "RRULE:". UNTIL is read as YYYYMMDD.
+        :param start: First date of the rule.
+        :param until: Last date that may be produced, used if the rule has no UNTIL.
+        :raises ValueError: If the rule has no FREQ, an unsupported part or a malformed value.
+        :return: The Recurrence.
+        """
+        if rule.upper().startswith("RRULE:"):
+            rule = rule[len("RRULE:"):]
+
+        parts: dict[str, str] = {}
+        for part in filter(None, rule.split(";")):
+            name, separator, value = part.partition("=")
+            if not separator:
+                raise ValueError(f"Malformed rule part {part}")
+            parts[name.strip().upper()] = value.strip().upper()
+
+        if "FREQ" not in parts:
+            raise ValueError("Rule has no FREQ")
+
+        def numbers(name: str) -> list[int]:
+            return [int(value) for value in parts.pop(name, "").split(",") if value]
+
+        weekdays: list[int | tuple[int, int]] = []
+        for value in filter(None, parts.pop("BYDAY", "").split(",")):
+            if value[-2:] not in _WEEKDAY_CODES:
+                raise ValueError(f"Unknown weekday {value}")
+
+            weekday: int = _WEEKDAY_CODES.index(value[-2:])
+            weekdays.append((weekday, int(value[:-2])) if value[:-2] else weekday)
+
+        if "UNTIL" in parts:
+            until = datetime.datetime.strptime(parts.pop("UNTIL")[:8], "%Y%m%d").date()
+
+        freq: str = parts.pop("FREQ")
+        interval: list[int] = numbers("INTERVAL")
+        count: list[int] = numbers("COUNT")
+        by_month: list[int] = numbers("BYMONTH")
+        by_month_day: list[int] = numbers("BYMONTHDAY")
+        by_set_pos: list[int] = numbers("BYSETPOS")
+
+        if parts:
+            raise ValueError(f"Unsupported rule parts {', '.join(sorted(parts))}")
+
+        return cls(freq, start, until=until, count=count[0] if count else None, interval=interval[0] if interval else 1,
+                   by_month=by_month, by_month_day=by_month_day, by_weekday=weekdays, by_set_pos=by_set_pos)
+
+    @property
+    def is_bounded(self) -> bool:
+        """
+        Returns True if the rule ends, because it has an until date or a count.
+        :return: Whether the rule ends.
+        """
+        return self._until is not None or self._count is not None
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        """
+        :return: An iterator of the dates of the rule in ascending order.
+        """
+        produced: int = 0
+
+        for candidates in self._periods():
+            if self._by_set_pos:
+                candidates = self._set_positions(candidates)
+
+            for date in candidates:
+                if date < self._start:
+                    continue
+
+                if self._until is not None and date > self._until:
+                    return
+
+                if self._count is not None and produced >= self._count:
+                    return
+
+                produced += 1
+                yield date
+
+    def between(self, lower_date: datetime.date = None, upper_date: datetime.date = None) -> Iterator[datetime.date]:
+        """
+        Yield the dates of the rule from lower_date to upper_date (inclusive). A count still counts from the start.
+        :param lower_date: Lower bound of the dates, or None for no lower bound.
+        :param upper_date: Upper bound of the dates, or None for no upper bound.
+        :return: An iterator of dates in ascending order.
+        """
+        for date in self:
+            if upper_date is not None and date > upper_date:
+                return
+
+            if lower_date is None or date >= lower_date:
+                yield date
+
+    def _set_positions(self, candidates: list[datetime.date]) -> list[datetime.date]:
+        """
+        Keep the candidates of a period at the by_set_pos positions.
+        :param candidates: Sorted dates of the period.
+        :return: The kept dates in ascending order.
+        """
+        size: int = len(candidates)
+        kept: set[int] = {position - 1 if position > 0 else size + position for position in self._by_set_pos
+                          if -size <= position <= size}
+        return [candidates[index] for index in sorted(kept)]
+
+    def _periods(self) -> Iterator[list[datetime.date]]:
+        """
+        Yield the sorted candidate dates of each period of the rule, before by_set_pos and the bounds are applied.
+        Periods end at the last year a datetime.date can hold, so a rule matching nothing still ends.
+        :return: An iterator of lists of dates.
+        """
+        if self._freq == "DAILY":
+            last: int = self._last_ordinal()
+            for ordinal in range(self._start.toordinal(), last + 1, self._interval):
+                date: datetime.date = datetime.date.fromordinal(ordinal)
+                yield [date] if self._keeps(date) else []
+
+        elif self._freq == "WEEKLY":
+            weekdays: list[int] = sorted({weekday for weekday, _ in self._by_weekday}) or [self._start.weekday()]
+            monday: int = self._start.toordinal() - self._start.weekday()
+            last = self._last_ordinal()
+
+            for week in range(monday, last + 1, 7 * self._interval):
+                yield [date for date in (datetime.date.fromordinal(week + weekday) for weekday in weekdays
+                                         if week + weekday <= last)
+                       if not self._by_month or date.month in self._by_month]
+
+        elif self._freq == "MONTHLY":
+            months: int = self._start.year * 12 + self._start.month - 1
+            last_month: int = self._last_year() * 12 + 11
+
+            for month_index in range(months, last_month + 1, self._interval):
+                year, month = divmod(month_index, 12)
+                if not self._by_month or month + 1 in self._by_month:
+                    yield self._month(year, month + 1)
+                else:
+                    yield []
+
+        else:
+            for year in range(self._start.year, self._last_year() + 1, self._interval):
+                yield self._year(year)
+
+    def _last_ordinal(self) -> int:
+        """
+        :return: Ordinal of the last date a period may hold.
+        """
+        return (self._until or datetime.date.max).toordinal()
+
+    def _last_year(self) -> int:
+        """
+        :return: The last year a period may start in.
+        """
+        return (self._until or datetime.date.max).year
+
+    def _keeps(self, date: datetime.date) -> bool:
+        """
+        Check a date against the month, day of the month and weekday rules, for DAILY rules.
+        :param date: The candidate date.
+        :return: True if the date matches every given rule.
+        """
+        if self._by_month and date.month not in self._by_month:
+            return False
+
+        if self._by_month_day:
+            last_day: int = calendar.monthrange(date.year, date.month)[1]
+            if date.day not in self._by_month_day and date.day - last_day - 1 not in self._by_month_day:
+                return False
+
+        return not self._by_weekday or any(weekday == date.weekday() for weekday, _ in self._by_weekday)
+
+    def _month(self, year: int, month: int) -> list[datetime.date]:
+        """
+        Work out the candidate dates of one month: the by_month_day days, limited to the by_weekday weekdays when both
+        are given, or the start day when neither is.
+        :param year: Year of the month.
+        :param month: The month (1–12).
+        :return: The candidates in ascending order.
+        """
+        last_day: int = calendar.monthrange(year, month)[1]
+        days: set[int] = None
+
+        if self._by_month_day:
+            days = {day if day > 0 else last_day + day + 1 for day in self._by_month_day}
+            days = {day for day in days if 1 <= day <= last_day}
+
+        if self._by_weekday:
+            first_weekday: int = datetime.date(year, month, 1).weekday()
+            weekday_days: set[int] = set()
+
+            for weekday, n in self._by_weekday:
+                occurrences: range = range(1 + (weekday - first_weekday) % 7, last_day + 1, 7)
+                if n is None:
+                    weekday_days.update(occurrences)
+                elif n <= len(occurrences) and -n <= len(occurrences):
+                    weekday_days.add(occurrences[n - 1 if n > 0 else n])
+
+            days = weekday_days if days is None else days & weekday_days
+
+        if days is None:
+            days = {self._start.day} if self._start.day <= last_day else set()
+
+        return [datetime.date(year, month, day) for day in sorted(days)]
+
+    def _year(self, year: int) -> list[datetime.date]:
+        """
+        Work out the candidate dates of one year. With by_month, each of those months is expanded like a MONTHLY
+        rule. Otherwise weekday ordinals count through the whole year, and days of the month apply to every month.
+        :param year: The year.
+        :return: The candidates in ascending order.
+        """
+        if self._by_month or (not self._by_weekday and not self._by_month_day):
+            months: list[int] = self._by_month or [self._start.month]
+            return [date for month in months for date in self._month(year, month)]
+
+        if not self._by_weekday:
+            return [date for month in range(1, 13) for date in self._month(year, month)]
+
+        first: int = datetime.date(year, 1, 1).toordinal()
+        days_in_year: int = 366 if calendar.isleap(year) else 365
+        first_weekday: int = datetime.date(year, 1, 1).weekday()
+        ordinals: set[int] = set()
+
+        for weekday, n in self._by_weekday:
+            occurrences: range = range(first + (weekday - first_weekday) % 7, first + days_in_year, 7)
+            if n is None:
+                ordinals.update(occurrences)
+            elif n <= len(occurrences) and -n <= len(occurrences):
+                ordinals.add(occurrences[n - 1 if n > 0 else n])
+
+        dates: list[datetime.date] = [datetime.date.fromordinal(ordinal) for ordinal in sorted(ordinals)]
+
+        if self._by_month_day:
+            dates = [date for date in dates if self._keeps(date)]
+
+        return dates
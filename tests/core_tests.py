@@ -1,5 +1,8 @@
+import asyncio
 import datetime
 import datetime as dt
+import io
+import threading
 
 from typing import Any, Dict
 
@@ -7,6 +10,11 @@ import pytest
 from bintrees import RBTree
 
 import date_tree.date_tree as datebuilder
+from date_tree.async_date_tree import AsyncDateTree
+from date_tree.concurrent_date_tree import ConcurrentDateTree
+from date_tree import FilterSpec, Instrumentation, OperationEvent, Recurrence
+from date_tree.date_array import DateArray
+from date_tree.date_runs import DateRuns
 from date_tree.date_tree import DateTree
 
 # --------------- Creates a dummy date object for the test ------------------
@@ -27,6 +35,20 @@ def builder() -> DateTree:
     date_obj: object = DummyObject()
     return DateTree(tree, date_obj)
 
+def array_builder() -> DateTree:
+    """
+    Creates the instance of the DateTree backed by a DateArray to be used for testing
+    :return: The DateTree instance
+    """
+    return DateTree(DateArray(), DummyObject())
+
+def runs_builder() -> DateTree:
+    """
+    Creates the instance of the DateTree backed by a DateRuns to be used for testing
+    :return: The DateTree instance
+    """
+    return DateTree(DateRuns(), DummyObject())
+
 # --------------- Tests getting the count of elements added ----------------
 
 def test_get_count():
@@ -151,6 +173,97 @@ def test_lower_bound_date_greater():
     with pytest.raises(ValueError):
         db.add_dates(first, last)
 
+def test_add_date_range_bulk_matches():
+    """
+    Tests that bulk adding produces exactly the same tree as adding one date at a time
+    """
+    first: datetime.date = datetime.date(2023, 12, 27)
+    last: datetime.date = datetime.date(2026, 2, 3)
+
+    # Checks a single day, a pair of days, and every day of the week
+    for selection in ({"tuesday": True}, {"monday": True, "sunday": True}, {"include_all": True}):
+        stepped: DateTree = builder()
+        stepped.include_days_of_week(**selection)
+        stepped.add_dates(first, last)
+
+        bulk: DateTree = builder()
+        bulk.include_days_of_week(**selection)
+        bulk.add_dates(first, last, bulk=True)
+
+        assert list(bulk.tree.items()) == [(key, bulk.date_obj) for key in stepped.tree.keys()]
+
+        # Checks the days of week are reset the same way
+        assert len(bulk.included_days) == 0
+
+def test_add_bulk_merges_stored_dates():
+    """
+    Tests that a bulk add into a tree that already holds dates keeps the other dates, replaces the values of the dates
+    it adds again, and leaves a tree that still takes inserts and removals
+    """
+    for make in (builder, array_builder):
+        stepped: DateTree = make()
+        bulk: DateTree = make()
+
+        for db in (stepped, bulk):
+            # Counts once first so the index is kept up to date through the bulk add
+            db.count_in(year=2025)
+            for day in range(1, 29, 3):
+                db.add_dates(datetime.date(2025, 2, day), value=day, weekdays=list(range(7)))
+
+        stepped.add_dates(datetime.date(2025, 1, 20), datetime.date(2025, 12, 31), value="range", weekdays=[0, 2])
+        bulk.add_dates(datetime.date(2025, 1, 20), datetime.date(2025, 12, 31), value="range", bulk=True,
+                       weekdays=[0, 2])
+
+        assert list(bulk.tree.items()) == list(stepped.tree.items())
+        assert bulk.count_in(month=2, year=2025) == stepped.count_in(month=2, year=2025)
+        assert bulk.value_of(datetime.date(2025, 2, 4)) == 4
+        assert bulk.value_of(datetime.date(2025, 2, 5)) == "range"
+
+        for db in (stepped, bulk):
+            db.add_dates(datetime.date(2026, 1, 1), value="after", weekdays=[3])
+            db.delete_date(datetime.date(2025, 3, 3))
+
+        assert list(bulk.tree.items()) == list(stepped.tree.items())
+
+def test_add_bulk_raises():
+    """
+    Tests that bulk adding raises the same ValueErrors as adding one date at a time
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    # No days of week included
+    with pytest.raises(ValueError):
+        db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 5), bulk=True)
+
+    # Lower bound greater than upper bound
+    db.include_days_of_week(include_all=True)
+    with pytest.raises(ValueError):
+        db.add_dates(datetime.date(2025, 1, 2), datetime.date(2025, 1, 1), bulk=True)
+
+def test_add_single_date_matches_range():
+    """
+    Tests that adding one date behaves like adding a one day range, for every kind of store
+    """
+    for make in (builder, array_builder, runs_builder):
+        single: DateTree = make()
+        ranged: DateTree = make()
+
+        for date in (datetime.date(2025, 1, 6), datetime.date(2025, 1, 7), datetime.date(2025, 1, 8)):
+            single.include_days_of_week(monday=True, wednesday=True)
+            single.add_dates(date, value="shift")
+            ranged.add_dates(date, date, value="shift", weekdays=[0, 2])
+
+            # The shared selection is reset after every add
+            assert len(single.included_days) == 0
+
+        assert list(single.tree.items()) == list(ranged.tree.items())
+        assert single.count == 2
+
+        # No days of week included
+        with pytest.raises(ValueError):
+            single.add_dates(datetime.date(2025, 1, 13))
+
 # ------------------------------ Tests deleting dates ------------------------------
 def add_date_helper(db: DateTree, first: int, last: int = None) -> RBTree:
     """
@@ -402,6 +515,117 @@ def tests_delete_from_empty():
     with pytest.raises(ValueError):
         db.delete_date_range(lower_date, upper_date)
 
+def test_delete_range_random_tree():
+    """
+    Tests that deleting a bounded range from an irregular tree removes exactly the dates inside the range
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    # Adds every third day of 2025 so the bounds fall between stored dates
+    start: datetime.date = datetime.date(2025, 1, 1)
+    for i in range(0, 365, 3):
+        db.include_days_of_week(include_all=True)
+        db.add_dates(start + datetime.timedelta(i))
+
+    lower_date: datetime.date = datetime.date(2025, 3, 2)
+    upper_date: datetime.date = datetime.date(2025, 8, 17)
+    expected: list[datetime.date] = [key for key in db.tree.keys() if not lower_date <= key <= upper_date]
+
+    db.delete_date_range(lower_date, upper_date)
+
+    assert list(db.tree.keys()) == expected
+
+def test_delete_many_dates_reports_missing():
+    """
+    Tests that deleting a set of dates removes the ones in the tree and reports the rest without raising
+    """
+    for db in (builder(), array_builder()):
+        add_date_helper(db, 1, 10)
+
+        holidays: list[datetime.date] = [datetime.date(2025, 1, 9), datetime.date(2025, 1, 1),
+                                         datetime.date(2025, 2, 14), datetime.date(2025, 1, 9)]
+        missing: list[datetime.date] = db.delete_dates(holidays)
+
+        assert missing == [datetime.date(2025, 2, 14)]
+        assert db.count == 8
+        assert db.dates_existance(db.tree, holidays) == [False, False, False, False]
+
+        # Checks the index was kept in step
+        db.include_days_of_week(include_all=True)
+        assert len(db.filter_dates(month=1, year=2025)) == 8
+
+def test_delete_many_dates_batch_rebuild():
+    """
+    Tests that deleting a large set of dates from a DateArray rebuilds it with the right dates and values
+    """
+    db: DateTree = array_builder()
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 12, 31))
+
+    odd_days: list[datetime.date] = [key for key in db.tree.keys() if key.day % 2 == 1]
+    assert db.delete_dates(odd_days) == []
+
+    assert db.count == 365 - len(odd_days)
+    assert all(key.day % 2 == 0 for key in db.tree.keys())
+    assert all(value is db.date_obj for value in db.tree.values())
+
+def test_remove_items_duplicates():
+    """
+    Tests that a date given twice to remove_items is removed once, whether the batch is removed one date at a time or
+    by a rebuild, and that a missing date removes nothing on either path
+    """
+    for make in (DateArray, DateRuns):
+        first: datetime.date = datetime.date(2025, 1, 1)
+
+        for size in (10, 100):
+            store = make((first + datetime.timedelta(days=i), i) for i in range(size))
+            dates: list[datetime.date] = list(store.keys())
+
+            # Below and at the rebuild threshold of a DateArray
+            store.remove_items(dates[:2] + dates[1:2])
+            assert len(store) == size - 2
+            store.remove_items(dates[2:] + dates[2:])
+            assert len(store) == 0
+
+            store.update((date, 0) for date in dates)
+            with pytest.raises(KeyError):
+                store.remove_items(dates[:5] + dates[:5] + [first - datetime.timedelta(days=1)])
+            assert len(store) == size
+
+def test_delete_many_invalid_date_type():
+    """
+    Tests that deleting a set containing a non-date raises ValueError and removes nothing
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+    add_date_helper(db, 1, 10)
+
+    with pytest.raises(ValueError):
+        db.delete_dates([datetime.date(2025, 1, 1), "01/02/2025"])
+
+    assert db.count == 10
+
+def test_delete_where():
+    """
+    Tests deleting dates chosen by a predicate, with and without bounds
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+    add_date_helper(db, 1, 31)
+
+    # Deletes weekends in the first half of the month
+    removed: list[datetime.date] = db.delete_where(lambda date, value: date.weekday() >= 5,
+                                                   upper_date=datetime.date(2025, 1, 15))
+
+    assert removed == [datetime.date(2025, 1, 4), datetime.date(2025, 1, 5), datetime.date(2025, 1, 11),
+                       datetime.date(2025, 1, 12)]
+    assert db.count == 27
+    assert db.date_existance(db.tree, datetime.date(2025, 1, 18))
+
+    with pytest.raises(ValueError):
+        db.delete_where(lambda date, value: True, datetime.date(2025, 1, 2), datetime.date(2025, 1, 1))
+
 # ------------------------------ Tests filtering dates -----------------------------
 def test_filter_by_year():
     """
@@ -676,6 +900,152 @@ def test_filter_by_year_month_day():
     assert db.date_existance(filtered_dec_1st_2025, filter1_false2) is False
     assert db.date_existance(filtered_dec_1st_2025, filter1_false3) is False
 
+def test_filter_range_multiple_years_months():
+    """
+    Tests filtering a range by several years and months, given out of order
+    """
+    # Sets up the date builder with a tree and date object
+    db = builder()
+
+    # Includes days of week and adds five years of dates
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2021, 1, 1), datetime.date(2025, 12, 31))
+
+    # Filters for February and November of 2022 and 2024
+    db.include_days_of_week(include_all=True)
+    filtered: RBTree = db.filtered_date_range(months=[11, 2], years=[2024, 2022])
+
+    expected: list[datetime.date] = [key for key in db.tree.keys()
+                                     if key.year in (2022, 2024) and key.month in (2, 11)]
+
+    assert list(filtered.keys()) == expected
+    assert len(filtered) == 28 + 30 + 29 + 30
+
+def test_filter_index_matches_scan():
+    """
+    Tests that filtering through the calendar index gives the same trees as scanning without it
+    """
+    indexed: DateTree = builder()
+    scanned: DateTree = DateTree(RBTree(), DummyObject(), indexed=False)
+
+    for db in (indexed, scanned):
+        db.include_days_of_week(monday=True, tuesday=True, thursday=True, sunday=True)
+        db.add_dates(datetime.date(2023, 6, 1), datetime.date(2026, 2, 28))
+        db.delete_date_range(datetime.date(2024, 2, 10), datetime.date(2024, 3, 5))
+        db.delete_date(datetime.date(2025, 1, 2))
+
+    filters: list[dict] = [{"years": [2024]}, {"months": [2, 3], "years": [2024]}, {"days": [1, 2, 31]},
+                           {"months": [1]}, {"days": [3, 4], "months": [2]}, {}]
+
+    for kwargs in filters:
+        indexed.include_days_of_week(tuesday=True, thursday=True)
+        scanned.include_days_of_week(tuesday=True, thursday=True)
+
+        assert list(indexed.filtered_date_range(**kwargs).keys()) == list(scanned.filtered_date_range(**kwargs).keys())
+
+def test_filter_index_prepopulated_tree():
+    """
+    Tests that dates already in the tree when the DateTree is created are found by filtering
+    """
+    tree: RBTree = RBTree()
+    tree.insert(datetime.date(2025, 3, 14), "pi")
+    tree.insert(datetime.date(2025, 4, 1), "fools")
+
+    db: DateTree = DateTree(tree, DummyObject())
+    db.include_days_of_week(include_all=True)
+    filtered: RBTree = db.filter_dates(month=3, year=2025)
+
+    assert list(filtered.items()) == [(datetime.date(2025, 3, 14), "pi")]
+
+def test_filter_lazy_matches_tree():
+    """
+    Tests that a lazy filter yields the same sorted pairs as the materialized tree and can be turned into a tree
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2024, 1, 1), datetime.date(2025, 12, 31))
+
+    db.include_days_of_week(monday=True, friday=True)
+    eager: RBTree = db.filtered_date_range(months=[3, 1], years=[2025, 2024])
+
+    db.include_days_of_week(monday=True, friday=True)
+    view = db.filtered_date_range(months=[3, 1], years=[2025, 2024], lazy=True)
+
+    # Checks the days of week are reset when the view is created and the view keeps its own selection
+    assert len(db.included_days) == 0
+    assert list(view) == list(eager.items())
+
+    # Checks the view can be iterated again and materialized
+    assert list(view.keys()) == list(eager.keys())
+    tree: RBTree = view.to_tree()
+    assert isinstance(tree, RBTree)
+    assert list(tree.items()) == list(eager.items())
+
+def test_filter_lazy_empty():
+    """
+    Tests that a lazy filter with no matches is empty rather than raising
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    add_date_helper(db, 1, 10)
+
+    db.include_days_of_week(include_all=True)
+    view = db.filter_dates(year=1999, lazy=True)
+
+    assert list(view) == []
+
+def test_filter_cache_hits_and_invalidation():
+    """
+    Tests that repeated filters are served from the cache and that mutations only drop the affected results
+    """
+    db: DateTree = DateTree(RBTree(), DummyObject(), cache_size=2)
+
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2024, 1, 1), datetime.date(2025, 12, 31))
+
+    db.include_days_of_week(include_all=True)
+    first: RBTree = db.filter_dates(month=1, year=2025)
+
+    # Same arguments through the range form, in a different order, hit the same entry
+    db.include_days_of_week(include_all=True)
+    second: RBTree = db.filtered_date_range(years=[2025], months=[1])
+
+    assert second is first
+    assert db.cache_info().hits == 1
+    assert db.cache_info().misses == 1
+
+    # A change in 2024 keeps the 2025 result
+    db.delete_date(datetime.date(2024, 1, 15))
+    db.include_days_of_week(include_all=True)
+    assert db.filter_dates(month=1, year=2025) is first
+
+    # A change in 2025 drops it
+    db.delete_date_range(datetime.date(2025, 1, 10), datetime.date(2025, 1, 12))
+    db.include_days_of_week(include_all=True)
+    third: RBTree = db.filter_dates(month=1, year=2025)
+
+    assert third is not first
+    assert len(third) == 28
+
+def test_filter_cache_lru_eviction():
+    """
+    Tests that the least recently used filter result is evicted once the cache is full
+    """
+    db: DateTree = DateTree(RBTree(), DummyObject(), cache_size=2)
+
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 3, 31))
+
+    for month in (1, 2, 1, 3, 1, 2):
+        db.include_days_of_week(include_all=True)
+        db.filter_dates(month=month)
+
+    # January stays cached as it is used most, February is evicted by March
+    assert db.cache_info() == (2, 4, 2, 2)
+
 # ------------------------------ Tests finding dates -------------------------------
 def test_find_true():
     """
@@ -727,6 +1097,33 @@ def test_invalid_date_type_str():
     with pytest.raises(ValueError):
         db.date_existance(db.tree, "12/12/2025")
 
+def test_find_many():
+    """
+    Tests that dates_existance answers each probe in the order given
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    # Adds dates
+    add_date_helper(db, 1, 10)
+
+    probes: list[datetime.date] = [datetime.date(2025, 1, 5), datetime.date(2025, 1, 11), datetime.date(2025, 1, 1)]
+
+    assert db.dates_existance(db.tree, probes) == [True, False, True]
+
+def test_find_many_invalid_date_type():
+    """
+    Tests that dates_existance raises ValueError when any probe is not a date
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    # Adds dates
+    add_date_helper(db, 1)
+
+    with pytest.raises(ValueError):
+        db.dates_existance(db.tree, [datetime.date(2025, 1, 1), "01/01/2025"])
+
 # ------------------ Tests the include_days_of_week functionality ------------------
 
 def test_include_all_days_of_week():
@@ -936,101 +1333,1205 @@ def test_reset_after_add():
     result = len(db.included_days)
     assert result == 0
 
-# --------------- Below tests the display_dates functionality ---------------
+# ------------------------ Tests set operations between DateTrees -------------------------
 
-def test_display_dates_non_empty_tree():
+def test_set_operations_match_sets():
     """
-    Tests display date for a non-empty tree. This is a manual test where the dates 2025/01/01, 2025/01/02,
-    2025/01/03, 2025/01/04, 2025/01/05 should appear in the terminal
+    Tests that every set operation, and its in-place variant, gives the same dates as Python sets, for every store
     """
-    # Sets up tree with added dates so display dates can be tested
-    # Sets up the date builder with a tree and date object
-    db: DateTree = builder()
-    tree: RBTree = db.tree
+    operations: dict[str, Any] = {"union": set.union, "intersection": set.intersection,
+                                  "difference": set.difference, "symmetric_difference": set.symmetric_difference}
 
-    # Sets first and last date in datetime
-    first_date: datetime.date = dt.date(2025, 1, 1)
-    last_date: datetime.date = dt.date(2025, 1, 5)
+    for make in (builder, array_builder, runs_builder):
+        left: DateTree = make()
+        right: DateTree = make()
+        left.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 3, 31), value="left", weekdays=[0, 1, 2, 3, 4])
+        right.add_dates(datetime.date(2025, 2, 15), datetime.date(2025, 5, 31), value="right", weekdays=[0, 5])
 
-    # Includes days of week
-    db.include_days_of_week(include_all=True)
+        for name, expected in operations.items():
+            result: DateTree = getattr(left, name)(right)
+            keys: set = expected(set(left.tree.keys()), set(right.tree.keys()))
 
-    # Adds dates to tree
-    db.add_dates(first_date, last_date)
+            assert type(result.tree) is type(left.tree)
+            assert list(result.tree.keys()) == sorted(keys)
 
-    # Displays the tree in the terminal
-    db.display_dates(tree)
+            changed: DateTree = make()
+            changed.tree.update(left.tree.items())
+            getattr(changed, f"{name}_update")(right.tree)
+            assert list(changed.tree.items()) == list(result.tree.items())
 
-def test_display_dates_empty_tree():
+def test_set_operations_resolve_values():
     """
-    Tests display date for an empty tree. This should raise a KeyError Exception.
+    Tests that dates in both trees keep this tree's value unless a resolver picks another
     """
-    # Sets up tree with added dates so display dates can be tested
-    # Sets up the date builder with a tree and date object
-    db: DateTree = builder()
+    holidays: DateTree = builder()
+    holidays.add_dates(datetime.date(2025, 12, 25), datetime.date(2025, 12, 26), value="holiday",
+                       weekdays=list(range(7)))
 
-    # Tries to display dates of an empty tree
-    with pytest.raises(ValueError):
-        db.display_dates(db.tree)
+    working: DateTree = builder()
+    working.add_dates(datetime.date(2025, 12, 22), datetime.date(2025, 12, 31), value="work", weekdays=[0, 1, 2, 3, 4])
 
-# --------------- Below tests the str_to_date functionality ---------------
-def test_str_to_date_pass(monkeypatch: pytest.MonkeyPatch):
-    """
-    Tests to see if str_to_date returns the correct date time
-    """
-    called: Dict[str, Any] = {}
+    assert set(working.union(holidays).tree.values()) == {"work"}
+    assert working.union(holidays, lambda date, mine, theirs: theirs).value_of(datetime.date(2025, 12, 25)) == "holiday"
+    assert list(working.intersection(holidays, lambda date, mine, theirs: mine + "/" + theirs).tree.values()) == \
+           ["work/holiday", "work/holiday"]
 
-    class FakeHelperMethods:
-        @staticmethod
-        def str_to_date(date_str: str) -> dt.date:
-            called["arg"] = date_str
-            # Sentinel value so we know this was used
-            return dt.date(2025, 12, 31)
+    # Working days minus holidays, in place, keeps the index in step for later filters
+    working.filter_dates(month=12, year=2025, weekdays=[3])
+    working.difference_update(holidays)
+    assert list(working.filter_dates(month=12, year=2025, weekdays=list(range(7))).keys()) == \
+           [datetime.date(2025, 12, day) for day in (22, 23, 24, 29, 30, 31)]
 
-    monkeypatch.setattr(datebuilder, "HelperMethods", FakeHelperMethods)
+    # A tree combined with itself
+    working.symmetric_difference_update(working)
+    assert working.is_empty
 
-    result = DateTree.str_to_date("01/01/2025")
+    working.union_update(holidays)
+    assert list(working.tree.values()) == ["holiday", "holiday"]
 
-    assert result == dt.date(2025, 12, 31)
-    assert called["arg"] == "01/01/2025"
+# ------------------------ Tests adding recurrence rules -------------------------
 
-def test_str_to_date_failed_match():
+def test_recurrence_patterns():
     """
-    Tests for that dates don't match when providing differing dates
+    Tests that recurrence rules give the same dates as checking every day of the span
     """
-    result = DateTree.str_to_date("01/01/2025")
+    days: list[datetime.date] = [datetime.date(2024, 1, 1) + datetime.timedelta(offset) for offset in range(731)]
+    end: datetime.date = days[-1]
 
-    assert not result == dt.date(2021, 12, 31)
+    def month_of(date: datetime.date) -> list[datetime.date]:
+        return [day for day in days if (day.year, day.month) == (date.year, date.month)]
+
+    # Last Friday of each month
+    last_fridays: list[datetime.date] = [day for day in days
+                                         if day.weekday() == 4 and (day + datetime.timedelta(7)).month != day.month]
+    assert list(Recurrence("MONTHLY", days[0], until=end, by_weekday=[(4, -1)])) == last_fridays
+    assert list(Recurrence.from_rule("RRULE:FREQ=MONTHLY;BYDAY=-1FR", days[0], until=end)) == last_fridays
+
+    # Every second Tuesday from the first one
+    assert list(Recurrence.from_rule("FREQ=WEEKLY;INTERVAL=2;BYDAY=TU", days[0], until=end)) == \
+           [day for day in days if day.weekday() == 1][::2]
+
+    # The 15th, or the last weekday before it when it falls on a weekend
+    paydays: list[datetime.date] = [max(day for day in month_of(date) if day.day <= 15 and day.weekday() < 5)
+                                    for date in days if date.day == 1]
+    assert list(Recurrence.from_rule("FREQ=MONTHLY;BYMONTHDAY=13,14,15;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1",
+                                     days[0], until=end)) == paydays
+
+    # Last day of each month, fourth Thursday of November and the first Monday of each year
+    assert list(Recurrence("DAILY", days[0], until=end, by_month_day=[-1])) == \
+           [day for day in days if (day + datetime.timedelta(1)).day == 1]
+    assert list(Recurrence.from_rule("FREQ=YEARLY;BYMONTH=11;BYDAY=4TH;COUNT=1", days[0])) == \
+           [datetime.date(2024, 11, 28)]
+    assert list(Recurrence("YEARLY", days[0], until=end, by_weekday=[(0, 1)])) == \
+           [datetime.date(2024, 1, 1), datetime.date(2025, 1, 6)]
+
+    # Months without the start day are skipped, and a count stops the rule
+    assert list(Recurrence("MONTHLY", datetime.date(2025, 1, 31), count=3)) == \
+           [datetime.date(2025, 1, 31), datetime.date(2025, 3, 31), datetime.date(2025, 5, 31)]
 
-def test_str_to_date_correct_raise_invalid_y_m_d():
-    """
-    Tests that a ValueError exception is correctly raised when providing a date in an invalid format yyyy/mm/dd rather
-    than dd/mm/yyyy
-    """
     with pytest.raises(ValueError):
-        DateTree.str_to_date("2025/01/01")
+        Recurrence("HOURLY", days[0])
 
-def test_str_to_date_correct_raise_invalid_year_len():
+    with pytest.raises(ValueError):
+        Recurrence("WEEKLY", days[0], by_weekday=[(4, -1)])
+
+    with pytest.raises(ValueError):
+        Recurrence.from_rule("FREQ=MONTHLY;BYHOUR=9", days[0])
+
+def test_add_recurrence():
     """
-    Tests that a ValueError exception is correctly raised when providing a date in an invalid format dd/mm/yyyyy rather
-    than dd/mm/yyyy
+    Tests that add_recurrence adds the dates of a rule to every store, with their value, and keeps filters current
     """
-    with pytest.raises(ValueError):
-        DateTree.str_to_date("01/01/20205")
+    rule: Recurrence = Recurrence("MONTHLY", datetime.date(2025, 1, 1), until=datetime.date(2025, 12, 31),
+                                  by_weekday=[(4, -1)])
 
-def test_str_to_date_correct_raise_invalid_seperator():
+    for make in (builder, array_builder, runs_builder):
+        test_builder: DateTree = make()
+        test_builder.add_dates(datetime.date(2025, 3, 1), datetime.date(2025, 3, 31), weekdays=[0])
+        assert len(test_builder.filter_dates(month=3, year=2025, weekdays=list(range(7)))) == 5
+
+        test_builder.add_recurrence(rule, value="close")
+        assert test_builder.count == 17
+        assert test_builder.value_of(datetime.date(2025, 3, 28)) == "close"
+        assert list(test_builder.filter_dates(month=3, year=2025, weekdays=[4]).keys()) == [datetime.date(2025, 3, 28)]
+
+        with pytest.raises(ValueError):
+            test_builder.add_recurrence(Recurrence("DAILY", datetime.date(2025, 1, 1)))
+
+# ------------------------ Tests counting dates -------------------------
+
+def test_count_in_matches_filters():
     """
-    Tests that a ValueError exception is correctly raised when providing a date in an invalid format dd-mm-yyyy rather
-    than dd/mm/yyyy
+    Tests that count_in gives the size of the matching filter for every store, indexed or not, and 0 for no matches
     """
-    with pytest.raises(ValueError):
-        DateTree.str_to_date("01-01-2025")
+    for make in (builder, array_builder, runs_builder):
+        for indexed in (True, False):
+            source: DateTree = make()
+            test_builder: DateTree = DateTree(source.tree, source.date_obj, indexed=indexed)
+            test_builder.add_dates(datetime.date(2024, 11, 1), datetime.date(2025, 4, 30), weekdays=[0, 1, 2, 3, 4])
+            test_builder.delete_date(datetime.date(2025, 3, 3))
 
-def test_str_to_date_correct_raise_invalid_type():
+            for day, month, year, weekdays in ((None, 3, 2025, list(range(7))), (None, None, 2025, list(range(7))),
+                                               (None, None, 2024, [0]), (3, None, None, [0, 1]), (None, 12, None, [4])):
+                assert test_builder.count_in(day, month, year, weekdays=weekdays) == \
+                       len(test_builder.filter_dates(day, month, year, weekdays=weekdays))
+
+            assert test_builder.count_in(month=3, year=2025, weekdays=[5, 6]) == 0
+            assert test_builder.count_in(year=1999, weekdays=list(range(7))) == 0
+
+def test_count_runs_without_filtering(monkeypatch):
     """
-    Tests that a TypeError exception is correctly raised when providing a date as a datetime rather than str
+    Tests that a DateRuns counts the dates matching a filter arithmetically, without building the filtered runs
     """
-    date: datetime.date = datetime.date(2025, 1, 1)
+    runs: DateRuns = DateRuns()
+    runs.add_run(datetime.date(2023, 1, 30), datetime.date(2025, 2, 3), 0b0011111, "weekdays")
+    runs.add_run(datetime.date(2025, 3, 1), datetime.date(2025, 3, 31), 0b1111111, "march")
+    runs.remove(datetime.date(2024, 2, 29))
+
+    filters: list[tuple] = [([], [], [], 0b1111111), ([], [2], [2024, 2025], 0b0000001), ([29, 31], [], [], 0b1111111),
+                            ([1, 15], [1, 3], [2025], 0b1100000), ([], [], [2023], 0b0010000), ([5], [4], [2026], 1)]
+
+    expected: list[int] = [len(runs.filtered(*arguments)) for arguments in filters]
+
+    def not_called(*args, **kwargs):
+        raise AssertionError("count built the filtered runs")
+
+    monkeypatch.setattr(DateRuns, "filtered", not_called)
+
+    assert [runs.count_matching(*arguments) for arguments in filters] == expected
+
+    test_builder: DateTree = DateTree(runs, None, indexed=False)
+    assert test_builder.count_in(month=2, weekdays=[0, 1, 2, 3, 4]) == sum(1 for date in runs if date.month == 2)
+    assert test_builder.count_in(29, weekdays=list(range(7))) == sum(1 for date in runs if date.day == 29)
+
+def test_count_between():
+    """
+    Tests that count_between counts the dates in a range, and stays correct as dates are added and removed
+    """
+    for make in (builder, array_builder, runs_builder):
+        test_builder: DateTree = make()
+        test_builder.add_dates(datetime.date(2023, 6, 1), datetime.date(2025, 6, 30), bulk=True,
+                               weekdays=[0, 1, 2, 3, 4])
+
+        def expected(lower_date: datetime.date = None, upper_date: datetime.date = None) -> int:
+            return len(test_builder.items_between(lower_date, upper_date))
+
+        bounds: list[tuple] = [(None, None), (datetime.date(2024, 2, 29), None), (None, datetime.date(2023, 12, 31)),
+                               (datetime.date(2023, 6, 15), datetime.date(2025, 1, 15)),
+                               (datetime.date(2024, 5, 1), datetime.date(2024, 4, 1))]
+
+        for lower_date, upper_date in bounds:
+            assert test_builder.count_between(lower_date, upper_date) == expected(lower_date, upper_date)
+
+        test_builder.delete_date_range(datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
+        test_builder.add_dates(datetime.date(2030, 1, 1), datetime.date(2030, 1, 31), weekdays=list(range(7)))
+
+        for lower_date, upper_date in bounds:
+            assert test_builder.count_between(lower_date, upper_date) == expected(lower_date, upper_date)
+
+        assert test_builder.count_between(datetime.date(2026, 1, 1)) == 31
+
+# ------------------------ Tests positional queries -------------------------
+
+def test_nearest_dates():
+    """
+    Tests that next_date and prev_date find the nearest stored dates for every store
+    """
+    for make in (builder, array_builder, runs_builder):
+        test_builder: DateTree = make()
+        test_builder.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31), weekdays=[0, 2, 4])
+
+        # 01/01/2025 is a Wednesday, 03/01/2025 a Friday and 06/01/2025 a Monday
+        assert test_builder.next_date(datetime.date(2025, 1, 1)) == datetime.date(2025, 1, 1)
+        assert test_builder.next_date(datetime.date(2025, 1, 1), inclusive=False) == datetime.date(2025, 1, 3)
+        assert test_builder.next_date(datetime.date(2024, 6, 1)) == datetime.date(2025, 1, 1)
+        assert test_builder.prev_date(datetime.date(2025, 1, 6)) == datetime.date(2025, 1, 3)
+        assert test_builder.prev_date(datetime.date(2025, 1, 6), inclusive=True) == datetime.date(2025, 1, 6)
+        assert test_builder.prev_date(datetime.date(2025, 3, 1)) == datetime.date(2025, 1, 31)
+
+        with pytest.raises(ValueError):
+            test_builder.next_date(datetime.date(2025, 1, 31), inclusive=False)
+
+        with pytest.raises(ValueError):
+            test_builder.prev_date(datetime.date(2025, 1, 1))
+
+        with pytest.raises(ValueError):
+            test_builder.next_date("2025-01-01")
+
+def test_rank_and_nth_date():
+    """
+    Tests that rank and nth_date agree with the sorted dates for every store, indexed or not, as dates change
+    """
+    for make in (builder, array_builder, runs_builder):
+        for indexed in (True, False):
+            source: DateTree = make()
+            test_builder: DateTree = DateTree(source.tree, source.date_obj, indexed=indexed)
+            test_builder.add_dates(datetime.date(2023, 11, 1), datetime.date(2025, 2, 28), weekdays=[0, 1, 2, 3, 4])
+            test_builder.add_dates(datetime.date(2026, 7, 4), weekdays=[5])
+            test_builder.delete_date(datetime.date(2024, 2, 29))
+
+            for _ in range(2):
+                keys: list[datetime.date] = list(test_builder.tree.keys())
+
+                for position in (0, 1, 57, len(keys) // 2, len(keys) - 1):
+                    assert test_builder.nth_date(position) == keys[position]
+                    assert test_builder.rank(keys[position]) == position
+
+                assert test_builder.nth_date(-1) == datetime.date(2026, 7, 4)
+                assert test_builder.rank(datetime.date(2024, 2, 29)) == keys.index(datetime.date(2024, 3, 1))
+                assert test_builder.rank(datetime.date(1990, 1, 1)) == 0
+                assert test_builder.rank(datetime.date(2030, 1, 1)) == len(keys)
+
+                with pytest.raises(ValueError):
+                    test_builder.nth_date(len(keys))
+
+                # Changes after the first query are reflected by the next ones
+                test_builder.delete_date_range(datetime.date(2024, 6, 1), datetime.date(2024, 6, 30))
+                test_builder.add_dates(datetime.date(1999, 12, 31), weekdays=[4])
+
+# ------------------------ Tests business-day arithmetic -------------------------
+
+def test_shift_and_business_days_between():
+    """
+    Tests shifting dates by a number of stored dates and counting them, one at a time and in batches, for every store
+    """
+    for make in (builder, array_builder, runs_builder):
+        test_builder: DateTree = make()
+        test_builder.add_dates(datetime.date(2024, 12, 2), datetime.date(2025, 1, 31), weekdays=[0, 1, 2, 3, 4])
+        test_builder.delete_dates([datetime.date(2024, 12, 25), datetime.date(2025, 1, 1)])
+
+        # 27/12/2024 is a Friday and 28/12/2024 a Saturday
+        friday: datetime.date = datetime.date(2024, 12, 27)
+        saturday: datetime.date = datetime.date(2024, 12, 28)
+
+        assert test_builder.shift(friday, 1) == datetime.date(2024, 12, 30)
+        assert test_builder.shift(saturday, 1) == datetime.date(2024, 12, 30)
+        assert test_builder.shift(saturday, 0) == datetime.date(2024, 12, 30)
+        assert test_builder.shift(saturday, -1) == friday
+        assert test_builder.shift(friday, 0) == friday
+        assert test_builder.shift(datetime.date(2024, 12, 31), 1) == datetime.date(2025, 1, 2)
+        assert test_builder.shift(datetime.date(2024, 12, 26), -2) == datetime.date(2024, 12, 23)
+
+        assert test_builder.business_days_between(friday, datetime.date(2025, 1, 3)) == 4
+        assert test_builder.business_days_between(datetime.date(2025, 1, 3), friday) == -4
+        assert test_builder.business_days_between(saturday, saturday) == 0
+        assert test_builder.shift(friday, test_builder.business_days_between(friday, datetime.date(2025, 1, 6))) == \
+               datetime.date(2025, 1, 6)
+
+        dates: list[datetime.date] = [friday, saturday, friday, datetime.date(2025, 1, 20)]
+        assert test_builder.shift_dates(dates, [1, 1, -5, 3]) == [test_builder.shift(date, n) for date, n in
+                                                                    zip(dates, [1, 1, -5, 3])]
+        assert test_builder.shift_dates(dates, 2) == [test_builder.shift(date, 2) for date in dates]
+        assert test_builder.business_days_between_dates(dates, dates[::-1]) == \
+               [test_builder.business_days_between(start, end) for start, end in zip(dates, dates[::-1])]
+
+        with pytest.raises(ValueError):
+            test_builder.shift(datetime.date(2025, 1, 30), 2)
+
+        with pytest.raises(ValueError):
+            test_builder.shift_dates(dates, [1, 1])
+
+        with pytest.raises(ValueError):
+            test_builder.business_days_between("2025-01-01", friday)
+
+# ------------------------ Tests the DateArray store -------------------------
+
+def test_date_array_matches_rbtree():
+    """
+    Tests that adding, deleting, finding and filtering give the same results with a DateArray as with an RBTree
+    """
+    results: list[list] = []
+
+    for db in (builder(), array_builder()):
+        db.include_days_of_week(monday=True, wednesday=True, friday=True, saturday=True)
+        db.add_dates(datetime.date(2024, 11, 20), datetime.date(2025, 3, 10))
+
+        # Adds dates before the existing ones so they are inserted out of order
+        db.include_days_of_week(include_all=True)
+        db.add_dates(datetime.date(2024, 10, 1), datetime.date(2024, 10, 3))
+
+        db.delete_date(datetime.date(2024, 12, 2))
+        db.delete_date_range(datetime.date(2025, 1, 10), datetime.date(2025, 1, 20))
+
+        db.include_days_of_week(friday=True)
+        filtered = db.filtered_date_range(months=[12, 1], years=[2024, 2025])
+
+        results.append([list(db.tree.keys()), list(filtered.keys()), db.count,
+                        db.date_existance(db.tree, datetime.date(2024, 12, 2)),
+                        db.date_existance(db.tree, datetime.date(2024, 10, 2))])
+
+    assert results[0] == results[1]
+
+def test_date_array_values_and_errors():
+    """
+    Tests that a DateArray keeps values aligned with dates and raises like an RBTree
+    """
+    store: DateArray = DateArray()
+    store.update([(datetime.date(2025, 1, 3), "c"), (datetime.date(2025, 1, 1), "a")])
+    store.update({datetime.date(2025, 1, 2): "b", datetime.date(2025, 1, 3): "C"})
+
+    assert list(store.items()) == [(datetime.date(2025, 1, 1), "a"), (datetime.date(2025, 1, 2), "b"),
+                                   (datetime.date(2025, 1, 3), "C")]
+    assert store.get_value(datetime.date(2025, 1, 2)) == "b"
+
+    with pytest.raises(KeyError):
+        store.remove(datetime.date(2025, 1, 4))
+
+    with pytest.raises(ValueError):
+        store.insert("01/01/2025", "x")
+
+def test_add_dates_range_values():
+    """
+    Tests that each range keeps its own value, looked up with value_of, and that a DateArray stores each value once
+    """
+    day_shift: list[str] = ["06:00", "14:00"]
+    night_shift: list[str] = ["22:00", "06:00"]
+
+    for db in (builder(), array_builder()):
+        db.include_days_of_week(include_all=True)
+        db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31), value=day_shift)
+        db.include_days_of_week(include_all=True)
+        db.add_dates(datetime.date(2025, 2, 1), datetime.date(2025, 2, 28), bulk=True, value=night_shift)
+        db.include_days_of_week(include_all=True)
+        db.add_dates(datetime.date(2025, 3, 1))
+
+        assert db.value_of(datetime.date(2025, 1, 15)) is day_shift
+        assert db.value_of(datetime.date(2025, 2, 15)) is night_shift
+        assert db.value_of(datetime.date(2025, 3, 1)) is db.date_obj
+
+        with pytest.raises(ValueError):
+            db.value_of(datetime.date(2025, 4, 1))
+
+        with pytest.raises(ValueError):
+            db.value_of("01/15/2025")
+
+    assert len(db.tree.value_table) == 3
+    assert len(db.tree.handles) == db.count == 60
+
+def test_array_drops_unused_values(tmp_path):
+    """
+    Tests that values replaced or removed from a DateArray do not stay in its value table without bound, and that a
+    snapshot only stores the values still in use
+    """
+    store: DateArray = DateArray()
+    first: datetime.date = datetime.date(2025, 1, 1)
+    store.update((first + datetime.timedelta(days=i), "shared") for i in range(10))
+
+    # Each replacement orphans the previous value of the date
+    for i in range(1000):
+        store.insert(first, [i])
+        assert len(store.value_table) <= 2 * len(store) + 64
+
+    assert store.get_value(first) == [999]
+    assert store.get_value(first + datetime.timedelta(days=9)) == "shared"
+
+    # Equal but distinct values are not shared
+    store.insert(first + datetime.timedelta(days=1), [999])
+    store.compact()
+    assert len(store.value_table) == 3
+
+    store.remove_items(first + datetime.timedelta(days=i) for i in range(1, 10))
+    store.compact()
+    assert list(store.value_table) == [[999]]
+
+    db: DateTree = array_builder()
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31), value="january", weekdays=list(range(7)))
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31), value="replaced", weekdays=list(range(7)))
+    db.save(tmp_path / "dates.snap")
+
+    loaded: DateTree = DateTree.load(tmp_path / "dates.snap")
+    assert list(loaded.tree.value_table) == [loaded.date_obj, "replaced"]
+    assert list(loaded.tree.values()) == ["replaced"] * 31
+
+def test_save_load_range_values(tmp_path):
+    """
+    Tests that a DateArray with several range values saves and loads with every date keeping its value
+    """
+    db: DateTree = array_builder()
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 10), value="early")
+    db.include_days_of_week(include_all=True)
+    db.add_dates(datetime.date(2025, 1, 5), datetime.date(2025, 1, 20))
+
+    path = tmp_path / "calendar.dtree"
+    db.save(path)
+    loaded: DateTree = DateTree.load(path)
+
+    assert [value == "early" for value in loaded.tree.values()] == [value == "early" for value in db.tree.values()]
+    assert loaded.value_of(datetime.date(2025, 1, 4)) == "early"
+    assert loaded.value_of(datetime.date(2025, 1, 5)) is loaded.date_obj
+
+def test_include_same_day_twice():
+    """
+    Tests that including a day that is already included does not add it again
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    db.include_days_of_week(monday=True, friday=True)
+    db.include_days_of_week(monday=True)
+    db.include_days_of_week(include_all=True)
+    db.include_days_of_week(friday=True)
+
+    assert db.included_days == [0, 1, 2, 3, 4, 5, 6]
+
+def test_add_single_weekday_long_range():
+    """
+    Tests that adding a single day of week over a long range adds exactly that weekday, including at the range ends
+    """
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    # 01/06/2025 and 01/01/2035 are both Mondays
+    first: datetime.date = datetime.date(2025, 1, 6)
+    last: datetime.date = datetime.date(2035, 1, 1)
+
+    db.include_days_of_week(monday=True)
+    db.add_dates(first, last)
+
+    assert db.count == (last - first).days // 7 + 1
+    assert db.tree.min_key() == first
+    assert db.tree.max_key() == last
+    assert all(key.weekday() == 0 for key in db.tree.keys())
+
+# ------------------------ Tests the DateRuns store -------------------------
+
+def test_date_runs_matches_rbtree():
+    """
+    Tests that adding, deleting, finding, counting and filtering give the same results with a DateRuns as with an
+    RBTree
+    """
+    results: list[list] = []
+
+    for db in (builder(), runs_builder()):
+        db.include_days_of_week(monday=True, wednesday=True, friday=True, saturday=True)
+        db.add_dates(datetime.date(2024, 11, 20), datetime.date(2025, 3, 10))
+
+        # Overlaps the first range with other weekdays and a value of its own
+        db.include_days_of_week(tuesday=True, wednesday=True)
+        db.add_dates(datetime.date(2025, 2, 1), datetime.date(2025, 4, 30), value="spring")
+
+        db.include_days_of_week(include_all=True)
+        db.add_dates(datetime.date(2024, 10, 1), datetime.date(2024, 10, 3), bulk=True)
+
+        db.delete_date(datetime.date(2024, 12, 2))
+        db.delete_date_range(datetime.date(2025, 1, 10), datetime.date(2025, 1, 20))
+        db.delete_dates([datetime.date(2025, 3, 4), datetime.date(2025, 3, 5)])
+        db.delete_where(lambda date, value: date.day == 13)
+
+        db.include_days_of_week(friday=True, wednesday=True)
+        filtered = db.filtered_date_range(months=[12, 1, 3], years=[2024, 2025])
+        db.include_days_of_week(include_all=True)
+        by_day = db.filtered_date_range(days=[1, 31])
+
+        # Each DateTree has its own date object, so values are compared by whether they are the range value
+        results.append([[(key, value == "spring") for key, value in db.tree.items()],
+                        [(key, value == "spring") for key, value in filtered.items()],
+                        list(by_day.keys()), db.count,
+                        db.date_existance(db.tree, datetime.date(2024, 12, 2)),
+                        db.date_existance(db.tree, datetime.date(2024, 10, 2)),
+                        db.value_of(datetime.date(2025, 3, 11)), list(db.tree.keys(reverse=True)),
+                        db.tree.ceiling_key(datetime.date(2025, 1, 12)), db.tree.floor_key(datetime.date(2025, 1, 12))])
+
+    assert results[0] == results[1]
+
+def test_date_runs_compact_century():
+    """
+    Tests that a century of weekdays is held in a single run, counted and filtered without expanding it
+    """
+    db: DateTree = runs_builder()
+    db.include_days_of_week(monday=True, tuesday=True, wednesday=True, thursday=True, friday=True)
+    db.add_dates(datetime.date(2000, 1, 1), datetime.date(2099, 12, 31))
+
+    assert db.tree.run_count == 1
+    assert db.count == 26089
+    assert db.tree.count_between(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)) == 262
+
+    db.include_days_of_week(monday=True)
+    mondays = db.filter_dates(year=2024)
+    assert len(mondays) == 53
+    assert mondays.run_count == 1
+
+    # Deleting splits the run and adding the dates back merges it again
+    db.delete_date_range(datetime.date(2050, 1, 1), datetime.date(2050, 12, 31))
+    db.delete_date(datetime.date(2010, 6, 1))
+    assert db.tree.run_count == 3
+    assert db.count == 26089 - 260 - 1
+
+    db.include_days_of_week(monday=True, tuesday=True, wednesday=True, thursday=True, friday=True)
+    db.add_dates(datetime.date(2050, 1, 1), datetime.date(2050, 12, 31))
+    db.include_days_of_week(tuesday=True)
+    db.add_dates(datetime.date(2010, 6, 1))
+    assert db.tree.run_count == 1
+    assert db.count == 26089
+
+def test_date_runs_single_inserts_merge():
+    """
+    Tests that dates inserted one at a time join into weekly runs
+    """
+    store: DateRuns = DateRuns()
+    for week in range(52):
+        store.insert(datetime.date(2025, 1, 6) + datetime.timedelta(weeks=week), "a")
+        store.insert(datetime.date(2025, 1, 8) + datetime.timedelta(weeks=week), "a")
+
+    assert len(store) == 104
+    assert list(store.runs()) == [(datetime.date(2025, 1, 6), datetime.date(2025, 12, 31), 0b101)]
+
+    # A different value on one date keeps that date apart
+    store.insert(datetime.date(2025, 6, 4), "b")
+    assert store.run_count == 3
+    assert store[datetime.date(2025, 6, 4)] == "b"
+
+    with pytest.raises(KeyError):
+        store.remove(datetime.date(2025, 1, 7))
+
+    with pytest.raises(ValueError):
+        store.insert("01/07/2025", "x")
+
+# ------------------------ Tests filtering in batches -------------------------
+
+def test_batch_filter_matches_single_filters():
+    """
+    Tests that a batch gives the same trees as filtering with each spec in turn, in and out of process
+    """
+    specs: list = [FilterSpec(years=[2001, 2003], weekdays=[0]), FilterSpec(days=[1, 31]),
+                   FilterSpec(months=[2], weekdays=[5, 6]), {"days": [29], "months": [2], "years": [2000, 2004]},
+                   ([13], None, None, [4]), FilterSpec(years=[1999])]
+
+    for db in (builder(), array_builder()):
+        db.add_dates(datetime.date(2000, 1, 1), datetime.date(2004, 12, 31), weekdays=list(range(7)))
+        db.delete_date_range(datetime.date(2002, 3, 1), datetime.date(2002, 9, 30))
+
+        expected: list[list[datetime.date]] = []
+        for spec in specs[:5]:
+            spec = FilterSpec(**spec) if isinstance(spec, dict) else FilterSpec(*spec)
+            weekdays: list[int] = list(range(7)) if spec.weekdays is None else list(spec.weekdays)
+            expected.append(list(db.filtered_date_range(spec.days, spec.months, spec.years, weekdays=weekdays).keys()))
+        expected.append([])
+
+        for processes in (1, 2):
+            results = db.batch_filter(specs, processes=processes)
+
+            assert [list(result.keys()) for result in results] == expected
+            assert all(type(result) is type(db.tree) for result in results)
+
+    with pytest.raises(ValueError):
+        db.batch_filter([FilterSpec(weekdays=[9])])
+
+# ------------------------ Tests sharing a DateTree between threads -------------------------
+
+def test_weekdays_by_value():
+    """
+    Tests that weekdays passed to a call are used for that call only and leave the included days untouched
+    """
+    db: DateTree = builder()
+    db.include_days_of_week(saturday=True)
+
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31), weekdays=[0, 2])
+    assert db.count == 9
+    assert db.included_days == [5]
+
+    assert len(db.filter_dates(month=1, weekdays=[0])) == 4
+    assert len(db.filtered_date_range(months=[1], weekdays=[2], lazy=True).to_tree()) == 5
+    assert db.included_days == [5]
+
+    with pytest.raises(ValueError):
+        db.add_dates(datetime.date(2025, 2, 1), weekdays=[7])
+
+def test_concurrent_selection_per_thread():
+    """
+    Tests that days of the week included in one thread are not seen by another
+    """
+    db: ConcurrentDateTree = ConcurrentDateTree(RBTree(), DummyObject())
+    db.include_days_of_week(monday=True)
+    seen: list[list[int]] = []
+
+    thread = threading.Thread(target=lambda: seen.append(db.included_days))
+    thread.start()
+    thread.join()
+
+    assert seen == [[]]
+    assert db.included_days == [0]
+
+def test_concurrent_readers_and_writers():
+    """
+    Tests that threads adding, deleting and filtering at the same time leave the tree consistent
+    """
+    db: ConcurrentDateTree = ConcurrentDateTree(RBTree(), DummyObject(), cache_size=8)
+    errors: list[Exception] = []
+
+    def writer(year: int) -> None:
+        try:
+            for month in range(1, 13):
+                db.add_dates(datetime.date(year, month, 1), datetime.date(year, month, 28), weekdays=[0, 1, 2, 3, 4])
+                db.delete_date_range(datetime.date(year, month, 15), datetime.date(year, month, 28))
+        except Exception as error:
+            errors.append(error)
+
+    def reader() -> None:
+        try:
+            for _ in range(50):
+                view = db.filtered_date_range(years=[2020, 2021], lazy=True, weekdays=[0, 1, 2, 3, 4])
+                assert all(key.weekday() < 5 for key in view.keys())
+                db.date_existance(db.tree, datetime.date(2020, 1, 2))
+        except Exception as error:
+            errors.append(error)
+
+    threads: list[threading.Thread] = ([threading.Thread(target=writer, args=(year,)) for year in (2020, 2021)] +
+                                       [threading.Thread(target=reader) for _ in range(4)])
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert db.count == len(list(db.tree.keys()))
+    assert all(key.day < 15 for key in db.tree.keys())
+    assert len(db.filtered_date_range(years=[2020], weekdays=[0, 1, 2, 3, 4])) == db.count // 2
+
+def test_concurrent_resolve_reads_tree():
+    """
+    Tests that a set operation's resolver can read and change the same ConcurrentDateTree without deadlocking, and
+    that an in-place operation resolves again the values changed meanwhile
+    """
+    db: ConcurrentDateTree = ConcurrentDateTree(RBTree(), DummyObject())
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 10), value="mine", weekdays=list(range(7)))
+    other: RBTree = RBTree((datetime.date(2025, 1, day), "theirs") for day in range(5, 15))
+    calls: list[tuple[datetime.date, object]] = []
+    results: list[object] = []
+
+    def resolve(date: datetime.date, mine: object, theirs: object) -> object:
+        calls.append((date, mine))
+
+        # Changes a value once while the in-place operation is working, which has to be resolved again
+        if date == datetime.date(2025, 1, 5) and mine == "mine":
+            db.add_dates(date, value="changed", weekdays=list(range(7)))
+
+        return f"{db.value_of(date)}+{theirs}"
+
+    def run() -> None:
+        results.append(db.union(other, resolve))
+        results.append(db.union_update(other, resolve))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    combined: DateTree = results[0]
+    assert isinstance(combined, ConcurrentDateTree) and combined.count == 14
+    assert combined.value_of(datetime.date(2025, 1, 6)) == "mine+theirs"
+
+    # The union made the change to 05/01/2025, so the in-place union sees it from the start
+    assert db.value_of(datetime.date(2025, 1, 5)) == "changed+theirs"
+    assert db.value_of(datetime.date(2025, 1, 10)) == "mine+theirs"
+    assert db.count == 14
+
+    changing: ConcurrentDateTree = ConcurrentDateTree(RBTree(), DummyObject())
+    changing.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 10), value="mine", weekdays=list(range(7)))
+    db = changing
+    calls.clear()
+
+    thread = threading.Thread(target=lambda: db.union_update(other, resolve), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert db.value_of(datetime.date(2025, 1, 5)) == "changed+theirs"
+    assert db.value_of(datetime.date(2025, 1, 6)) == "mine+theirs"
+
+    # Every date in both trees is resolved once, then again after 05/01/2025 changed
+    assert len(calls) == 12
+    assert calls[-6] == (datetime.date(2025, 1, 5), "changed")
+
+# ------------------------ Tests the asyncio facade -------------------------
+
+def test_async_matches_sync():
+    """
+    Tests that awaiting AsyncDateTree calls, offloaded or not, gives the same results as a DateTree
+    """
+    db: DateTree = builder()
+    db.add_dates(datetime.date(2024, 1, 1), datetime.date(2025, 12, 31), weekdays=[0, 2, 4])
+    db.delete_date_range(datetime.date(2024, 6, 1), datetime.date(2024, 6, 30))
+    expected_filter: list[datetime.date] = list(db.filtered_date_range(months=[3, 7], weekdays=[0]).keys())
+
+    async def run(offload_threshold: int) -> list:
+        adb: AsyncDateTree = AsyncDateTree(RBTree(), DummyObject(), offload_threshold=offload_threshold, chunk_size=7)
+        await adb.add_dates(datetime.date(2024, 1, 1), datetime.date(2025, 12, 31), weekdays=[0, 2, 4])
+        await adb.delete_date_range(datetime.date(2024, 6, 1), datetime.date(2024, 6, 30))
+        filtered = await adb.filtered_date_range(months=[3, 7], weekdays=[0])
+
+        return [adb.count, list(filtered.keys()), [key async for key, _ in adb],
+                [key async for key, _ in adb.iter_filtered(months=[3, 7], weekdays=[0])],
+                [key async for key, _ in adb.iter_items(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31))],
+                await adb.date_existance(datetime.date(2024, 1, 1))]
+
+    for offload_threshold in (1, 1_000_000):
+        count, filtered, items, iterated, january, exists = asyncio.run(run(offload_threshold))
+
+        assert count == db.count
+        assert filtered == iterated == expected_filter
+        assert items == list(db.tree.keys())
+        assert january == list(db.filter_dates(month=1, year=2025, weekdays=[0, 2, 4]).keys())
+        assert exists is True
+
+def test_async_yields_between_chunks():
+    """
+    Tests that async iteration lets other tasks run between chunks
+    """
+    async def run() -> list[str]:
+        adb: AsyncDateTree = AsyncDateTree(RBTree(), DummyObject(), chunk_size=10)
+        await adb.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 30), weekdays=list(range(7)))
+        events: list[str] = []
+
+        async def other() -> None:
+            events.append("other")
+
+        task = asyncio.create_task(other())
+        async for key, _ in adb:
+            events.append("date")
+
+        await task
+        return events
+
+    events: list[str] = asyncio.run(run())
+    assert events.index("other") == 10
+    assert events.count("date") == 30
+
+    with pytest.raises(ValueError):
+        AsyncDateTree(RBTree(), DummyObject(), chunk_size=0)
+
+def test_async_never_waits_for_lock():
+    """
+    Tests that a small call made while another thread holds the lock is handed to the executor instead of blocking
+    the event loop
+    """
+    async def run() -> list[str]:
+        adb: AsyncDateTree = AsyncDateTree(RBTree(), DummyObject())
+        await adb.add_dates(datetime.date(2025, 1, 1), weekdays=list(range(7)))
+        events: list[str] = []
+        held: threading.Event = threading.Event()
+        release: threading.Event = threading.Event()
+
+        def writer() -> None:
+            with adb.date_tree._lock.write():
+                held.set()
+                release.wait()
+
+        thread: threading.Thread = threading.Thread(target=writer)
+        thread.start()
+        held.wait()
+
+        lookup = asyncio.create_task(adb.date_existance(datetime.date(2025, 1, 1)))
+        await asyncio.sleep(0.05)
+        events.append("loop ran")
+        release.set()
+
+        events.append(str(await lookup))
+        thread.join()
+        return events
+
+    assert asyncio.run(run()) == ["loop ran", "True"]
+
+def test_async_uses_loop_weekday_selection():
+    """
+    Tests that the weekdays included on the loop's thread apply whether or not a call is offloaded, and are reset
+    after it
+    """
+    async def run(offload_threshold: int) -> tuple[int, list[int]]:
+        adb: AsyncDateTree = AsyncDateTree(RBTree(), DummyObject(), offload_threshold=offload_threshold)
+        adb.date_tree.include_days_of_week(monday=True)
+        await adb.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 12, 31))
+
+        adb.date_tree.include_days_of_week(monday=True)
+        mondays: int = len(await adb.filter_dates(year=2025))
+
+        return mondays, adb.date_tree.included_days
+
+    assert asyncio.run(run(1)) == asyncio.run(run(1_000_000)) == (52, [])
+
+# ------------------------ Tests instrumenting DateTree calls -------------------------
+
+def test_instrument_records_calls():
+    """
+    Tests that an instrumented DateTree records counts, errors, filter sizes and events, for every kind of store
+    """
+    for make in (builder, array_builder, runs_builder):
+        db: DateTree = make()
+        events: list[OperationEvent] = []
+        stats: Instrumentation = db.instrument(callback=events.append)
+
+        db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 12, 31), weekdays=[0, 1, 2, 3, 4])
+        march = db.filter_dates(month=3, year=2025, weekdays=[0])
+        db.filtered_date_range(months=[1, 2], years=[2025], days=[1], weekdays=list(range(7)))
+
+        with pytest.raises(ValueError):
+            db.filter_dates(day=1, month=2, year=2025, weekdays=[5])
+
+        assert db.instrumentation is stats
+        assert stats["add_dates"].calls == 1
+        assert stats["filter_dates"].calls == 2
+        assert stats["filter_dates"].errors == 1
+        assert stats["filter_dates"].returned == len(march) == 5
+
+        # The March filter considers the 21 weekdays of March, the failed filter the 20 of February and the range filter
+        # the 43 of January and February. Calls that raise return no dates.
+        assert stats["filter_dates"].scanned == 21 + 20
+        assert stats["filtered_date_range"].scanned == 43
+        assert stats["filtered_date_range"].returned == 1
+        assert sum(stats["add_dates"].histogram) == 1
+        assert stats.tree_size == db.count == 261
+
+        assert [event.name for event in events] == ["add_dates", "filter_dates", "filtered_date_range",
+                                                    "filter_dates"]
+        assert isinstance(events[-1].error, ValueError)
+        assert events[-1].scanned == 20 and events[-1].returned is None
+        assert events[1].scanned == 21 and events[1].returned == 5
+
+def test_instrument_counts_scanned_in_one_pass(monkeypatch):
+    """
+    Tests that recording the dates a filter considered does not walk the tree a second time or build the index, and
+    that cached and lazy filters record nothing considered
+    """
+    from date_tree._range_query import RangeQuery
+
+    db: DateTree = DateTree(DateArray(), DummyObject(), indexed=False, cache_size=4)
+    db.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 12, 31), weekdays=[0, 1, 2, 3, 4])
+    stats: Instrumentation = db.instrument()
+
+    walks: list[tuple] = []
+    items_between = RangeQuery.items_between
+
+    def counted(tree, lower_date, upper_date):
+        walks.append((lower_date, upper_date))
+        return items_between(tree, lower_date, upper_date)
+
+    monkeypatch.setattr(RangeQuery, "items_between", staticmethod(counted))
+    monkeypatch.setattr(RangeQuery, "keys_between", None)
+
+    db.filter_dates(month=3, year=2025, weekdays=[0])
+    db.filtered_date_range(months=[1, 2], years=[2025], days=[1], weekdays=list(range(7)))
+
+    # One walk per calendar window, made by the filters themselves
+    assert len(walks) == 3
+    assert db._index is None
+    assert stats["filter_dates"].scanned == 21
+    assert stats["filtered_date_range"].scanned == 43
+
+    db.filter_dates(month=3, year=2025, weekdays=[0])
+    list(db.filter_dates(month=4, year=2025, weekdays=[0], lazy=True))
+
+    assert stats["filter_dates"].calls == 3
+    assert stats["filter_dates"].scanned == 21
+
+def test_instrument_records_failed_calls():
+    """
+    Tests that a call that raises is recorded with its timing and error, including an exception that is not an
+    Exception, and that a failure to count the scanned dates does not hide the call's own error
+    """
+    db: DateTree = builder()
+    events: list[OperationEvent] = []
+    stats: Instrumentation = db.instrument(callback=events.append)
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    db._tree.insert = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        db.add_dates(datetime.date(2025, 1, 1), weekdays=[2])
+
+    def rejected(month: str) -> None:
+        raise ValueError("Invalid month")
+
+    def uncountable(month: str) -> int:
+        raise TypeError("Months must be integers")
+
+    with pytest.raises(ValueError):
+        stats.wrap("rejected", rejected, lambda: 0, uncountable)("March")
+
+    assert stats["add_dates"].calls == stats["add_dates"].errors == 1
+    assert stats["rejected"].calls == stats["rejected"].errors == 1
+    assert isinstance(events[0].error, KeyboardInterrupt) and events[0].seconds >= 0
+    assert isinstance(events[1].error, ValueError) and events[1].scanned is None
+
+def test_uninstrument_restores_methods():
+    """
+    Tests that uninstrumenting stops recording and leaves the instance without wrappers
+    """
+    db: DateTree = builder()
+    stats: Instrumentation = db.instrument()
+    db.add_dates(datetime.date(2025, 1, 1), weekdays=[2])
+    db.uninstrument()
+
+    db.add_dates(datetime.date(2025, 1, 2), weekdays=[3])
+    db.delete_date(datetime.date(2025, 1, 1))
+
+    assert db.instrumentation is None
+    assert "add_dates" not in vars(db)
+    assert list(stats) == ["add_dates"]
+    assert stats["add_dates"].calls == 1
+    assert stats["delete_date"].calls == 0
+
+# ------------------------ Tests saving and loading snapshots -------------------------
+
+def test_save_load_round_trip(tmp_path):
+    """
+    Tests that a saved tree loads back with the same dates, values and date object, with and without a memory map
+    """
+    db: DateTree = DateTree(RBTree(), "default")
+    db.include_days_of_week(monday=True, wednesday=True)
+    db.add_dates(datetime.date(2024, 1, 1), datetime.date(2025, 12, 31))
+    db.tree.insert(datetime.date(2024, 1, 2), "special")
+
+    path = tmp_path / "calendar.dtree"
+    db.save(path)
+
+    for use_mmap in (True, False):
+        loaded: DateTree = DateTree.load(path, use_mmap=use_mmap)
+
+        assert isinstance(loaded.tree, DateArray)
+        assert loaded.date_obj == "default"
+        assert list(loaded.tree.items()) == list(db.tree.items())
+
+        # Checks the loaded tree can be filtered and changed
+        loaded.include_days_of_week(include_all=True)
+        assert len(loaded.filter_dates(month=1, year=2024)) == 11
+
+        loaded.include_days_of_week(include_all=True)
+        loaded.add_dates(datetime.date(2026, 1, 1))
+        loaded.delete_date(datetime.date(2024, 1, 1))
+        assert loaded.count == db.count
+
+def test_save_replaces_mapped_snapshot(tmp_path):
+    """
+    Tests that saving over a snapshot leaves a tree memory mapped from it intact and no temporary file behind
+    """
+    large: DateTree = DateTree(RBTree(), "large")
+    large.add_dates(datetime.date(2000, 1, 1), datetime.date(2029, 12, 31), bulk=True, weekdays=list(range(7)))
+
+    path = tmp_path / "calendar.dtree"
+    large.save(path)
+    mapped: DateTree = DateTree.load(path, use_mmap=True)
+
+    smaller: DateTree = DateTree(RBTree(), "small")
+    smaller.add_dates(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31), weekdays=list(range(7)))
+    smaller.save(path)
+
+    assert mapped.count == large.count
+    assert mapped.nth_date(7000) == datetime.date(2000, 1, 1) + datetime.timedelta(7000)
+    assert list(mapped.tree.keys()) == list(large.tree.keys())
+    assert DateTree.load(path).count == 31
+    assert [entry.name for entry in tmp_path.iterdir()] == ["calendar.dtree"]
+
+def test_save_closes_descriptor_on_failure(tmp_path, monkeypatch):
+    """
+    Tests that a save failing before the temporary file is opened closes its descriptor and removes the file
+    """
+    import os
+    import tempfile
+
+    descriptors: list[int] = []
+    mkstemp = tempfile.mkstemp
+
+    def recorded(*args, **kwargs):
+        descriptor, name = mkstemp(*args, **kwargs)
+        descriptors.append(descriptor)
+        return descriptor, name
+
+    def failing(*args, **kwargs):
+        raise OSError("Out of file objects")
+
+    monkeypatch.setattr(tempfile, "mkstemp", recorded)
+    monkeypatch.setattr(os, "fdopen", failing)
+
+    db: DateTree = builder()
+    db.add_dates(datetime.date(2025, 1, 1), weekdays=[2])
+
+    with pytest.raises(OSError):
+        db.save(tmp_path / "calendar.dtree")
+
+    assert len(descriptors) == 1
+    with pytest.raises(OSError):
+        os.fstat(descriptors[0])
+    assert list(tmp_path.iterdir()) == []
+
+def test_load_rejects_other_files(tmp_path):
+    """
+    Tests that loading a file that is not a snapshot raises ValueError
+    """
+    path = tmp_path / "not_a_snapshot.txt"
+    path.write_text("01/01/2025\n")
+
+    with pytest.raises(ValueError):
+        DateTree.load(path)
+
+# --------------- Below tests the display_dates functionality ---------------
+
+def test_display_dates_non_empty_tree():
+    """
+    Tests display date for a non-empty tree. This is a manual test where the dates 2025/01/01, 2025/01/02,
+    2025/01/03, 2025/01/04, 2025/01/05 should appear in the terminal
+    """
+    # Sets up tree with added dates so display dates can be tested
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+    tree: RBTree = db.tree
+
+    # Sets first and last date in datetime
+    first_date: datetime.date = dt.date(2025, 1, 1)
+    last_date: datetime.date = dt.date(2025, 1, 5)
+
+    # Includes days of week
+    db.include_days_of_week(include_all=True)
+
+    # Adds dates to tree
+    db.add_dates(first_date, last_date)
+
+    # Displays the tree in the terminal
+    db.display_dates(tree)
+
+def test_display_dates_empty_tree():
+    """
+    Tests display date for an empty tree. This should raise a KeyError Exception.
+    """
+    # Sets up tree with added dates so display dates can be tested
+    # Sets up the date builder with a tree and date object
+    db: DateTree = builder()
+
+    # Tries to display dates of an empty tree
+    with pytest.raises(ValueError):
+        db.display_dates(db.tree)
+
+def test_display_dates_output(capsys: pytest.CaptureFixture):
+    """
+    Tests that display dates prints one ISO date per line
+    """
+    db: DateTree = builder()
+    add_date_helper(db, 1, 3)
+
+    db.display_dates(db.tree)
+
+    assert capsys.readouterr().out == "2025-01-01\n2025-01-02\n2025-01-03\n"
+
+def test_export_dates_chunks_and_filters():
+    """
+    Tests exporting dates to a stream in chunks with a format, range and weekday filter
+    """
+    db: DateTree = builder()
+    add_date_helper(db, 1, 31)
+
+    stream: io.StringIO = io.StringIO()
+    written: int = db.export_dates(db.tree, stream, date_format="mdy", lower_date=datetime.date(2025, 1, 6),
+                                   upper_date=datetime.date(2025, 1, 27), weekdays=[0], chunk_size=2)
+
+    assert written == 4
+    assert stream.getvalue() == "01/06/2025\n01/13/2025\n01/20/2025\n01/27/2025\n"
+
+def test_export_dates_to_path(tmp_path):
+    """
+    Tests exporting dates to a file path
+    """
+    db: DateTree = array_builder()
+    add_date_helper(db, 1, 10)
+
+    path = tmp_path / "dates.txt"
+
+    assert db.export_dates(db.tree, path) == 10
+    assert path.read_text().splitlines()[-1] == "2025-01-10"
+
+    with pytest.raises(ValueError):
+        db.export_dates(db.tree, path, date_format="dmy")
+
+# --------------- Below tests the str_to_date functionality ---------------
+def test_str_to_date_pass(monkeypatch: pytest.MonkeyPatch):
+    """
+    Tests to see if str_to_date returns the correct date time
+    """
+    called: Dict[str, Any] = {}
+
+    class FakeHelperMethods:
+        @staticmethod
+        def str_to_date(date_str: str) -> dt.date:
+            called["arg"] = date_str
+            # Sentinel value so we know this was used
+            return dt.date(2025, 12, 31)
+
+    monkeypatch.setattr(datebuilder, "HelperMethods", FakeHelperMethods)
+
+    result = DateTree.str_to_date("01/01/2025")
+
+    assert result == dt.date(2025, 12, 31)
+    assert called["arg"] == "01/01/2025"
+
+def test_str_to_date_failed_match():
+    """
+    Tests for that dates don't match when providing differing dates
+    """
+    result = DateTree.str_to_date("01/01/2025")
+
+    assert not result == dt.date(2021, 12, 31)
+
+def test_str_to_date_correct_raise_invalid_y_m_d():
+    """
+    Tests that a ValueError exception is correctly raised when providing a date in an invalid format yyyy/mm/dd rather
+    than dd/mm/yyyy
+    """
+    with pytest.raises(ValueError):
+        DateTree.str_to_date("2025/01/01")
+
+def test_str_to_date_correct_raise_invalid_year_len():
+    """
+    Tests that a ValueError exception is correctly raised when providing a date in an invalid format dd/mm/yyyyy rather
+    than dd/mm/yyyy
+    """
+    with pytest.raises(ValueError):
+        DateTree.str_to_date("01/01/20205")
+
+def test_str_to_date_correct_raise_invalid_seperator():
+    """
+    Tests that a ValueError exception is correctly raised when providing a date in an invalid format dd-mm-yyyy rather
+    than dd/mm/yyyy
+    """
+    with pytest.raises(ValueError):
+        DateTree.str_to_date("01-01-2025")
+
+def test_str_to_date_correct_raise_invalid_type():
+    """
+    Tests that a TypeError exception is correctly raised when providing a date as a datetime rather than str
+    """
+    date: datetime.date = datetime.date(2025, 1, 1)
+
+    with pytest.raises(TypeError):
+        DateTree.str_to_date(date)
+
+def test_str_to_date_matches_strptime():
+    """
+    Tests that str_to_date accepts and rejects exactly the strings strptime does
+    """
+    samples: list[str] = ["01/01/2025", "12/31/1999", "02/29/2024", "02/29/2025", "13/01/2025", "00/10/2025",
+                          "01/00/2025", "01/32/2025", "1/1/2025", "01/1/2025", "01/01/0000", "01/01/0999",
+                          "01-01-2025", "2025/01/01", "01/01/20205", "+1/01/2025", " 1/01/2025", "0a/01/2025",
+                          "01/01/２０２５", "", "01/01/202"]
+
+    for sample in samples:
+        try:
+            expected = dt.datetime.strptime(sample, "%m/%d/%Y").date()
+        except ValueError:
+            with pytest.raises(ValueError):
+                DateTree.str_to_date(sample)
+        else:
+            assert DateTree.str_to_date(sample) == expected
+
+def test_strs_to_dates():
+    """
+    Tests converting a batch of string dates, including repeats
+    """
+    results: list[datetime.date] = DateTree.strs_to_dates(["01/02/2025", "12/31/2024", "01/02/2025"])
+
+    assert results == [dt.date(2025, 1, 2), dt.date(2024, 12, 31), dt.date(2025, 1, 2)]
+
+    with pytest.raises(ValueError):
+        DateTree.strs_to_dates(["01/02/2025", "2025-01-02"])
 
     with pytest.raises(TypeError):
-        DateTree.str_to_date(date)
\ No newline at end of file
+        DateTree.strs_to_dates(["01/02/2025", dt.date(2025, 1, 2)])